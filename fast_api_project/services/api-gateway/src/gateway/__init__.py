@@ -0,0 +1 @@
+# Empty file to make gateway a package
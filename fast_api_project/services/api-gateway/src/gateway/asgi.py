@@ -0,0 +1,141 @@
+import json
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from starlette.exceptions import HTTPException
+from starlette.requests import ClientDisconnect
+
+from .proxy import encode_headers
+
+Headers = List[Tuple[str, str]]
+# proxy(method, path, query, headers, body_stream, client)
+#     -> (status, headers, content)
+Handler = Callable[
+    [str, str, str, Headers, AsyncIterator[bytes], Optional[str]],
+    Awaitable[Tuple[int, Headers, Union[bytes, AsyncIterator[bytes]]]],
+]
+
+PASSTHROUGH_PREFIXES = ("/health", "/admin", "/docs", "/redoc", "/openapi.json")
+
+
+class ProxyApp:
+    """
+    Raw ASGI front for the proxy hot path.
+
+    Proxied requests are handed to `handler` straight from the ASGI scope and
+    receive channel, and the result is written as raw send messages, skipping
+    FastAPI routing, parameter parsing and Request/Response objects.
+    Lifespan events, non-HTTP traffic, other methods and the passthrough
+    prefixes (health, admin, docs) go to the wrapped FastAPI app.
+    """
+
+    def __init__(
+        self,
+        app,
+        handler: Handler,
+        methods: Iterable[str],
+        passthrough_prefixes: Tuple[str, ...] = PASSTHROUGH_PREFIXES,
+    ):
+        self.app = app
+        self.handler = handler
+        self.methods = frozenset(methods)
+        self.passthrough_prefixes = passthrough_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self.methods
+            or scope["path"].startswith(self.passthrough_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = [
+            (key.decode("latin-1"), value.decode("latin-1"))
+            for key, value in scope["headers"]
+        ]
+        query = scope["query_string"].decode("latin-1")
+        client = scope.get("client")
+
+        try:
+            status, response_headers, content = await self.handler(
+                scope["method"],
+                scope["path"],
+                query,
+                headers,
+                self._body(receive),
+                client[0] if client else None,
+            )
+        except HTTPException as e:
+            await self._send_error(send, e)
+            return
+        except ClientDisconnect:
+            return
+
+        raw_headers = encode_headers(response_headers)
+        if isinstance(content, bytes):
+            raw_headers.append((b"content-length", str(len(content)).encode()))
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status,
+                    "headers": raw_headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": content})
+            return
+
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status,
+                    "headers": raw_headers,
+                }
+            )
+            async for chunk in content:
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await content.aclose()
+
+    @staticmethod
+    async def _body(receive) -> AsyncIterator[bytes]:
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise ClientDisconnect()
+            chunk = message.get("body", b"")
+            if chunk:
+                yield chunk
+            more_body = message.get("more_body", False)
+
+    @staticmethod
+    async def _send_error(send, exc: HTTPException) -> None:
+        body = json.dumps(
+            {"detail": exc.detail}, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")  # same bytes as FastAPI's JSONResponse
+        raw_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        raw_headers.extend(encode_headers((exc.headers or {}).items()))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": exc.status_code,
+                "headers": raw_headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,62 @@
+import itertools
+import random
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Type
+
+if TYPE_CHECKING:
+    from .upstream import Instance
+
+
+class Balancer(ABC):
+    """
+    Abstract base class for load balancing strategies.
+    """
+
+    @abstractmethod
+    def pick(self, instances: List["Instance"]) -> "Instance":
+        """
+        Choose an instance; only ever called with a non-empty list of
+        healthy instances.
+        """
+        pass
+
+
+class RoundRobinBalancer(Balancer):
+    """Cycle through instances in order."""
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    def pick(self, instances: List["Instance"]) -> "Instance":
+        return instances[next(self._counter) % len(instances)]
+
+
+class LeastOutstandingBalancer(Balancer):
+    """Pick the instance with the fewest in-flight requests."""
+
+    def pick(self, instances: List["Instance"]) -> "Instance":
+        # start at a random offset so ties don't always go to the first one
+        offset = random.randrange(len(instances))
+        best = instances[offset]
+        for i in range(1, len(instances)):
+            candidate = instances[(offset + i) % len(instances)]
+            if candidate.outstanding < best.outstanding:
+                best = candidate
+        return best
+
+
+class PowerOfTwoBalancer(Balancer):
+    """Sample two instances at random and keep the less loaded one."""
+
+    def pick(self, instances: List["Instance"]) -> "Instance":
+        if len(instances) == 1:
+            return instances[0]
+        first, second = random.sample(instances, 2)
+        return first if first.outstanding <= second.outstanding else second
+
+
+BALANCERS: Dict[str, Type[Balancer]] = {
+    "round_robin": RoundRobinBalancer,
+    "least_outstanding": LeastOutstandingBalancer,
+    "power_of_two": PowerOfTwoBalancer,
+}
@@ -0,0 +1,168 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class BulkheadFullError(Exception):
+    """Raised when a request is shed: the wait queue is full or timed out."""
+
+    def __init__(self, service: str, retry_after: int):
+        super().__init__(f"Service {service} is overloaded, retry later")
+        self.service = service
+        self.retry_after = retry_after
+
+
+class AIMDLimit:
+    """
+    Concurrency limit that adapts to upstream latency (additive increase,
+    multiplicative decrease).
+
+    Each call is compared with the no-load latency, estimated as a minimum
+    that drops at once to faster samples and rises slowly. Errors and calls
+    slower than `tolerance` times that estimate cut the limit by `backoff`;
+    other calls grow it by about one per limit's worth of calls, but only
+    while the limit is actually being used.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        smoothing: float = 0.01,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self.baseline: Optional[float] = None  # no-load latency estimate
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def record(self, ok: bool, latency: float, in_flight: int) -> None:
+        if ok:
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += (latency - self.baseline) * self.smoothing
+
+        if not ok or latency > self.baseline * self.tolerance:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+        elif in_flight * 2 >= self._limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+
+class Bulkhead:
+    """
+    Caps the requests in flight to one service, with a bounded FIFO queue.
+
+    Requests over the limit wait for a slot for at most `queue_timeout`
+    seconds; when `max_queue` requests are already waiting, or the wait
+    times out, the request is shed with BulkheadFullError so the caller can
+    answer 503 right away instead of piling up behind a slow upstream.
+    With an AIMDLimit the limit follows the measured upstream latency.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        limit: int,
+        max_queue: int = 100,
+        queue_timeout: float = 1.0,
+        retry_after: int = 1,
+        adaptive: Optional[AIMDLimit] = None,
+    ):
+        self.service = service
+        self.max_limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.adaptive = adaptive
+
+        self.in_flight = 0
+        self.queued = 0
+        # cancelled or timed out waiters stay here until _wake() skips them
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.admitted = 0
+        self.waited = 0  # admitted after queueing
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    @property
+    def limit(self) -> int:
+        return self.adaptive.limit if self.adaptive else self.max_limit
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in the queue if needed. Pair with release().
+        """
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if self.queued >= self.max_queue:
+            self.shed_queue_full += 1
+            raise BulkheadFullError(self.service, self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not self._granted(waiter):
+                self.queued -= 1
+                self.shed_timeout += 1
+                raise BulkheadFullError(self.service, self.retry_after)
+        except asyncio.CancelledError:
+            if self._granted(waiter):
+                self.release()  # the slot was handed over as we were cancelled
+            else:
+                self.queued -= 1
+            raise
+        self.admitted += 1
+        self.waited += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def record(self, ok: bool, latency: float) -> None:
+        """
+        Feed an upstream call outcome to the adaptive limit, if any.
+        """
+        if self.adaptive is not None:
+            self.adaptive.record(ok, latency, self.in_flight)
+            self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to the oldest live waiters."""
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():  # timed out or cancelled, already accounted for
+                continue
+            waiter.set_result(None)
+            self.queued -= 1
+            self.in_flight += 1
+
+    @staticmethod
+    def _granted(waiter: asyncio.Future) -> bool:
+        return waiter.done() and not waiter.cancelled()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "waited": self.waited,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
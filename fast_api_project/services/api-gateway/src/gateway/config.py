@@ -0,0 +1,188 @@
+import json
+from functools import lru_cache  # caching decorator
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator  # data models with validation
+from pydantic_settings import BaseSettings  # base class for settings management
+
+
+class ServiceConfig(BaseModel):
+    """
+    Upstream connection settings for a single registered service.
+    """
+
+    instances: List[str] = Field(min_length=1)  # base URLs of the upstream instances
+    balancer: Literal["round_robin", "least_outstanding", "power_of_two"] = (
+        "round_robin"
+    )
+
+    # connection pool (shared by all instances of the service)
+    max_connections: int = 100  # total open connections to the upstream
+    max_keepalive_connections: int = 20  # idle connections kept warm
+    keepalive_expiry: float = 30.0  # seconds before an idle connection is closed
+    http2: bool = False  # needs the optional "h2" package (httpx[http2])
+
+    # timeouts (seconds)
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 5.0  # max wait for a free pooled connection
+
+    # pipe bodies through chunk by chunk instead of buffering them
+    streaming: bool = False
+
+    # serve GETs from the gateway response cache (ignored when streaming)
+    cache_responses: bool = False
+    # identical concurrent GETs share one upstream call (ignored when streaming)
+    coalesce_gets: bool = True
+
+    # bulkhead: requests in flight to the service, 0 disables the limit
+    max_concurrency: int = 100
+    max_queue: int = 100  # requests waiting for a slot before new ones are shed
+    queue_timeout: float = 1.0  # seconds a request may wait for a slot
+    retry_after: int = 1  # Retry-After (seconds) on shed requests
+    # adapt the limit to upstream latency (AIMD), within min/max_concurrency
+    adaptive_concurrency: bool = False
+    min_concurrency: int = 4
+    adaptive_latency_tolerance: float = 2.0  # x no-load latency seen as overload
+    adaptive_backoff: float = 0.9  # limit multiplier on overload or errors
+
+    # active health checks, disabled when health_interval is 0
+    health_path: str = "/health"
+    health_interval: float = 5.0  # seconds between probes
+    health_timeout: float = 2.0
+    unhealthy_threshold: int = 2  # failed probes before an instance is ejected
+    healthy_threshold: int = 1  # passing probes before it is brought back
+
+    # circuit breaker, one per instance
+    breaker_window: int = 20  # recent calls the failure/slow rates cover
+    breaker_min_calls: int = 10  # calls needed before the breaker can open
+    breaker_failure_rate: float = 0.5  # errors and 5xx responses
+    breaker_slow_call_seconds: float = 5.0
+    breaker_slow_call_rate: float = 0.8
+    breaker_open_seconds: float = 10.0  # before trial calls are let through
+    breaker_half_open_calls: int = 3
+
+    # retries for idempotent methods, capped by a retry budget
+    max_retries: int = 2
+    retry_budget_ratio: float = 0.2  # retries allowed per regular request
+    retry_budget_min_per_second: float = 5.0
+
+    # hedged GETs: a second attempt after the p95 latency, first answer wins
+    hedge_gets: bool = False
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20  # latencies seen before hedging starts
+
+    @model_validator(mode="before")
+    @classmethod
+    def single_url(cls, data):
+        """Accept {"url": ...} as shorthand for a single instance."""
+        if isinstance(data, dict) and "url" in data and "instances" not in data:
+            data = dict(data)
+            data["instances"] = [data.pop("url")]
+        return data
+
+
+class RouteConfig(BaseModel):
+    """
+    One entry of the routing table.
+    """
+
+    prefix: str  # matched on whole path segments, longest prefix wins
+    service: str  # name of a registered service
+    # upstream path; {prefix} is the matched prefix, {path} the rest of the path
+    rewrite: Optional[str] = None  # default "{prefix}{path}" keeps the path as is
+    methods: Optional[List[str]] = None  # None allows every method
+    timeout: Optional[float] = None  # overrides the service timeouts (seconds)
+
+
+class Settings(BaseSettings):
+    """
+    Gateway settings loaded from environment variables or a .env file.
+
+    Every variable is prefixed with GATEWAY_, e.g. GATEWAY_SERVICES holds a
+    JSON object mapping service names to ServiceConfig fields.
+    """
+
+    SERVICES: Dict[str, ServiceConfig] = Field(
+        default_factory=lambda: {
+            "auth": ServiceConfig(instances=["http://auth_service:8001"])
+        }
+    )
+    SERVICES_FILE: Optional[str] = None  # JSON file, takes precedence over SERVICES
+
+    # routing table; empty means one "/<name>" route per service
+    ROUTES: List[RouteConfig] = Field(default_factory=list)
+    ROUTES_FILE: Optional[str] = None  # JSON file, takes precedence over ROUTES
+
+    # must match the auth service; HMAC tokens are verified with the secret
+    JWT_SECRET: Optional[str] = None  # None accepts no HMAC tokens
+    JWT_ALGORITHM: str = "HS256"
+    # auth service key set for EdDSA/ES256 tokens, e.g.
+    # http://auth_service:8001/.well-known/jwks.json; None = shared secret only
+    JWKS_URL: Optional[str] = None
+    # with JWKS_URL, also accept HMAC tokens (no kid) signed with JWT_SECRET;
+    # only while migrating off the shared secret
+    JWT_HMAC_FALLBACK: bool = False
+    JWKS_REFRESH_INTERVAL: float = 300.0  # seconds between key set fetches
+    JWKS_MIN_REFRESH_INTERVAL: float = 10.0  # early fetches on an unknown kid
+    JWT_LEEWAY: int = 0  # seconds of clock skew tolerated on exp/nbf
+    # auth service feed of revoked tokens, e.g.
+    # http://auth_service:8001/auth/revocations; None = no revocation checks
+    REVOCATION_FEED_URL: Optional[str] = None
+    REVOCATION_POLL_INTERVAL: float = 2.0  # seconds between feed reads
+    REVOCATION_RESYNC_INTERVAL: float = 300.0  # seconds between full rereads
+
+    TOKEN_CACHE_SIZE: int = 10_000  # verified tokens kept in memory
+    TOKEN_CACHE_NEGATIVE_TTL: float = 5.0  # seconds an invalid token is remembered
+
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 0 disables the cache
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+
+    SINGLEFLIGHT_MAX_WAITERS: int = 1000  # callers sharing one upstream GET
+
+    FAST_PATH: bool = False  # serve proxied paths from the raw ASGI app
+
+    class Config:
+        env_prefix = "GATEWAY_"
+        env_file = ".env"  # load variables from .env file
+
+
+@lru_cache()  # cache the settings instance
+def get_settings() -> Settings:
+    return Settings()
+
+
+def load_services(settings: Settings) -> Dict[str, ServiceConfig]:
+    """
+    Build the service registry from SERVICES_FILE, falling back to SERVICES.
+    """
+    if not settings.SERVICES_FILE:
+        return dict(settings.SERVICES)
+
+    with open(settings.SERVICES_FILE, encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: ServiceConfig.model_validate(config) for name, config in data.items()}
+
+
+def load_routes(
+    settings: Settings, services: Dict[str, ServiceConfig]
+) -> List[RouteConfig]:
+    """
+    Build the routing table from ROUTES_FILE or ROUTES, falling back to one
+    "/<name>" prefix route per registered service.
+    """
+    if settings.ROUTES_FILE:
+        with open(settings.ROUTES_FILE, encoding="utf-8") as f:
+            routes = [RouteConfig.model_validate(route) for route in json.load(f)]
+    elif settings.ROUTES:
+        routes = list(settings.ROUTES)
+    else:
+        routes = [RouteConfig(prefix=f"/{name}", service=name) for name in services]
+
+    for route in routes:
+        if route.service not in services:
+            raise ValueError(
+                f"Route {route.prefix!r} targets unknown service {route.service!r}"
+            )
+    return routes
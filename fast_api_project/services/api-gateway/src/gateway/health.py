@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Optional
+
+import httpx
+
+if TYPE_CHECKING:
+    from .upstream import Instance, Upstream
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """
+    Background health probes for every instance of an upstream.
+
+    Instances failing unhealthy_threshold probes in a row are ejected from
+    balancing and brought back after healthy_threshold passing probes.
+    Probes have a small client of their own, one connection per instance:
+    on the proxy's pooled client they would queue behind proxied traffic
+    when it saturates the pool, time out and eject healthy instances.
+    """
+
+    def __init__(self, upstream: "Upstream"):
+        self.upstream = upstream
+        self.config = upstream.config
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> None:
+        if self.config.health_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            connections = len(self.upstream.instances)
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=connections,
+                    max_keepalive_connections=connections,
+                ),
+                timeout=self.config.health_timeout,
+            )
+        return self._client
+
+    async def _run(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.config.health_interval)
+
+    async def check_all(self) -> None:
+        await asyncio.gather(
+            *(self.probe(instance) for instance in self.upstream.instances)
+        )
+
+    async def probe(self, instance: "Instance") -> None:
+        try:
+            response = await self.client.get(
+                f"{instance.url}{self.config.health_path}",
+                timeout=self.config.health_timeout,
+            )
+            ok = response.is_success
+        except httpx.PoolTimeout:
+            return  # says nothing about the instance
+        except httpx.HTTPError:
+            ok = False
+        self.record(instance, ok)
+
+    def record(self, instance: "Instance", ok: bool) -> None:
+        if ok:
+            instance.consecutive_failures = 0
+            instance.consecutive_successes += 1
+            if (
+                not instance.healthy
+                and instance.consecutive_successes >= self.config.healthy_threshold
+            ):
+                instance.healthy = True
+                logger.info("%s: instance %s is back", self.upstream.name, instance.url)
+        else:
+            instance.consecutive_successes = 0
+            instance.consecutive_failures += 1
+            if (
+                instance.healthy
+                and instance.consecutive_failures >= self.config.unhealthy_threshold
+            ):
+                instance.healthy = False
+                logger.warning(
+                    "%s: ejecting unhealthy instance %s",
+                    self.upstream.name,
+                    instance.url,
+                )
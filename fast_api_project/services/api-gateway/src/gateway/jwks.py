@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+from app_shared.jwt_codec import (
+    InvalidTokenError,
+    b64url_decode,
+    check_times,
+    decode_segment,
+    decode_signature,
+    split_token,
+)
+from app_shared.jwt_keys import PublicKey, verify
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from .jwt_verifier import HMACJWTVerifier
+
+logger = logging.getLogger(__name__)
+
+_FALLBACK = ("", None)  # header cache entry for tokens without a kid
+
+
+class UnknownKeyError(InvalidTokenError):
+    """The token names a key the verifier has not fetched (yet)."""
+
+
+def parse_jwk(jwk: Dict) -> Optional[Tuple[str, PublicKey]]:
+    """
+    The algorithm and public key of an Ed25519 or P-256 signing JWK, or
+    None for a key of another kind.
+    """
+    if jwk.get("use", "sig") != "sig":
+        return None
+    try:
+        if jwk.get("kty") == "OKP" and jwk.get("crv") == "Ed25519":
+            raw = b64url_decode(jwk["x"].encode("ascii"))
+            return "EdDSA", ed25519.Ed25519PublicKey.from_public_bytes(raw)
+        if jwk.get("kty") == "EC" and jwk.get("crv") == "P-256":
+            x = int.from_bytes(b64url_decode(jwk["x"].encode("ascii")), "big")
+            y = int.from_bytes(b64url_decode(jwk["y"].encode("ascii")), "big")
+            numbers = ec.EllipticCurvePublicNumbers(x, y, ec.SECP256R1())
+            return "ES256", numbers.public_key()
+    except (KeyError, AttributeError, ValueError):
+        pass
+    return None
+
+
+class JWKSVerifier:
+    """
+    Verifier for EdDSA/ES256 tokens, with the auth service's public keys
+    fetched from its JWK Set.
+
+    Verification never waits on the network: keys are parsed once per
+    fetch and looked up by the token's kid, and known header segments map
+    straight to their key, so a token costs one signature check and one
+    JSON decode of the claims. Keys are refetched every refresh_interval
+    seconds in the background; a token naming an unknown kid is rejected
+    with UnknownKeyError and triggers an early refetch, at most one per
+    min_refresh_interval, so a freshly rotated key is picked up within
+    moments. Tokens without a kid go to the fallback verifier (the shared
+    secret), if one was given.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        fallback: Optional[HMACJWTVerifier] = None,
+        refresh_interval: float = 300.0,
+        min_refresh_interval: float = 10.0,
+        timeout: float = 5.0,
+        leeway: int = 0,  # seconds of clock skew tolerated on exp/nbf
+        clock: Callable[[], float] = time.time,
+        fetch: Optional[Callable[[], Awaitable[Dict]]] = None,
+    ):
+        self.url = url
+        self.fallback = fallback
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.leeway = leeway
+        self.clock = clock
+        self._fetch = fetch or self._get
+        self._keys: Dict[str, Tuple[str, PublicKey]] = {}  # kid -> alg, key
+        self._headers: Dict[bytes, Tuple[str, Optional[PublicKey]]] = {}
+        self._max_headers = 256  # header segments seen; all of ours fit easily
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._last_refresh = float("-inf")  # monotonic time of the last attempt
+
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.unknown_kids = 0
+
+    @property
+    def key_ids(self):
+        return list(self._keys)
+
+    def verify(self, token: str) -> Dict:
+        """
+        Claims of a token with a valid signature that is not expired.
+
+        Raises ExpiredTokenError, UnknownKeyError or InvalidTokenError.
+        """
+        signing_input, header, payload, signature = split_token(token)
+        entry = self._headers.get(header)
+        if entry is None:
+            entry = self._key_for(header)
+        algorithm, key = entry
+        if key is None:
+            if self.fallback is None:
+                raise InvalidTokenError("Invalid token")
+            return self.fallback.verify(token)
+        if not verify(key, algorithm, decode_signature(signature), signing_input):
+            raise InvalidTokenError("Invalid token")
+        return check_times(decode_segment(payload), self.clock(), self.leeway)
+
+    def _key_for(self, header: bytes) -> Tuple[str, Optional[PublicKey]]:
+        fields = decode_segment(header)
+        kid = fields.get("kid")
+        if kid is None:
+            entry = _FALLBACK
+        else:
+            entry = self._keys.get(kid) if isinstance(kid, str) else None
+            if entry is None:
+                self.unknown_kids += 1
+                self.request_refresh()
+                raise UnknownKeyError("Unknown signing key")
+            if fields.get("alg") != entry[0]:
+                raise InvalidTokenError("Invalid token")
+        if len(self._headers) >= self._max_headers:
+            self._headers.clear()
+        self._headers[header] = entry
+        return entry
+
+    def request_refresh(self) -> None:
+        """
+        Refetch the keys in the background, unless a fetch is running or
+        one started less than min_refresh_interval ago.
+        """
+        if self._refreshing is not None and not self._refreshing.done():
+            return
+        if time.monotonic() - self._last_refresh < self.min_refresh_interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # not serving; the periodic refresh will catch up
+        self._refreshing = loop.create_task(self.refresh())
+
+    async def refresh(self) -> bool:
+        """Fetch the JWK Set and swap in its keys; keep the old ones on error."""
+        self._last_refresh = time.monotonic()
+        try:
+            jwks = await self._fetch()
+            keys = {}
+            for jwk in jwks["keys"]:
+                parsed = parse_jwk(jwk) if isinstance(jwk, dict) else None
+                if parsed is not None and isinstance(jwk.get("kid"), str):
+                    keys[jwk["kid"]] = parsed
+        except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+            self.refresh_failures += 1
+            logger.warning("could not refresh signing keys from %s: %s", self.url, e)
+            return False
+        self.refreshes += 1
+        if keys.keys() != self._keys.keys():
+            logger.info("signing keys: %s", ", ".join(keys) or "none")
+        self._keys = keys
+        self._headers = {}
+        return True
+
+    async def _get(self) -> Dict:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.get(self.url)
+        response.raise_for_status()
+        return response.json()
+
+    async def start(self) -> None:
+        """Fetch the keys now, then every refresh_interval seconds."""
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._refreshing):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._refreshing = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "keys": self.key_ids,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "unknown_kids": self.unknown_kids,
+        }
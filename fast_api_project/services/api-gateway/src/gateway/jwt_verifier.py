@@ -0,0 +1,25 @@
+from typing import Dict
+
+from app_shared.jwt_codec import ExpiredTokenError, HMACJWTCodec, InvalidTokenError
+
+__all__ = ["ExpiredTokenError", "HMACJWTVerifier", "InvalidTokenError"]
+
+
+class HMACJWTVerifier(HMACJWTCodec):
+    """
+    Verifier for HMAC-signed JWTs (HS256/384/512), as issued by the auth
+    service or python-jose: the auth service's own codec, from app_shared.
+
+    The HMAC's keyed inner and outer hashes are built once and copied per
+    token, and the expected header segment is encoded once, so the common
+    token costs one HMAC, a constant-time compare and one JSON decode of the
+    claims.
+    """
+
+    def verify(self, token: str) -> Dict:
+        """
+        Claims of a token with a valid signature that is not expired.
+
+        Raises ExpiredTokenError or InvalidTokenError.
+        """
+        return self.decode(token)
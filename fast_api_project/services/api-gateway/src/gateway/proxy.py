@@ -0,0 +1,120 @@
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+
+Headers = List[Tuple[str, str]]
+
+# RFC 9110 section 7.6.1: meaningful for a single connection only
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "proxy-connection",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+
+def strip_hop_by_hop(headers: Iterable[Tuple[str, str]]) -> Headers:
+    """
+    Drop hop-by-hop headers, including any listed in the Connection header.
+
+    Repeated headers (e.g. Set-Cookie) are kept as separate pairs.
+    """
+    headers = list(headers)
+    drop = set(HOP_BY_HOP_HEADERS)
+    for key, value in headers:
+        if key.lower() == "connection":
+            drop.update(token.strip().lower() for token in value.split(","))
+    return [(key, value) for key, value in headers if key.lower() not in drop]
+
+
+def header(headers: Iterable[Tuple[str, str]], name: str) -> Optional[str]:
+    """
+    First value of a header (case-insensitive), or None.
+    """
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def forward_for(headers: Headers, client: Optional[str]) -> Headers:
+    """
+    Headers with the client's address appended to X-Forwarded-For, so the
+    upstream can tell clients apart; earlier entries are kept as sent.
+    """
+    if not client:
+        return headers
+    forwarded = [value for key, value in headers if key.lower() == "x-forwarded-for"]
+    chain = ", ".join(forwarded + [client])
+    headers = [(k, v) for k, v in headers if k.lower() != "x-forwarded-for"]
+    headers.append(("X-Forwarded-For", chain))
+    return headers
+
+
+def encode_headers(headers: Iterable[Tuple[str, str]]) -> List[Tuple[bytes, bytes]]:
+    """
+    Encode header pairs for ASGI raw_headers, keeping repeated headers.
+    """
+    return [
+        (key.lower().encode("latin-1"), value.encode("latin-1"))
+        for key, value in headers
+    ]
+
+
+def has_body(headers: Iterable[Tuple[str, str]]) -> bool:
+    """
+    Whether a request declares a body (RFC 9112 section 6.1).
+    """
+    for key, value in headers:
+        key = key.lower()
+        if key == "transfer-encoding" or (key == "content-length" and value != "0"):
+            return True
+    return False
+
+
+class RelayedBody:
+    """
+    A streamed upstream body, relayed chunk by chunk.
+
+    aclose() runs on_close once, whether the body was read to the end, in
+    part or not at all; a generator's finally would be skipped when it is
+    closed before its first chunk, leaking whatever on_close releases.
+    """
+
+    def __init__(
+        self, chunks: AsyncIterator[bytes], on_close: Callable[[], Awaitable[None]]
+    ):
+        self._chunks = chunks
+        self._on_close: Optional[Callable[[], Awaitable[None]]] = on_close
+
+    def __aiter__(self) -> "RelayedBody":
+        return self
+
+    async def __anext__(self) -> bytes:
+        return await self._chunks.__anext__()
+
+    async def aclose(self) -> None:
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            await on_close()
+
+
+class RelayResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its body however the response ends,
+    including a client gone before the first chunk.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
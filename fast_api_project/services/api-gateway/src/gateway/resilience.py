@@ -0,0 +1,188 @@
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class CircuitBreaker:
+    """
+    Per-instance circuit breaker driven by error rate and latency.
+
+    CLOSED: calls flow; the last `window` outcomes are tracked and the breaker
+    opens once the failure or slow-call rate crosses its threshold.
+    OPEN: the instance is skipped for `open_seconds`.
+    HALF_OPEN: up to `half_open_calls` trial calls are let through; all of
+    them succeeding closes the breaker, any failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 10.0,
+        half_open_calls: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.times_opened = 0
+        self._outcomes: deque = deque(maxlen=window)  # (failed, slow) pairs
+        self._failures = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._half_open_successes = 0
+
+    def allows(self, in_flight: int) -> bool:
+        """
+        Whether another call may be sent, given the calls already in flight.
+        """
+        if self.state == self.OPEN:
+            if self.clock() - self._opened_at < self.open_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._half_open_successes = 0
+        if self.state == self.HALF_OPEN:
+            return in_flight < self.half_open_calls
+        return True
+
+    def record(self, ok: bool, latency: float) -> None:
+        """
+        Record the outcome of a finished call.
+        """
+        slow = latency >= self.slow_call_seconds
+        if self.state == self.HALF_OPEN:
+            if not ok or slow:
+                self._open()
+            else:
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.half_open_calls:
+                    self._close()
+            return
+        if self.state == self.OPEN:
+            return  # late result of a call sent before the breaker opened
+
+        outcomes = self._outcomes
+        if len(outcomes) == outcomes.maxlen:
+            old_failed, old_slow = outcomes.popleft()
+            self._failures -= old_failed
+            self._slow -= old_slow
+        outcomes.append((not ok, slow))
+        self._failures += not ok
+        self._slow += slow
+
+        calls = len(outcomes)
+        if calls >= self.min_calls and (
+            self._failures / calls >= self.failure_rate
+            or self._slow / calls >= self.slow_call_rate
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.times_opened += 1
+        self._opened_at = self.clock()
+
+    def _close(self) -> None:
+        self.state = self.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        self._slow = 0
+
+
+class RetryBudget:
+    """
+    Caps retries (and hedges) to a fraction of regular traffic.
+
+    Every request deposits `ratio` tokens and every retry withdraws one, so
+    retries can never multiply load on an upstream that is already failing.
+    `min_per_second` tokens are added over time so low-traffic services can
+    still retry.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 5.0,
+        max_tokens: float = 100.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.clock = clock
+        self._tokens = min_per_second
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(
+            self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+    def deposit(self) -> None:
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class LatencyTracker:
+    """
+    Recent upstream latencies with a cheaply cached percentile.
+
+    The percentile is recomputed every `refresh_every` samples instead of on
+    every lookup.
+    """
+
+    def __init__(
+        self,
+        size: int = 1000,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        refresh_every: int = 50,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.refresh_every = refresh_every
+        self._samples: deque = deque(maxlen=size)
+        self._since_refresh = 0
+        self._value: Optional[float] = None
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+        self._since_refresh += 1
+        if self._value is None or self._since_refresh >= self.refresh_every:
+            self._refresh()
+
+    def value(self) -> Optional[float]:
+        """
+        Current percentile in seconds, or None until min_samples are seen.
+        """
+        return self._value
+
+    def _refresh(self) -> None:
+        self._since_refresh = 0
+        if len(self._samples) < self.min_samples:
+            return
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        self._value = ordered[index]
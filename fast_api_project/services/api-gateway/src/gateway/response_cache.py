@@ -0,0 +1,367 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .proxy import header
+
+Headers = List[Tuple[str, str]]
+# forward(extra_headers) -> (status, headers, body) from the upstream
+Forward = Callable[[Headers], Awaitable[Tuple[int, Headers, bytes]]]
+
+# RFC 9110 section 15.1: cacheable by default when freshness is explicit
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 404, 410})
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a Cache-Control header into {directive: argument}.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class CachedResponse:
+    """
+    A stored upstream response and its freshness information.
+    """
+
+    __slots__ = ("status", "headers", "body", "stored_at", "ttl", "swr", "size")
+
+    def __init__(
+        self,
+        status: int,
+        headers: Headers,
+        body: bytes,
+        stored_at: float,
+        ttl: float,
+        swr: float,
+    ):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.ttl = ttl  # seconds the response is fresh for
+        self.swr = swr  # seconds it may be served stale while revalidating
+        self.size = len(body) + sum(len(k) + len(v) for k, v in headers)
+
+    @property
+    def etag(self) -> Optional[str]:
+        return header(self.headers, "etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return header(self.headers, "last-modified")
+
+
+class ResponseCache:
+    """
+    In-process HTTP cache for idempotent GETs (RFC 9111, shared cache rules).
+
+    Honours Cache-Control (max-age, s-maxage, no-store, no-cache, private,
+    stale-while-revalidate), Expires, ETag/Last-Modified and Vary. Stale
+    entries are revalidated with conditional requests. Requests carrying
+    Authorization are keyed per credential, so one user's response is never
+    served to another. Total size is bounded in bytes with LRU eviction.
+    """
+
+    HIT = "HIT"
+    MISS = "MISS"
+    STALE = "STALE"  # served stale, revalidating in the background
+    REVALIDATED = "REVALIDATED"  # upstream answered 304 Not Modified
+    BYPASS = "BYPASS"
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.clock = clock
+        self.size = 0
+        self._entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+        self._vary: Dict[tuple, Tuple[str, ...]] = {}  # primary key -> Vary names
+        self._variants: Dict[tuple, int] = {}  # primary key -> stored entries
+        self._revalidating: Set[tuple] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.bytes_saved = 0  # body bytes served without an upstream transfer
+
+    async def fetch(
+        self, scope_key: str, request_headers: Headers, forward: Forward
+    ) -> Tuple[int, Headers, bytes, str]:
+        """
+        Serve a GET from cache or through forward(), storing what is cacheable.
+
+        scope_key identifies the resource, e.g. "service /path?query".
+        Returns (status, headers, body, cache_status).
+        """
+        request_cc = parse_cache_control(header(request_headers, "cache-control"))
+        if "no-store" in request_cc or header(request_headers, "range"):
+            status, headers, body = await forward([])
+            return status, headers, body, self.BYPASS
+
+        authorization = header(request_headers, "authorization")
+        primary = (scope_key, self._credential(authorization))
+        key = self._key(primary, request_headers)
+        entry = None if "no-cache" in request_cc else self._entries.get(key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = self.clock() - entry.stored_at
+            if age < entry.ttl:
+                return self._serve(entry, age, self.HIT)
+            if age < entry.ttl + entry.swr:
+                self._revalidate_in_background(key, entry, request_headers, forward)
+                self.stale_served += 1
+                return self._serve(entry, age, self.STALE)
+            refreshed, response = await self._revalidate(
+                key, entry, request_headers, forward
+            )
+            if refreshed is not None:
+                return self._serve(refreshed, 0, self.REVALIDATED)
+            self.misses += 1
+            return (*response, self.MISS)
+
+        self.misses += 1
+        status, headers, body = await forward([])
+        self._store(primary, request_headers, status, headers, body, authorization)
+        return status, headers, body, self.MISS
+
+    def _serve(
+        self, entry: CachedResponse, age: float, cache_status: str
+    ) -> Tuple[int, Headers, bytes, str]:
+        self.hits += 1
+        self.bytes_saved += len(entry.body)
+        headers = [(k, v) for k, v in entry.headers if k.lower() != "age"]
+        headers.append(("age", str(int(age))))
+        return entry.status, headers, entry.body, cache_status
+
+    async def _revalidate(
+        self,
+        key: tuple,
+        entry: CachedResponse,
+        request_headers: Headers,
+        forward: Forward,
+    ) -> Tuple[Optional[CachedResponse], Optional[Tuple[int, Headers, bytes]]]:
+        """
+        Send a conditional request for a stale entry.
+
+        Returns (refreshed entry, None) on 304 Not Modified, otherwise
+        (None, full upstream response), which replaces the entry.
+        """
+        authorization = header(request_headers, "authorization")
+        self.revalidations += 1
+        conditional: Headers = []
+        if entry.etag:
+            conditional.append(("if-none-match", entry.etag))
+        if entry.last_modified:
+            conditional.append(("if-modified-since", entry.last_modified))
+
+        status, headers, body = await forward(conditional)
+        if status == 304:
+            self.not_modified += 1
+            return self._refresh(key, entry, headers, authorization), None
+
+        self._remove(key)
+        primary, _ = key
+        self._store(primary, request_headers, status, headers, body, authorization)
+        return None, (status, headers, body)
+
+    def _revalidate_in_background(
+        self,
+        key: tuple,
+        entry: CachedResponse,
+        request_headers: Headers,
+        forward: Forward,
+    ) -> None:
+        if key in self._revalidating:
+            return
+        self._revalidating.add(key)
+
+        async def run():
+            try:
+                await self._revalidate(key, entry, request_headers, forward)
+            except Exception:
+                pass  # the stale entry keeps being served until it expires
+            finally:
+                self._revalidating.discard(key)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _refresh(
+        self,
+        key: tuple,
+        entry: CachedResponse,
+        not_modified_headers: Headers,
+        authorization: Optional[str],
+    ) -> CachedResponse:
+        """Merge the headers of a 304 into the stored entry (RFC 9111 4.3.4)."""
+        updated = {k.lower() for k, _ in not_modified_headers}
+        headers = [(k, v) for k, v in entry.headers if k.lower() not in updated]
+        headers.extend(not_modified_headers)
+
+        freshness = self._freshness(entry.status, headers, authorization)
+        ttl, swr = freshness or (0, 0)
+        refreshed = CachedResponse(
+            entry.status, headers, entry.body, self.clock(), ttl, swr
+        )
+        stored = key in self._entries  # may have been evicted meanwhile
+        self._remove(key)
+        if stored and freshness is not None:
+            self._insert(key, refreshed)
+        return refreshed
+
+    def _store(
+        self,
+        primary: tuple,
+        request_headers: Headers,
+        status: int,
+        headers: Headers,
+        body: bytes,
+        authorization: Optional[str],
+    ) -> None:
+        freshness = self._freshness(status, headers, authorization)
+        if freshness is None:
+            return
+
+        vary = tuple(
+            sorted(
+                name.strip().lower()
+                for name in (header(headers, "vary") or "").split(",")
+                if name.strip()
+            )
+        )
+        ttl, swr = freshness
+        entry = CachedResponse(status, list(headers), body, self.clock(), ttl, swr)
+        if entry.size > self.max_entry_bytes:
+            return
+
+        if self._vary.get(primary, vary) != vary:
+            self._drop_variants(primary)  # the resource changed its Vary
+        self._vary[primary] = vary
+        key = self._key(primary, request_headers)
+        self._remove(key)
+        self._insert(key, entry)
+
+    def _freshness(
+        self, status: int, headers: Headers, authorization: Optional[str]
+    ) -> Optional[Tuple[float, float]]:
+        """
+        (ttl, stale-while-revalidate) for a storable response, else None.
+        """
+        if status not in CACHEABLE_STATUSES:
+            return None
+        cc = parse_cache_control(header(headers, "cache-control"))
+        if "no-store" in cc or "private" in cc:
+            return None
+        if "*" in (header(headers, "vary") or ""):
+            return None
+        # RFC 9111 section 3.5: authenticated responses need explicit consent
+        if authorization and not (
+            "public" in cc or "s-maxage" in cc or "must-revalidate" in cc
+        ):
+            return None
+
+        ttl = seconds(cc.get("s-maxage"))
+        if ttl is None:
+            ttl = seconds(cc.get("max-age"))
+        if ttl is None:
+            ttl = self._expires_ttl(headers)
+        if ttl is None:
+            # no explicit freshness: keep it only if it can be revalidated
+            if not (header(headers, "etag") or header(headers, "last-modified")):
+                return None
+            ttl = 0
+        if "no-cache" in cc:
+            ttl = 0
+        ttl = max(0, ttl - (seconds(header(headers, "age")) or 0))
+        return ttl, seconds(cc.get("stale-while-revalidate")) or 0
+
+    @staticmethod
+    def _expires_ttl(headers: Headers) -> Optional[int]:
+        expires = header(headers, "expires")
+        if expires is None:
+            return None
+        try:
+            expires_at = parsedate_to_datetime(expires)
+            date = header(headers, "date")
+            now = parsedate_to_datetime(date) if date else None
+        except (TypeError, ValueError):
+            return 0  # invalid Expires means already expired
+        if now is None:
+            return max(0, int(expires_at.timestamp() - time.time()))
+        return max(0, int((expires_at - now).total_seconds()))
+
+    @staticmethod
+    def _credential(authorization: Optional[str]) -> Optional[bytes]:
+        if authorization is None:
+            return None
+        return hashlib.blake2b(authorization.encode("utf-8"), digest_size=16).digest()
+
+    def _key(self, primary: tuple, request_headers: Headers) -> tuple:
+        vary = self._vary.get(primary, ())
+        return primary, tuple(header(request_headers, name) for name in vary)
+
+    def _insert(self, key: tuple, entry: CachedResponse) -> None:
+        primary, _ = key
+        self._entries[key] = entry
+        self._variants[primary] = self._variants.get(primary, 0) + 1
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            evicted_key = next(iter(self._entries))
+            self._remove(evicted_key)
+            self.evictions += 1
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry.size
+        primary, _ = key
+        self._variants[primary] -= 1
+        if not self._variants[primary]:
+            del self._variants[primary]
+            self._vary.pop(primary, None)
+
+    def _drop_variants(self, primary: tuple) -> None:
+        for key in [key for key in self._entries if key[0] == primary]:
+            self._remove(key)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stale_served": self.stale_served,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+        }
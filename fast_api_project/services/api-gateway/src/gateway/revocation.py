@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    The auth service's revoked access tokens, checked locally by jti.
+
+    A check is one lookup in an in-process dict of revoked jtis. New
+    revocations are pulled from the auth service's feed every poll_interval
+    seconds, entries are dropped once their tokens have expired, and the
+    whole feed is reread every resync_interval seconds. Checks never wait
+    on the network.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        poll_interval: float = 2.0,
+        resync_interval: float = 300.0,
+        page_size: int = 1000,
+        timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+        fetch: Optional[Callable[[int, int], Awaitable[Dict]]] = None,
+    ):
+        self.url = url
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.page_size = page_size
+        self.timeout = timeout
+        self.clock = clock
+        self._fetch = fetch or self._get
+        self._revoked: Dict[str, float] = {}  # jti -> exp
+        self._cursor = 0  # seq of the last feed entry seen
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_resync = 0.0
+        self.poll_failures = 0
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def add(self, jti: str, exp: float) -> None:
+        self._revoked.setdefault(jti, exp)
+
+    def expire(self) -> None:
+        """Forget revocations of tokens that have expired anyway."""
+        now = self.clock()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+
+    async def poll(self) -> bool:
+        """Add the revocations after the cursor; False if the feed failed."""
+        try:
+            while True:
+                page = await self._fetch(self._cursor, self.page_size)
+                entries = page["revocations"]
+                for entry in entries:
+                    self.add(entry["jti"], entry["exp"])
+                self._cursor = max(self._cursor, int(page["next"]))
+                if len(entries) < self.page_size:
+                    break
+        except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+            self.poll_failures += 1
+            logger.warning("could not read revocations from %s: %s", self.url, e)
+            return False
+        self.expire()
+        return True
+
+    async def resync(self) -> bool:
+        """
+        Reread the whole feed into a fresh list, catching entries that were
+        committed out of seq order and a reset of the auth database.
+        """
+        fresh = RevocationList(
+            self.url,
+            page_size=self.page_size,
+            clock=self.clock,
+            fetch=self._fetch,
+        )
+        if not await fresh.poll():
+            self.poll_failures += 1
+            return False
+        # swapped in whole: checks see the old list or the new one
+        self._revoked, self._cursor = fresh._revoked, fresh._cursor
+        self._last_resync = time.monotonic()
+        return True
+
+    async def _get(self, after: int, limit: int) -> Dict:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.get(
+            self.url, params={"after": after, "limit": limit}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def start(self) -> None:
+        """Load the list now, then keep following the feed."""
+        await self.resync()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if time.monotonic() - self._last_resync >= self.resync_interval:
+                await self.resync()
+            else:
+                await self.poll()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "revoked": len(self._revoked),
+            "cursor": self._cursor,
+            "poll_failures": self.poll_failures,
+        }
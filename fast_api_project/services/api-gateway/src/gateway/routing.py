@@ -0,0 +1,122 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .config import RouteConfig
+
+
+class MethodNotAllowedError(Exception):
+    """Raised when a route matches the path but not the request method."""
+
+    def __init__(self, path: str, allowed: Iterable[str]):
+        self.allowed = sorted(allowed)
+        super().__init__(f"Method not allowed for {path}")
+
+
+class Route:
+    """
+    A compiled route: target service, rewrite template and filters.
+    """
+
+    __slots__ = ("prefix", "service", "methods", "timeout", "_before", "_after")
+
+    def __init__(self, config: RouteConfig):
+        self.prefix = normalize_prefix(config.prefix)
+        self.service = config.service
+        self.methods: Optional[FrozenSet[str]] = (
+            frozenset(m.upper() for m in config.methods) if config.methods else None
+        )
+        self.timeout = config.timeout
+
+        # "{prefix}" is constant per route, so only "{path}" is left at runtime
+        template = (config.rewrite or "{prefix}{path}").replace(
+            "{prefix}", "" if self.prefix == "/" else self.prefix
+        )
+        if template.count("{path}") > 1:
+            raise ValueError(f"Rewrite template {config.rewrite!r} uses {{path}} twice")
+        self._before, _, self._after = template.partition("{path}")
+
+    def allows(self, method: str) -> bool:
+        return self.methods is None or method in self.methods
+
+    def rewrite(self, remainder: str) -> str:
+        """
+        Upstream path for the part of the request path after the prefix.
+        """
+        return f"{self._before}{remainder}{self._after}" or "/"
+
+
+class _Node:
+    __slots__ = ("children", "routes")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.routes: List[Route] = []
+
+
+def normalize_prefix(prefix: str) -> str:
+    return "/" + prefix.strip("/")
+
+
+class RouteTable:
+    """
+    Routes compiled into a trie of path segments.
+
+    match() walks the request path once, segment by segment, and keeps the
+    deepest route that allows the method, so lookups cost O(path length)
+    whatever the number of routes. Prefixes match whole segments only:
+    "/auth" matches "/auth" and "/auth/login" but not "/authz".
+    """
+
+    def __init__(self, routes: Iterable[RouteConfig]):
+        self._root = _Node()
+        for config in routes:
+            self.add(Route(config))
+
+    def add(self, route: Route) -> None:
+        node = self._root
+        for segment in route.prefix.strip("/").split("/"):
+            if segment:
+                node = node.children.setdefault(segment, _Node())
+        node.routes.append(route)
+
+    def match(self, method: str, path: str) -> Optional[Tuple[Route, str]]:
+        """
+        Longest-prefix match; returns (route, rewritten upstream path).
+
+        Raises MethodNotAllowedError when only routes with other methods match.
+        """
+        node = self._root
+        best = self._pick(node, method)
+        best_end = 0
+        # deepest node deeper than `best` whose routes all reject the method
+        blocked: Optional[_Node] = node if node.routes and best is None else None
+
+        start = 1 if path.startswith("/") else 0
+        length = len(path)
+        while start < length:
+            end = path.find("/", start)
+            if end == -1:
+                end = length
+            node = node.children.get(path[start:end])
+            if node is None:
+                break
+            if node.routes:
+                route = self._pick(node, method)
+                if route is not None:
+                    best, best_end, blocked = route, end, None
+                else:
+                    blocked = node
+            start = end + 1
+
+        if blocked is not None:
+            allowed = {m for route in blocked.routes for m in route.methods}
+            raise MethodNotAllowedError(path, allowed)
+        if best is None:
+            return None
+        return best, best.rewrite(path[best_end:])
+
+    @staticmethod
+    def _pick(node: _Node, method: str) -> Optional[Route]:
+        for route in node.routes:
+            if route.allows(method):
+                return route
+        return None
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# request headers that can change the upstream response, plus the forwarded
+# client chain: upstreams limit per client, so clients must not share a call
+KEY_HEADERS = (
+    "x-forwarded-for",
+    "authorization",
+    "cookie",
+    "accept",
+    "accept-encoding",
+    "accept-language",
+    "range",
+    "if-none-match",
+    "if-modified-since",
+)
+
+
+def request_key(
+    method: str,
+    target: str,
+    headers: Iterable[Tuple[str, str]],
+    key_headers: Iterable[str] = KEY_HEADERS,
+) -> tuple:
+    """
+    Identity of a request for coalescing: method, target (path + query) and
+    the values of the response-relevant headers.
+    """
+    wanted = set(key_headers)
+    values = tuple(
+        sorted((key.lower(), value) for key, value in headers if key.lower() in wanted)
+    )
+    return method, target, values
+
+
+class _Call:
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse identical concurrent calls into one.
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight wait for and share its result (or exception). At most max_waiters
+    callers join one call, later ones run their own. The call runs in its own
+    task, so it survives the first caller disconnecting.
+    """
+
+    def __init__(self, max_waiters: int = 1000):
+        self.max_waiters = max_waiters
+        self._calls: Dict[Hashable, _Call] = {}
+
+        self.leaders = 0  # calls actually made
+        self.coalesced = 0  # callers that shared another call's result
+        self.overflow = 0  # callers turned away because max_waiters was reached
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is not None:
+            if call.waiters < self.max_waiters:
+                call.waiters += 1
+                self.coalesced += 1
+                return await asyncio.shield(call.future)
+            self.overflow += 1
+            return await fn()
+
+        self.leaders += 1
+        call = _Call(asyncio.ensure_future(fn()))
+        self._calls[key] = call
+        call.future.add_done_callback(lambda future: self._finish(key, call))
+        return await asyncio.shield(call.future)
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.future.cancelled():
+            call.future.exception()  # mark retrieved if every caller went away
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "overflow": self.overflow,
+        }
@@ -0,0 +1,101 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+MISSING = object()  # returned by TokenCache.get when nothing is cached
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified JWT claims.
+
+    Entries are keyed by a digest of the token (the raw token is never kept)
+    and expire at the token's "exp" claim. Invalid tokens are cached as
+    negative entries for a short time so repeated garbage is cheap to reject.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        negative_ttl: float = 5.0,  # seconds an invalid token stays rejected
+        max_ttl: float = 300.0,  # cap for tokens without an "exp" claim
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_size = max_size
+        self.negative_ttl = negative_ttl
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, Optional[dict]]]" = (
+            OrderedDict()
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # entries dropped to stay under max_size
+        self.expirations = 0  # entries dropped because they expired
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, token: str):
+        """
+        Return the cached claims, None for a cached invalid token, or MISSING.
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, claims = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        """
+        Cache verified claims until the token expires.
+        """
+        now = self.clock()
+        expires_at = now + self.max_ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at > now:
+            self._store(self._key(token), expires_at, claims)
+
+    def put_invalid(self, token: str) -> None:
+        """
+        Remember that a token failed verification.
+        """
+        self._store(self._key(token), self.clock() + self.negative_ttl, None)
+
+    def _store(self, key: bytes, expires_at: float, claims: Optional[dict]) -> None:
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
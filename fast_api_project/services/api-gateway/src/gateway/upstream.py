@@ -0,0 +1,369 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .balancer import BALANCERS
+from .bulkhead import AIMDLimit, Bulkhead, BulkheadFullError
+from .config import ServiceConfig
+from .health import HealthChecker
+from .resilience import CircuitBreaker, LatencyTracker, RetryBudget
+
+# safe to send twice (RFC 9110 section 9.2.2)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class NoHealthyInstanceError(Exception):
+    """Raised when every instance of a service is ejected or its breaker is open."""
+
+    def __init__(self, service: str):
+        super().__init__(f"No healthy instance of service {service}")
+        self.service = service
+
+
+def build_client(config: ServiceConfig) -> httpx.AsyncClient:
+    """
+    Build a pooled HTTP client for one upstream service.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.write_timeout,
+            pool=config.pool_timeout,
+        ),
+        http2=config.http2,
+    )
+
+
+class Instance:
+    """
+    One upstream instance and the state used to balance across it.
+    """
+
+    def __init__(self, url: str, breaker: Optional[CircuitBreaker] = None):
+        self.url = url.rstrip("/")
+        self.healthy = True
+        self.outstanding = 0  # requests currently in flight
+        self.consecutive_failures = 0  # failed health probes in a row
+        self.consecutive_successes = 0  # passing health probes in a row
+        self.breaker = breaker or CircuitBreaker()
+
+    def available(self) -> bool:
+        return self.healthy and self.breaker.allows(self.outstanding)
+
+    def __repr__(self) -> str:
+        return f"Instance({self.url!r}, healthy={self.healthy})"
+
+
+class Upstream:
+    """
+    A registered service: its instances, balancer and pooled client.
+    """
+
+    def __init__(self, name: str, config: ServiceConfig):
+        self.name = name
+        self.config = config
+        self.instances = [
+            Instance(url, self._build_breaker()) for url in config.instances
+        ]
+        self.balancer = BALANCERS[config.balancer]()
+        self.client = build_client(config)
+        self.health_checker = HealthChecker(self)
+        self.retry_budget = RetryBudget(
+            ratio=config.retry_budget_ratio,
+            min_per_second=config.retry_budget_min_per_second,
+        )
+        self.latency = LatencyTracker(
+            percentile=config.hedge_percentile,
+            min_samples=config.hedge_min_samples,
+        )
+        self.bulkhead = self._build_bulkhead()
+        self.stats: Counter = Counter()
+
+    def _build_breaker(self) -> CircuitBreaker:
+        config = self.config
+        return CircuitBreaker(
+            window=config.breaker_window,
+            min_calls=config.breaker_min_calls,
+            failure_rate=config.breaker_failure_rate,
+            slow_call_seconds=config.breaker_slow_call_seconds,
+            slow_call_rate=config.breaker_slow_call_rate,
+            open_seconds=config.breaker_open_seconds,
+            half_open_calls=config.breaker_half_open_calls,
+        )
+
+    def _build_bulkhead(self) -> Optional[Bulkhead]:
+        config = self.config
+        if not config.max_concurrency:
+            return None
+        adaptive = None
+        if config.adaptive_concurrency:
+            adaptive = AIMDLimit(
+                initial=config.max_concurrency,
+                min_limit=config.min_concurrency,
+                max_limit=config.max_concurrency,
+                tolerance=config.adaptive_latency_tolerance,
+                backoff=config.adaptive_backoff,
+            )
+        return Bulkhead(
+            self.name,
+            limit=config.max_concurrency,
+            max_queue=config.max_queue,
+            queue_timeout=config.queue_timeout,
+            retry_after=config.retry_after,
+            adaptive=adaptive,
+        )
+
+    def describe(self) -> dict:
+        """
+        Counters and per-instance state for the admin endpoint.
+        """
+        return {
+            "counters": dict(self.stats),
+            "p95_latency": self.latency.value(),
+            "bulkhead": self.bulkhead.stats() if self.bulkhead else None,
+            "instances": [
+                {
+                    "url": instance.url,
+                    "healthy": instance.healthy,
+                    "outstanding": instance.outstanding,
+                    "breaker": instance.breaker.state,
+                    "breaker_opened": instance.breaker.times_opened,
+                }
+                for instance in self.instances
+            ],
+        }
+
+    def healthy_instances(self) -> List[Instance]:
+        return [instance for instance in self.instances if instance.healthy]
+
+    def acquire(self) -> Instance:
+        """
+        Pick an instance for a request and count it as in flight.
+
+        Instances that are ejected or whose breaker is open are skipped.
+        Every acquire() must be paired with a release().
+        """
+        candidates = [instance for instance in self.instances if instance.available()]
+        if not candidates:
+            self.stats["rejected_no_instance"] += 1
+            raise NoHealthyInstanceError(self.name)
+        instance = self.balancer.pick(candidates)
+        instance.outstanding += 1
+        return instance
+
+    def release(self, instance: Instance) -> None:
+        instance.outstanding -= 1
+
+    async def admit(self) -> None:
+        """
+        Wait for a bulkhead slot for one proxied request.
+
+        Raises BulkheadFullError when the request is shed. Every admit() must
+        be paired with a leave() once the response has been consumed.
+        """
+        if self.bulkhead is not None:
+            try:
+                await self.bulkhead.acquire()
+            except BulkheadFullError:
+                self.stats["shed"] += 1
+                raise
+
+    def leave(self) -> None:
+        if self.bulkhead is not None:
+            self.bulkhead.release()
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers,
+        params=None,
+        content=None,
+        stream: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Tuple[httpx.Response, Instance]:
+        """
+        Send a request to one of the instances.
+
+        Idempotent requests with a replayable body are retried on connection
+        errors and 502/503/504 while the retry budget allows it, and GETs are
+        hedged when enabled. timeout, when given, replaces the service
+        timeouts for each attempt. The caller must release() the returned
+        instance once the response has been consumed.
+        """
+        self.stats["requests"] += 1
+        self.retry_budget.deposit()
+
+        replayable = not hasattr(content, "__aiter__")
+        retries = self.config.max_retries
+        if method not in IDEMPOTENT_METHODS or not replayable:
+            retries = 0
+        hedge = self.config.hedge_gets and method == "GET" and replayable
+        kwargs = dict(
+            headers=headers,
+            params=params,
+            content=content,
+            stream=stream,
+            timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+        )
+
+        attempt = 0
+        while True:
+            error = None
+            try:
+                if hedge:
+                    response, instance = await self._hedged(method, path, kwargs)
+                else:
+                    response, instance = await self._attempt(method, path, kwargs)
+            except httpx.RequestError as e:
+                error = e
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response, instance
+
+            if attempt >= retries or not self.retry_budget.try_withdraw():
+                if attempt < retries:
+                    self.stats["retries_budget_exhausted"] += 1
+                if error is not None:
+                    raise error
+                return response, instance
+
+            if error is None:
+                await response.aclose()
+                self.release(instance)
+            attempt += 1
+            self.stats["retries"] += 1
+
+    async def _attempt(
+        self, method: str, path: str, kwargs: dict
+    ) -> Tuple[httpx.Response, Instance]:
+        instance = self.acquire()
+        request = self.client.build_request(
+            method,
+            f"{instance.url}{path}",
+            headers=kwargs["headers"],
+            params=kwargs["params"],
+            content=kwargs["content"],
+            timeout=kwargs["timeout"],
+        )
+        start = time.perf_counter()
+        try:
+            response = await self.client.send(request, stream=kwargs["stream"])
+        except httpx.RequestError:
+            latency = time.perf_counter() - start
+            instance.breaker.record(False, latency)
+            if self.bulkhead:
+                self.bulkhead.record(False, latency)
+            self.stats["errors"] += 1
+            self.release(instance)
+            raise
+        except BaseException:  # cancelled, e.g. the losing side of a hedge
+            self.release(instance)
+            raise
+
+        latency = time.perf_counter() - start
+        ok = response.status_code < 500
+        instance.breaker.record(ok, latency)
+        if self.bulkhead:
+            self.bulkhead.record(ok, latency)
+        if ok:
+            self.latency.add(latency)
+        else:
+            self.stats["errors"] += 1
+        return response, instance
+
+    async def _hedged(
+        self, method: str, path: str, kwargs: dict
+    ) -> Tuple[httpx.Response, Instance]:
+        delay = self.latency.value()
+        if delay is None:  # not enough samples yet
+            return await self._attempt(method, path, kwargs)
+
+        first = asyncio.ensure_future(self._attempt(method, path, kwargs))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+        except asyncio.CancelledError:
+            first.cancel()
+            await self._discard(first)
+            raise
+        if done or not self.retry_budget.try_withdraw():
+            return await first
+
+        self.stats["hedges"] += 1
+        second = asyncio.ensure_future(self._attempt(method, path, kwargs))
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((task for task in done if not task.exception()), None)
+                if winner is None:
+                    error = next(iter(done)).exception()
+                    continue
+                for task in done - {winner}:
+                    await self._discard(task)
+                if winner is second:
+                    self.stats["hedge_wins"] += 1
+                return winner.result()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                await self._discard(task)
+
+    async def _discard(self, task: asyncio.Future) -> None:
+        """Close the response of a hedge attempt that lost the race."""
+        try:
+            response, instance = await task
+        except (asyncio.CancelledError, Exception):
+            return
+        await response.aclose()
+        self.release(instance)
+
+
+class UpstreamPool:
+    """
+    One long-lived upstream (pooled client + instances) per registered service.
+
+    Clients are opened in the application lifespan and shared by every
+    proxied request, so connections to upstreams are reused instead of being
+    set up (DNS, TCP connect, TLS) on each call.
+    """
+
+    def __init__(self, services: Dict[str, ServiceConfig]):
+        self.services = services
+        self._upstreams: Dict[str, Upstream] = {}
+
+    async def start(self) -> None:
+        for name, config in self.services.items():
+            upstream = Upstream(name, config)
+            upstream.health_checker.start()
+            self._upstreams[name] = upstream
+
+    async def close(self) -> None:
+        for upstream in self._upstreams.values():
+            await upstream.health_checker.stop()
+            await upstream.client.aclose()
+        self._upstreams.clear()
+
+    def upstream(self, service: str) -> Upstream:
+        return self._upstreams[service]
+
+    def client(self, service: str) -> httpx.AsyncClient:
+        """
+        Return the pooled client for a service.
+        """
+        return self._upstreams[service].client
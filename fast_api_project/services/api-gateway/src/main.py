@@ -1,99 +1,351 @@
+from contextlib import asynccontextmanager
+
 import httpx  # for making HTTP requests
-from fastapi import FastAPI, Request, HTTPException, status
-from fastapi.responses import JSONResponse
-from jose import JWTError, jwt
+from fastapi import FastAPI, HTTPException, Request, Response, status
+
+from gateway.asgi import ProxyApp
+from gateway.bulkhead import BulkheadFullError
+from gateway.config import get_settings, load_routes, load_services
+from gateway.jwks import JWKSVerifier, UnknownKeyError
+from gateway.jwt_verifier import HMACJWTVerifier, InvalidTokenError
+from gateway.proxy import (
+    RelayedBody,
+    RelayResponse,
+    encode_headers,
+    forward_for,
+    has_body,
+    header,
+    strip_hop_by_hop,
+)
+from gateway.response_cache import ResponseCache
+from gateway.revocation import RevocationList
+from gateway.routing import MethodNotAllowedError, RouteTable
+from gateway.singleflight import SingleFlight, request_key
+from gateway.token_cache import MISSING, TokenCache
+from gateway.upstream import NoHealthyInstanceError, UpstreamPool
 
-app = FastAPI(title="API Gateway")
+settings = get_settings()
 
-# service registry
-Services = {
-    "auth": "http://auth_service:8001",
-}
+# service registry (GATEWAY_SERVICES or GATEWAY_SERVICES_FILE)
+Services = load_services(settings)
 
-# JWT Configuration(should match auth service)
-JWT_SECRET = "change-me"  # Use environment variable in production
-JWT_ALGORITHM = "HS256"
+# path prefix -> service (GATEWAY_ROUTES or GATEWAY_ROUTES_FILE)
+routes = RouteTable(load_routes(settings, Services))
 
 
-def extract_service_from_path(path: str) -> tuple[str, str]:
+def make_jwt_verifier(settings):
+    """
+    The local JWT verifier: the auth service's public keys when JWKS_URL is
+    set, otherwise the shared secret. With JWKS_URL the secret is used only
+    if JWT_HMAC_FALLBACK opts in, so a key-set gateway cannot be fooled by
+    a token signed with a leaked or default secret.
     """
-    Extract service name and remaining path from request.
+    if not settings.JWKS_URL:
+        if not settings.JWT_SECRET:
+            raise ValueError("Set GATEWAY_JWT_SECRET or GATEWAY_JWKS_URL")
+        return HMACJWTVerifier(
+            settings.JWT_SECRET, settings.JWT_ALGORITHM, settings.JWT_LEEWAY
+        )
+    fallback = None
+    if settings.JWT_HMAC_FALLBACK:
+        if not settings.JWT_SECRET:
+            raise ValueError("GATEWAY_JWT_HMAC_FALLBACK needs GATEWAY_JWT_SECRET")
+        fallback = HMACJWTVerifier(
+            settings.JWT_SECRET, settings.JWT_ALGORITHM, settings.JWT_LEEWAY
+        )
+    return JWKSVerifier(
+        settings.JWKS_URL,
+        fallback=fallback,
+        refresh_interval=settings.JWKS_REFRESH_INTERVAL,
+        min_refresh_interval=settings.JWKS_MIN_REFRESH_INTERVAL,
+        leeway=settings.JWT_LEEWAY,
+    )
+
+
+# JWT verification, always local (the key set is refreshed in the background)
+jwt_verifier = make_jwt_verifier(settings)
+jwks_verifier = jwt_verifier if isinstance(jwt_verifier, JWKSVerifier) else None
+
+# revoked access tokens, followed from the auth service's feed
+revocations = (
+    RevocationList(
+        settings.REVOCATION_FEED_URL,
+        poll_interval=settings.REVOCATION_POLL_INTERVAL,
+        resync_interval=settings.REVOCATION_RESYNC_INTERVAL,
+    )
+    if settings.REVOCATION_FEED_URL
+    else None
+)
+
+# verified claims, so repeated tokens skip the decode/HMAC
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_SIZE,
+    negative_ttl=settings.TOKEN_CACHE_NEGATIVE_TTL,
+)
 
-    Examples:
-        /auth/register -> ("auth", "/register")
-        /users/profile -> ("users", "/profile")
+# shared HTTP cache for GETs of services with cache_responses enabled
+response_cache = (
+    ResponseCache(
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    )
+    if settings.RESPONSE_CACHE_MAX_BYTES
+    else None
+)
+
+# identical concurrent GETs share one upstream call
+singleflight = SingleFlight(max_waiters=settings.SINGLEFLIGHT_MAX_WAITERS)
+
+
+# buffered responses are decoded by httpx, so these no longer describe the body
+DECODED_BODY_HEADERS = {"content-encoding", "content-length"}
+
+PROXY_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH"]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open one pooled upstream client per service, fetch the token signing
+    keys and the revocation list; close them on shutdown.
     """
-    parts = path.strip("/").split("/", 1)
-    service = parts[0] if parts else None
-    remaining_path = f"/{parts[1]}" if len(parts) > 1 else "/"
-    return service, remaining_path
+    upstreams = UpstreamPool(Services)
+    await upstreams.start()
+    app.state.upstreams = upstreams
+    if jwks_verifier is not None:
+        await jwks_verifier.start()
+    if revocations is not None:
+        await revocations.start()
+
+    yield  # Application runs here
+
+    if revocations is not None:
+        await revocations.stop()
+    if jwks_verifier is not None:
+        await jwks_verifier.stop()
+    await upstreams.close()
+
+
+app = FastAPI(title="API Gateway", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", "service": "api-gateway"}
+
+
+@app.get("/admin/stats")
+async def stats(request: Request):
+    upstreams = request.app.state.upstreams
+    return {
+        "token_cache": token_cache.stats(),
+        "jwks": jwks_verifier.stats() if jwks_verifier else None,
+        "revocations": revocations.stats() if revocations else None,
+        "response_cache": response_cache.stats() if response_cache else None,
+        "singleflight": singleflight.stats(),
+        "upstreams": {name: upstreams.upstream(name).describe() for name in Services},
+    }
 
 
 def verify_jwt(token: str) -> dict:
     """Verify JWT token and return payload."""
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
-    except JWTError:
+    payload = token_cache.get(token)
+    if payload is MISSING:
+        try:
+            payload = jwt_verifier.verify(token)
+        except UnknownKeyError:
+            payload = None  # not cached: valid once the new key is fetched
+        except InvalidTokenError:
+            token_cache.put_invalid(token)
+            payload = None
+        else:
+            token_cache.put(token, payload)
+
+    # checked on cache hits too: a token can be revoked after it was cached
+    if payload is not None and revocations is not None:
+        if revocations.is_revoked(payload.get("jti")):
+            payload = None
+
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token"
         )
+    return payload
 
 
-@app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
-async def gateway(request: Request, path: str):
+async def proxy(method, path, query, request_headers, body_stream, client=None):
     """
-    Main gateway endpoint that proxies requests to appropriate services.
-    """
-    service_name, service_path = extract_service_from_path(path)
+    Proxy one request to its service.
 
-    if service_name not in Services:
+    Shared by the FastAPI route and the raw ASGI fast path. client is the
+    peer address, forwarded in X-Forwarded-For. Returns
+    (status, headers, content) where content is bytes, or an async iterator
+    of raw chunks for streaming services. Errors are raised as HTTPException.
+    """
+    try:
+        matched = routes.match(method, path)
+    except MethodNotAllowedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+            detail="Method Not Allowed",
+            headers={"Allow": ", ".join(e.allowed)},
+        )
+    if matched is None:
         raise HTTPException(status_code=404, detail="Internal server error")
 
-    service_url = Services[service_name]
-    target_url = f"{service_url}/auth{service_path}"
-
-    # Get request body
-    body = await request.body
+    route, upstream_path = matched
+    service_name = route.service
+    upstream = app.state.upstreams.upstream(service_name)
+    streaming = upstream.config.streaming
+    target = f"{upstream_path}?{query}" if query else upstream_path
 
     # Prepare headers
-    headers = dict(request.headers)
-    (headers.pop("host", None),)
+    headers = forward_for(
+        [
+            (key, value)
+            for key, value in strip_hop_by_hop(request_headers)
+            if key.lower() != "host"
+        ],
+        client,
+    )
+
+    # Get request body
+    if not has_body(request_headers):
+        body = None
+    elif streaming:
+        body = body_stream  # piped to the upstream as it arrives
+    else:
+        body = b"".join([chunk async for chunk in body_stream])
 
     # JWT
-    auth_header = request.headers.get("authorization")
+    auth_header = header(request_headers, "authorization")
     if auth_header and auth_header.startswith("Bearer "):
         token = auth_header.split(" ")[1]
         try:
             payload = verify_jwt(token)
-            headers["X-User_ID"] = str(payload.get("sub"))
-            headers["X-User-Email"] = payload.get("email", "")
+            headers.append(("X-User_ID", str(payload.get("sub"))))
+            headers.append(("X-User-Email", payload.get("email", "")))
         except HTTPException:
             pass
 
-    async with httpx.AsyncClient() as client:
+    async def admit():
+        try:
+            await upstream.admit()
+        except BulkheadFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+    async def send(extra_headers=(), stream=False):
         try:
-            response = await client.request(
-                method=request.method,
-                url=request.url,
+            return await upstream.send(
+                method,
+                target,
+                headers=headers + list(extra_headers),
                 content=body,
-                headers=headers,
-                params=request.query_params,
+                stream=stream,
+                timeout=route.timeout,
+            )
+        except NoHealthyInstanceError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
             )
-            return response
         except httpx.RequestError as e:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"Service unavailable: {e}",
             )
 
+    if streaming:
+        await admit()
+        try:
+            response, instance = await send(stream=True)
+        except BaseException:
+            upstream.leave()
+            raise
 
-@app.get("/health")
-async def health():
-    return {"status": "healthy", "service": "api-gateway"}
+        async def done():
+            upstream.release(instance)
+            upstream.leave()
+            await response.aclose()  # last: it may be cancelled mid-await
+
+        response_headers = strip_hop_by_hop(response.headers.multi_items())
+        # raw bytes keep Content-Encoding/Content-Length valid
+        return (
+            response.status_code,
+            response_headers,
+            RelayedBody(response.aiter_raw(), done),
+        )
+
+    async def forward(extra_headers):
+        await admit()
+        try:
+            response, instance = await send(extra_headers)
+        finally:
+            upstream.leave()  # the body has been read already
+        upstream.release(instance)
+        response_headers = [
+            (key, value)
+            for key, value in strip_hop_by_hop(response.headers.multi_items())
+            if key.lower() not in DECODED_BODY_HEADERS
+        ]
+        return response.status_code, response_headers, response.content
+
+    resource = f"{service_name} {target}"
+
+    async def coalesced(extra_headers):
+        # the outgoing headers: they carry this client's X-Forwarded-For
+        key = request_key(method, resource, headers + list(extra_headers))
+        status_code, response_headers, content = await singleflight.do(
+            key, lambda: forward(extra_headers)
+        )
+        return status_code, list(response_headers), content  # shared by waiters
+
+    is_get = method == "GET"
+    fetch = coalesced if is_get and upstream.config.coalesce_gets else forward
+
+    if is_get and upstream.config.cache_responses and response_cache:
+        (
+            status_code,
+            response_headers,
+            content,
+            cache_status,
+        ) = await response_cache.fetch(resource, request_headers, fetch)
+        response_headers.append(("x-cache", cache_status))
+        return status_code, response_headers, content
+
+    return await fetch(())
+
+
+@app.api_route("/{path:path}", methods=PROXY_METHODS)
+async def gateway(request: Request, path: str):
+    """
+    Main gateway endpoint that proxies requests to appropriate services.
+    """
+    status_code, response_headers, content = await proxy(
+        request.method,
+        request.url.path,
+        request.url.query,
+        request.headers.items(),
+        request.stream(),
+        request.client.host if request.client else None,
+    )
+
+    if isinstance(content, bytes):
+        proxied = Response(content=content, status_code=status_code)
+    else:
+        proxied = RelayResponse(content, status_code=status_code)
+    proxied.raw_headers.extend(encode_headers(response_headers))
+    return proxied
+
+
+# raw ASGI front: proxied paths skip FastAPI routing, the rest falls through
+fast_app = ProxyApp(app, proxy, methods=PROXY_METHODS)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(fast_app if settings.FAST_PATH else app, host="0.0.0.0", port=8000)
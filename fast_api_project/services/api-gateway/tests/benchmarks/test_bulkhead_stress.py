@@ -0,0 +1,103 @@
+"""
+Stress test: a flood of requests against a deliberately slow upstream, with
+and without the bulkhead. Tune with BENCH_FLOOD / BENCH_UPSTREAM_DELAY.
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from conftest import percentile, serve
+
+import main
+from gateway.config import ServiceConfig
+
+FLOOD = int(os.environ.get("BENCH_FLOOD", "100"))
+UPSTREAM_DELAY = float(os.environ.get("BENCH_UPSTREAM_DELAY", "1.0"))
+LIMIT = 10
+QUEUE = 20
+QUEUE_TIMEOUT = 0.3
+
+
+def slow_upstream(load: dict):
+    """Upstream that takes UPSTREAM_DELAY per request and tracks its concurrency."""
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        load["now"] += 1
+        load["peak"] = max(load["peak"], load["now"])
+        try:
+            await asyncio.sleep(UPSTREAM_DELAY)
+        finally:
+            load["now"] -= 1
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
+async def timed(client: httpx.AsyncClient, url: str):
+    start = time.perf_counter()
+    response = await client.get(url)
+    return response, time.perf_counter() - start
+
+
+async def flood(gateway_url: str):
+    limits = httpx.Limits(max_connections=FLOOD)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        proxied = [
+            asyncio.ensure_future(timed(client, f"{gateway_url}/auth/slow"))
+            for _ in range(FLOOD)
+        ]
+        await asyncio.sleep(0.05)
+        async with httpx.AsyncClient(timeout=60) as probe:
+            health = [await timed(probe, f"{gateway_url}/health") for _ in range(10)]
+        return await asyncio.gather(*proxied), health
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_concurrency", [0, LIMIT])
+async def test_bulkhead_sheds_load_from_slow_upstream(monkeypatch, max_concurrency):
+    load = {"now": 0, "peak": 0}
+    with serve(slow_upstream(load)) as upstream_url:
+        monkeypatch.setitem(
+            main.Services,
+            "auth",
+            ServiceConfig(
+                url=upstream_url,
+                health_interval=0,
+                coalesce_gets=False,
+                max_connections=FLOOD,
+                max_concurrency=max_concurrency,
+                max_queue=QUEUE,
+                queue_timeout=QUEUE_TIMEOUT,
+                retry_after=2,
+            ),
+        )
+        with serve(main.app) as gateway_url:
+            results, health = await flood(gateway_url)
+
+    ok = [elapsed for response, elapsed in results if response.status_code == 200]
+    shed = [(r, elapsed) for r, elapsed in results if r.status_code == 503]
+    health_p95 = percentile([elapsed for _, elapsed in health], 95)
+    print(
+        f"\nmax_concurrency={max_concurrency}: {len(ok)} ok, {len(shed)} shed, "
+        f"upstream peak {load['peak']}, "
+        f"shed p95 {1000 * percentile([e for _, e in shed] or [0], 95):.0f}ms, "
+        f"/health p95 {1000 * health_p95:.1f}ms"
+    )
+
+    assert len(ok) + len(shed) == FLOOD
+    if not max_concurrency:
+        assert not shed
+        assert load["peak"] > LIMIT
+        return
+
+    assert load["peak"] <= LIMIT
+    assert shed
+    assert all(r.headers["retry-after"] == "2" for r, _ in shed)
+    # shed requests are answered without waiting for the slow upstream
+    assert percentile([elapsed for _, elapsed in shed], 50) < UPSTREAM_DELAY
@@ -0,0 +1,98 @@
+"""
+Benchmark: per-request overhead of the FastAPI catch-all route vs. the raw
+ASGI fast path. Both are driven in-process with the upstream mocked out, so
+the difference is the framework cost alone. Tune with BENCH_REQUESTS.
+"""
+
+import os
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+
+import main
+from gateway.config import ServiceConfig
+from gateway.upstream import UpstreamPool
+
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", "2000"))
+
+
+def upstream_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"path": request.url.path})
+
+
+@pytest_asyncio.fixture
+async def mocked_upstreams(monkeypatch):
+    config = ServiceConfig(url="http://auth", health_interval=0, coalesce_gets=False)
+    monkeypatch.setitem(main.Services, "auth", config)
+    pool = UpstreamPool({"auth": config})
+    await pool.start()
+    upstream = pool.upstream("auth")
+    await upstream.client.aclose()
+    upstream.client = httpx.AsyncClient(transport=httpx.MockTransport(upstream_handler))
+    main.app.state.upstreams = pool
+    yield pool
+    await pool.close()
+
+
+async def call(app, method="GET", path="/auth/me", body=b"", headers=()):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"gateway"), (b"accept", b"*/*"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("gateway", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    status = messages[0]["status"]
+    content = b"".join(m.get("body", b"") for m in messages[1:])
+    return status, dict(messages[0]["headers"]), content
+
+
+async def per_request_us(app) -> float:
+    for _ in range(100):  # warm up
+        await call(app)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await call(app)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_fastapi_route(mocked_upstreams):
+    for path in ("/auth/me", "/unknown/x", "/health"):
+        assert await call(main.fast_app, path=path) == await call(main.app, path=path)
+
+    body = b'{"email": "a@example.com"}'
+    length = [(b"content-length", str(len(body)).encode())]
+    assert await call(main.fast_app, "POST", body=body, headers=length) == (
+        await call(main.app, "POST", body=body, headers=length)
+    )
+
+
+@pytest.mark.asyncio
+async def test_fast_path_overhead(mocked_upstreams):
+    fastapi_us = await per_request_us(main.app)
+    fast_path_us = await per_request_us(main.fast_app)
+    print(
+        f"\nFastAPI route: {fastapi_us:.0f} us/request"
+        f"\nASGI fast path: {fast_path_us:.0f} us/request"
+        f"\nsaved: {fastapi_us - fast_path_us:.0f} us/request"
+    )
+    assert fast_path_us < fastapi_us
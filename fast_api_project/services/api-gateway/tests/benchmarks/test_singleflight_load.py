@@ -0,0 +1,76 @@
+"""
+Load test: upstream call volume for bursts of identical concurrent GETs,
+with and without request coalescing. Tune with BENCH_BURSTS / BENCH_BURST_SIZE.
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from conftest import serve
+
+import main
+from gateway.config import ServiceConfig
+from gateway.singleflight import SingleFlight
+
+BURSTS = int(os.environ.get("BENCH_BURSTS", "4"))
+BURST_SIZE = int(os.environ.get("BENCH_BURST_SIZE", "50"))
+
+
+def counting_upstream(calls: list):
+    """Slow upstream that counts the requests it receives."""
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        calls.append(scope["path"])
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b'{"user": 1}'})
+
+    return app
+
+
+async def run_bursts(gateway_url: str) -> float:
+    limits = httpx.Limits(max_connections=BURST_SIZE)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        for _ in range(BURSTS):
+            responses = await asyncio.gather(
+                *(client.get(f"{gateway_url}/auth/me") for _ in range(BURST_SIZE))
+            )
+            assert all(r.status_code == 200 for r in responses)
+        return time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("coalesce", [False, True])
+async def test_coalescing_cuts_upstream_calls(monkeypatch, coalesce):
+    calls = []
+    monkeypatch.setattr(main, "singleflight", SingleFlight())
+    with serve(counting_upstream(calls)) as upstream_url:
+        monkeypatch.setitem(
+            main.Services,
+            "auth",
+            ServiceConfig(
+                url=upstream_url,
+                coalesce_gets=coalesce,
+                health_interval=0,
+                max_connections=BURST_SIZE,
+            ),
+        )
+        with serve(main.app) as gateway_url:
+            elapsed = await run_bursts(gateway_url)
+
+    total = BURSTS * BURST_SIZE
+    print(
+        f"\ncoalesce={coalesce}: {total} requests -> {len(calls)} upstream calls "
+        f"({100 * (1 - len(calls) / total):.0f}% fewer) in {elapsed:.2f}s"
+    )
+    if coalesce:
+        assert len(calls) < total / 4
+        assert main.singleflight.coalesced == total - len(calls)
+    else:
+        assert len(calls) == total
@@ -0,0 +1,103 @@
+"""
+Memory/throughput test for the streaming proxy mode.
+
+Uploads and downloads a multi-hundred-MB body through a real gateway process
+in front of a local upstream and checks that peak Python memory stays flat.
+Tune the payload with BENCH_STREAM_MB.
+"""
+
+import os
+import time
+import tracemalloc
+
+import httpx
+import pytest
+from conftest import serve
+
+import main
+from gateway.config import ServiceConfig
+
+PAYLOAD_MB = int(os.environ.get("BENCH_STREAM_MB", "256"))
+CHUNK = b"x" * 64 * 1024
+CHUNKS = PAYLOAD_MB * 1024 * 1024 // len(CHUNK)
+MEMORY_CEILING = 32 * 1024 * 1024  # far below the payload size
+
+
+async def upstream_app(scope, receive, send):
+    """Counts uploaded bytes, then streams CHUNKS chunks back."""
+    if scope["type"] != "http":
+        return
+
+    received = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        received += len(message.get("body", b""))
+        more_body = message.get("more_body", False)
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-length", str(CHUNKS * len(CHUNK)).encode()),
+                (b"x-received-bytes", str(received).encode()),
+                (b"connection", b"keep-alive, x-upstream-only"),
+                (b"x-upstream-only", b"must be stripped"),
+            ],
+        }
+    )
+    for i in range(CHUNKS):
+        await send(
+            {
+                "type": "http.response.body",
+                "body": CHUNK,
+                "more_body": i < CHUNKS - 1,
+            }
+        )
+
+
+async def upload():
+    for _ in range(CHUNKS):
+        yield CHUNK
+
+
+@pytest.mark.asyncio
+async def test_streaming_keeps_gateway_memory_flat(monkeypatch):
+    with serve(upstream_app) as upstream_url:
+        monkeypatch.setitem(
+            main.Services,
+            "auth",
+            ServiceConfig(url=upstream_url, streaming=True, health_interval=0),
+        )
+        with serve(main.app) as gateway_url:
+            tracemalloc.start()
+            start = time.perf_counter()
+
+            async with httpx.AsyncClient(timeout=120) as client:
+                async with client.stream(
+                    "POST",
+                    f"{gateway_url}/auth/upload",
+                    content=upload(),
+                    headers={"content-length": str(CHUNKS * len(CHUNK))},
+                ) as response:
+                    first_byte = time.perf_counter() - start
+                    downloaded = 0
+                    async for chunk in response.aiter_raw():
+                        downloaded += len(chunk)
+
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    total = CHUNKS * len(CHUNK)
+    print(
+        f"\n{PAYLOAD_MB} MB up + {PAYLOAD_MB} MB down in {elapsed:.1f}s "
+        f"({2 * PAYLOAD_MB / elapsed:.0f} MB/s), first byte after "
+        f"{first_byte * 1000:.0f} ms, peak traced memory {peak / 2**20:.1f} MB"
+    )
+    assert response.status_code == 200
+    assert int(response.headers["x-received-bytes"]) == total
+    assert downloaded == total
+    assert "x-upstream-only" not in response.headers
+    assert peak < MEMORY_CEILING
@@ -0,0 +1,84 @@
+"""
+Benchmark: pooled upstream client vs. a new httpx.AsyncClient per request.
+
+Runs against a local uvicorn stand-in upstream and prints requests/sec and
+p99 latency for both behaviours. Tune with BENCH_REQUESTS / BENCH_CONCURRENCY.
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from conftest import percentile, serve
+
+from gateway.config import ServiceConfig
+from gateway.upstream import UpstreamPool
+
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", "300"))
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", "16"))
+
+
+async def upstream_app(scope, receive, send):
+    """Minimal stand-in for an upstream service."""
+    if scope["type"] != "http":
+        return
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b'{"status":"ok"}'})
+
+
+async def run_load(call) -> dict:
+    latencies = []
+    queue = iter(range(REQUESTS))
+
+    async def worker():
+        for _ in queue:
+            start = time.perf_counter()
+            response = await call()
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": REQUESTS / elapsed,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_beats_client_per_request():
+    with serve(upstream_app) as url:
+
+        async def client_per_request():
+            # previous gateway behaviour
+            async with httpx.AsyncClient() as client:
+                return await client.get(f"{url}/auth/me")
+
+        old = await run_load(client_per_request)
+
+        pool = UpstreamPool({"auth": ServiceConfig(url=url, health_interval=0)})
+        await pool.start()
+        try:
+            client = pool.client("auth")
+
+            async def pooled():
+                return await client.get(f"{url}/auth/me")
+
+            new = await run_load(pooled)
+        finally:
+            await pool.close()
+
+    print(
+        f"\nclient per request: {old['rps']:.0f} req/s, p99 {old['p99_ms']:.1f} ms"
+        f"\npooled client:      {new['rps']:.0f} req/s, p99 {new['p99_ms']:.1f} ms"
+    )
+    assert new["rps"] > old["rps"]
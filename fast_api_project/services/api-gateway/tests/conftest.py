@@ -0,0 +1,59 @@
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import uvicorn
+
+# the gateway runs from src/ (python main.py), mirror that for imports;
+# app_shared is installed from shared/ (pip install -e ../../shared[keys])
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(1, str(Path(__file__).resolve().parents[3] / "shared"))
+
+# main builds its verifier at import and there is no default secret
+os.environ.setdefault("GATEWAY_JWT_SECRET", "test-secret")
+
+
+@contextmanager
+def serve(app, **config):
+    """
+    Run an ASGI app with uvicorn on a free local port in a background thread.
+
+    Yields the base URL of the running server.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+    config.setdefault("log_level", "warning")
+    config.setdefault("loop", "asyncio")
+    server = uvicorn.Server(uvicorn.Config(app, **config))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]})
+    thread.daemon = True
+    thread.start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("uvicorn stand-in failed to start")
+        time.sleep(0.01)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        sock.close()
+
+
+def percentile(samples, pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from conftest import serve
+
+import main
+from gateway.config import ServiceConfig
+from gateway.upstream import UpstreamPool
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/auth/download",
+    "raw_path": b"/auth/download",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"gateway")],
+    "client": ("127.0.0.1", 1234),
+    "server": ("127.0.0.1", 8000),
+}
+
+
+async def upstream_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for _ in range(3):
+        await send({"type": "http.response.body", "body": b"x", "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+@pytest_asyncio.fixture
+async def upstream(monkeypatch):
+    with serve(upstream_app) as url:
+        pool = UpstreamPool(
+            {"auth": ServiceConfig(url=url, streaming=True, health_interval=0)}
+        )
+        await pool.start()
+        monkeypatch.setattr(main.app.state, "upstreams", pool, raising=False)
+        yield pool.upstream("auth")
+        await pool.close()
+
+
+async def disconnected():
+    return {"type": "http.disconnect"}
+
+
+def assert_released(upstream):
+    assert upstream.instances[0].outstanding == 0
+    assert upstream.bulkhead.in_flight == 0
+
+
+class TestStreamedResponseRelease:
+    @pytest.mark.asyncio
+    async def test_client_gone_before_the_body(self, upstream):
+        """
+        Test that a streamed response whose client disconnects before the
+        first chunk releases the instance and the bulkhead slot.
+        """
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                await asyncio.sleep(10)  # cancelled by the disconnect
+
+        for _ in range(3):
+            await main.app(dict(SCOPE), disconnected, send)
+
+        assert_released(upstream)
+
+    @pytest.mark.asyncio
+    async def test_fast_path_send_fails_before_the_body(self, upstream):
+        """
+        Test that the raw ASGI path releases as well when sending the
+        response start fails.
+        """
+
+        async def send(message):
+            raise OSError("connection reset")
+
+        for _ in range(3):
+            with pytest.raises(OSError):
+                await main.fast_app(dict(SCOPE), disconnected, send)
+
+        assert_released(upstream)
@@ -0,0 +1,196 @@
+import asyncio
+import json
+from collections import Counter
+from contextlib import ExitStack
+
+import pytest
+from conftest import serve
+
+from gateway.balancer import LeastOutstandingBalancer, PowerOfTwoBalancer
+from gateway.config import ServiceConfig, Settings, load_services
+from gateway.upstream import Instance, NoHealthyInstanceError, UpstreamPool
+
+
+def stand_in(name: str, health: dict):
+    """Upstream instance that answers with its name; /health follows health[name]."""
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        status = 200
+        if scope["path"] == "/health" and not health[name]:
+            status = 503
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": name.encode()})
+
+    return app
+
+
+async def wait_for(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached in time")
+        await asyncio.sleep(0.02)
+
+
+async def call(upstream) -> str:
+    instance = upstream.acquire()
+    try:
+        response = await upstream.client.get(f"{instance.url}/auth/me")
+        return response.text
+    finally:
+        upstream.release(instance)
+
+
+@pytest.fixture
+def instances():
+    health = {"a": True, "b": True, "c": True}
+    with ExitStack() as stack:
+        urls = [stack.enter_context(serve(stand_in(name, health))) for name in health]
+        yield urls, health
+
+
+class TestBalancing:
+    @pytest.mark.asyncio
+    async def test_round_robin_spreads_evenly(self, instances):
+        """
+        Test that round-robin sends the same share to every instance.
+        """
+        urls, _ = instances
+        pool = UpstreamPool({"auth": ServiceConfig(instances=urls, health_interval=0)})
+        await pool.start()
+        try:
+            upstream = pool.upstream("auth")
+            hits = Counter([await call(upstream) for _ in range(30)])
+        finally:
+            await pool.close()
+
+        assert hits == {"a": 10, "b": 10, "c": 10}
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_instance_is_ejected_and_restored(self, instances):
+        """
+        Test that failing /health probes eject an instance until it recovers.
+        """
+        urls, health = instances
+        config = ServiceConfig(
+            instances=urls,
+            health_interval=0.05,
+            unhealthy_threshold=2,
+            healthy_threshold=2,
+        )
+        pool = UpstreamPool({"auth": config})
+        await pool.start()
+        try:
+            upstream = pool.upstream("auth")
+            b = upstream.instances[1]
+
+            health["b"] = False
+            await wait_for(lambda: not b.healthy)
+            hits = Counter([await call(upstream) for _ in range(20)])
+            assert "b" not in hits
+
+            health["b"] = True
+            await wait_for(lambda: b.healthy)
+            hits = Counter([await call(upstream) for _ in range(30)])
+            assert hits["b"] == 10
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_saturated_proxy_pool_does_not_eject(self, instances):
+        """
+        Test that probes still get through, and instances stay in, while
+        proxied requests hold every connection of the service's pool.
+        """
+        urls, _ = instances
+        config = ServiceConfig(
+            instances=urls,
+            max_connections=1,
+            pool_timeout=5,
+            health_interval=0.05,
+            health_timeout=0.2,
+            unhealthy_threshold=1,
+        )
+        pool = UpstreamPool({"auth": config})
+        await pool.start()
+        try:
+            upstream = pool.upstream("auth")
+            async with upstream.client.stream("GET", f"{urls[0]}/auth/me"):
+                await asyncio.sleep(0.5)  # several probe rounds
+                assert all(instance.healthy for instance in upstream.instances)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_all_instances_down(self, instances):
+        """
+        Test that acquire() fails once every instance is ejected.
+        """
+        urls, health = instances
+        pool = UpstreamPool(
+            {"auth": ServiceConfig(instances=urls, health_interval=0.05)}
+        )
+        await pool.start()
+        try:
+            upstream = pool.upstream("auth")
+            for name in health:
+                health[name] = False
+            await wait_for(lambda: not upstream.healthy_instances())
+            with pytest.raises(NoHealthyInstanceError):
+                upstream.acquire()
+        finally:
+            await pool.close()
+
+
+class TestStrategies:
+    def make_instances(self, *outstanding):
+        instances = [Instance(f"http://upstream-{i}") for i in range(len(outstanding))]
+        for instance, count in zip(instances, outstanding):
+            instance.outstanding = count
+        return instances
+
+    def test_least_outstanding(self):
+        """
+        Test that the least loaded instance is always picked.
+        """
+        instances = self.make_instances(5, 0, 3)
+        balancer = LeastOutstandingBalancer()
+        assert all(balancer.pick(instances) is instances[1] for _ in range(20))
+
+    def test_power_of_two_never_picks_the_busiest(self):
+        """
+        Test that power-of-two-choices never picks the most loaded instance.
+        """
+        instances = self.make_instances(0, 1, 9)
+        balancer = PowerOfTwoBalancer()
+        assert all(balancer.pick(instances) is not instances[2] for _ in range(50))
+
+
+class TestRegistry:
+    def test_services_from_env(self, monkeypatch):
+        """
+        Test that GATEWAY_SERVICES is parsed into the registry.
+        """
+        monkeypatch.setenv(
+            "GATEWAY_SERVICES",
+            json.dumps({"auth": {"instances": ["http://a:1", "http://b:1"]}}),
+        )
+        services = load_services(Settings())
+        assert services["auth"].instances == ["http://a:1", "http://b:1"]
+
+    def test_services_from_file(self, tmp_path):
+        """
+        Test that GATEWAY_SERVICES_FILE takes precedence and accepts "url".
+        """
+        path = tmp_path / "services.json"
+        path.write_text(
+            json.dumps(
+                {"users": {"url": "http://users:8002", "balancer": "power_of_two"}}
+            )
+        )
+        services = load_services(Settings(SERVICES_FILE=str(path)))
+        assert list(services) == ["users"]
+        assert services["users"].instances == ["http://users:8002"]
+        assert services["users"].balancer == "power_of_two"
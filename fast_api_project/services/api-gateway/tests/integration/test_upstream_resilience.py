@@ -0,0 +1,142 @@
+import asyncio
+from contextlib import ExitStack
+
+import pytest
+import pytest_asyncio
+from conftest import serve
+
+from gateway.config import ServiceConfig
+from gateway.upstream import UpstreamPool
+
+
+def stand_in(name: str, behaviour: dict):
+    """Upstream instance whose status and delay are set through behaviour[name]."""
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        status, delay = behaviour[name]
+        if delay:
+            await asyncio.sleep(delay)
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": name.encode()})
+
+    return app
+
+
+@pytest.fixture
+def behaviour():
+    return {"a": (200, 0), "b": (200, 0)}
+
+
+@pytest_asyncio.fixture
+async def upstream_factory(behaviour):
+    pools = []
+    with ExitStack() as stack:
+        urls = [stack.enter_context(serve(stand_in(n, behaviour))) for n in behaviour]
+
+        async def make(**config):
+            pool = UpstreamPool(
+                {"auth": ServiceConfig(instances=urls, health_interval=0, **config)}
+            )
+            await pool.start()
+            pools.append(pool)
+            return pool.upstream("auth")
+
+        yield make
+        for pool in pools:
+            await pool.close()
+
+
+async def call(upstream, method: str = "GET"):
+    response, instance = await upstream.send(method, "/auth/me", headers=[])
+    try:
+        await response.aread()
+        return response
+    finally:
+        upstream.release(instance)
+
+
+class TestRetries:
+    @pytest.mark.asyncio
+    async def test_idempotent_request_is_retried_on_another_instance(
+        self, behaviour, upstream_factory
+    ):
+        """
+        Test that a 503 from one instance is retried on the next one.
+        """
+        behaviour["a"] = (503, 0)
+        upstream = await upstream_factory(breaker_min_calls=100)
+
+        responses = [await call(upstream) for _ in range(4)]
+        assert all(r.status_code == 200 and r.text == "b" for r in responses)
+        assert upstream.stats["retries"] >= 2
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried(self, behaviour, upstream_factory):
+        """
+        Test that non-idempotent requests are never replayed.
+        """
+        behaviour["a"] = (503, 0)
+        upstream = await upstream_factory(breaker_min_calls=100)
+
+        statuses = [(await call(upstream, "POST")).status_code for _ in range(4)]
+        assert statuses.count(503) == 2
+        assert upstream.stats["retries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_caps_retries(self, behaviour, upstream_factory):
+        """
+        Test that retries stop once the budget is spent.
+        """
+        behaviour["a"] = (503, 0)
+        behaviour["b"] = (503, 0)
+        upstream = await upstream_factory(
+            breaker_min_calls=1000,
+            retry_budget_ratio=0.1,
+            retry_budget_min_per_second=0,
+        )
+
+        for _ in range(50):
+            await call(upstream)
+        assert upstream.stats["retries"] <= 5
+        assert upstream.stats["retries_budget_exhausted"] > 0
+
+
+class TestCircuitBreaker:
+    @pytest.mark.asyncio
+    async def test_failing_instance_is_skipped(self, behaviour, upstream_factory):
+        """
+        Test that an instance with an open breaker gets no traffic.
+        """
+        behaviour["a"] = (500, 0)
+        upstream = await upstream_factory(breaker_min_calls=4, breaker_window=4)
+
+        for _ in range(10):
+            await call(upstream)
+        a = upstream.instances[0]
+        assert a.breaker.state == "open"
+
+        texts = [(await call(upstream)).text for _ in range(10)]
+        assert texts == ["b"] * 10
+
+
+class TestHedging:
+    @pytest.mark.asyncio
+    async def test_slow_instance_is_hedged(self, behaviour, upstream_factory):
+        """
+        Test that a GET stuck on a slow instance is answered by a hedge.
+        """
+        upstream = await upstream_factory(hedge_gets=True, hedge_min_samples=10)
+        for _ in range(20):  # learn the p95 latency
+            await call(upstream)
+
+        behaviour["a"] = (200, 1.0)
+        start = asyncio.get_running_loop().time()
+        texts = [(await call(upstream)).text for _ in range(6)]
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert texts == ["b"] * 6
+        assert upstream.stats["hedge_wins"] >= 1
+        assert elapsed < 1.0
+        assert all(instance.outstanding == 0 for instance in upstream.instances)
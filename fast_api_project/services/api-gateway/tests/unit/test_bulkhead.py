@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from gateway.bulkhead import AIMDLimit, Bulkhead, BulkheadFullError
+
+
+class TestBulkhead:
+    @pytest.mark.asyncio
+    async def test_limits_requests_in_flight(self):
+        """
+        Test that requests over the limit wait and are admitted in order.
+        """
+        bulkhead = Bulkhead("auth", limit=2, max_queue=10, queue_timeout=1)
+        order = []
+
+        async def request(n):
+            await bulkhead.acquire()
+            order.append(n)
+            assert bulkhead.in_flight <= 2
+            await asyncio.sleep(0.01)
+            bulkhead.release()
+
+        await asyncio.gather(*(request(n) for n in range(6)))
+
+        assert order == list(range(6))
+        assert bulkhead.in_flight == 0
+        assert bulkhead.stats()["waited"] == 4
+
+    @pytest.mark.asyncio
+    async def test_full_queue_is_shed_immediately(self):
+        """
+        Test that requests beyond max_queue fail at once with Retry-After.
+        """
+        bulkhead = Bulkhead("auth", limit=1, max_queue=1, retry_after=3)
+        await bulkhead.acquire()
+        waiting = asyncio.ensure_future(bulkhead.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadFullError) as e:
+            await bulkhead.acquire()
+        assert e.value.retry_after == 3
+        assert bulkhead.shed_queue_full == 1
+
+        bulkhead.release()
+        await waiting
+        assert bulkhead.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_sheds(self):
+        """
+        Test that a request waiting longer than queue_timeout is shed.
+        """
+        bulkhead = Bulkhead("auth", limit=1, queue_timeout=0.01)
+        await bulkhead.acquire()
+
+        with pytest.raises(BulkheadFullError):
+            await bulkhead.acquire()
+        assert bulkhead.shed_timeout == 1
+        assert bulkhead.queued == 0
+
+        bulkhead.release()
+        await bulkhead.acquire()  # the timed out waiter did not keep a slot
+        assert bulkhead.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        """
+        Test that a cancelled waiter neither blocks the queue nor leaks a slot.
+        """
+        bulkhead = Bulkhead("auth", limit=1, queue_timeout=1)
+        await bulkhead.acquire()
+        cancelled = asyncio.ensure_future(bulkhead.acquire())
+        waiting = asyncio.ensure_future(bulkhead.acquire())
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        bulkhead.release()
+        await waiting
+
+        assert bulkhead.in_flight == 1
+        assert bulkhead.queued == 0
+
+
+class TestAIMDLimit:
+    def test_slow_calls_and_errors_cut_the_limit(self):
+        """
+        Test that latency over the tolerance and errors decrease the limit.
+        """
+        limit = AIMDLimit(initial=100, min_limit=10, tolerance=2, backoff=0.5)
+        limit.record(True, 0.01, in_flight=100)
+
+        limit.record(True, 0.05, in_flight=100)
+        assert limit.limit == 50
+        limit.record(False, 0.01, in_flight=50)
+        assert limit.limit == 25
+        for _ in range(10):
+            limit.record(False, 0.01, in_flight=25)
+        assert limit.limit == 10
+
+    def test_limit_grows_only_while_used(self):
+        """
+        Test that fast calls raise the limit only when it is being used.
+        """
+        limit = AIMDLimit(initial=10, max_limit=20)
+        for _ in range(100):
+            limit.record(True, 0.01, in_flight=1)
+        assert limit.limit == 10
+
+        for _ in range(500):
+            limit.record(True, 0.01, in_flight=limit.limit)
+        assert limit.limit == 20
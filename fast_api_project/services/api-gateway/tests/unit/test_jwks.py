@@ -0,0 +1,182 @@
+import asyncio
+import base64
+import json
+
+import pytest
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+from jose import jwt
+
+from gateway.jwks import JWKSVerifier, UnknownKeyError
+from gateway.jwt_verifier import ExpiredTokenError, HMACJWTVerifier, InvalidTokenError
+
+CLAIMS = {"sub": "1", "email": "alice@example.com", "exp": 2_000, "iat": 1_000}
+
+
+def b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class SigningKey:
+    """A key as the auth service holds it: signs tokens, publishes a JWK."""
+
+    def __init__(self, kid: str, algorithm: str = "EdDSA"):
+        self.kid = kid
+        self.algorithm = algorithm
+        if algorithm == "EdDSA":
+            self.key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            self.key = ec.generate_private_key(ec.SECP256R1())
+
+    def jwk(self) -> dict:
+        public = self.key.public_key()
+        if self.algorithm == "EdDSA":
+            raw = public.public_bytes(
+                serialization.Encoding.Raw, serialization.PublicFormat.Raw
+            )
+            fields = {"kty": "OKP", "crv": "Ed25519", "x": b64(raw)}
+        else:
+            numbers = public.public_numbers()
+            fields = {
+                "kty": "EC",
+                "crv": "P-256",
+                "x": b64(numbers.x.to_bytes(32, "big")),
+                "y": b64(numbers.y.to_bytes(32, "big")),
+            }
+        return {**fields, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+    def sign(self, claims: dict) -> str:
+        header = {"alg": self.algorithm, "kid": self.kid, "typ": "JWT"}
+        signing_input = (
+            f"{b64(json.dumps(header).encode())}.{b64(json.dumps(claims).encode())}"
+        )
+        if self.algorithm == "EdDSA":
+            signature = self.key.sign(signing_input.encode())
+        else:
+            der = self.key.sign(signing_input.encode(), ec.ECDSA(hashes.SHA256()))
+            r, s = decode_dss_signature(der)
+            signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        return f"{signing_input}.{b64(signature)}"
+
+
+class KeySet:
+    """A fake JWKS endpoint that counts fetches."""
+
+    def __init__(self, *keys: SigningKey):
+        self.keys = list(keys)
+        self.fetches = 0
+
+    async def fetch(self) -> dict:
+        self.fetches += 1
+        return {"keys": [key.jwk() for key in self.keys]}
+
+
+def verifier(key_set: KeySet, now: float = 1_500.0, **kwargs) -> JWKSVerifier:
+    return JWKSVerifier(
+        "http://auth/.well-known/jwks.json",
+        clock=lambda: now,
+        fetch=key_set.fetch,
+        **kwargs,
+    )
+
+
+class TestJWKSVerifier:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("algorithm", ["EdDSA", "ES256"])
+    async def test_verifies_with_fetched_keys(self, algorithm):
+        """
+        Test that tokens verify against the published key picked by kid,
+        and that expired or tampered ones do not.
+        """
+        key = SigningKey("k1", algorithm)
+        tokens = verifier(KeySet(key))
+        await tokens.refresh()
+        token = key.sign(CLAIMS)
+        header, _, signature = token.split(".")
+        forged = key.sign({**CLAIMS, "sub": "2"}).split(".")[1]
+
+        assert tokens.verify(token) == CLAIMS
+        assert tokens.verify(token) == CLAIMS  # header segment now cached
+        with pytest.raises(InvalidTokenError):
+            tokens.verify(f"{header}.{forged}.{signature}")
+        with pytest.raises(ExpiredTokenError):
+            tokens.clock = lambda: 2_000
+            tokens.verify(token)
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refreshes_in_background(self):
+        """
+        Test that a token from a rotated-in key is refused without waiting,
+        starts one background fetch, and verifies once it completes.
+        """
+        old, new = SigningKey("old"), SigningKey("new")
+        key_set = KeySet(old)
+        tokens = verifier(key_set, min_refresh_interval=0)
+        await tokens.refresh()
+        key_set.keys = [new, old]
+        token = new.sign(CLAIMS)
+
+        with pytest.raises(UnknownKeyError):
+            tokens.verify(token)
+        with pytest.raises(UnknownKeyError):
+            tokens.verify(token)  # the fetch is already running
+        assert key_set.fetches == 1
+        await asyncio.sleep(0)
+
+        assert key_set.fetches == 2
+        assert tokens.verify(token) == CLAIMS
+        assert tokens.verify(old.sign(CLAIMS)) == CLAIMS
+        assert tokens.stats()["unknown_kids"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_kids_cannot_force_constant_fetches(self):
+        """
+        Test that refetches on unknown kids are spaced min_refresh_interval
+        apart, so garbage tokens cannot hammer the auth service.
+        """
+        key_set = KeySet(SigningKey("k1"))
+        tokens = verifier(key_set, min_refresh_interval=60)
+        await tokens.refresh()
+
+        for n in range(20):
+            with pytest.raises(UnknownKeyError):
+                tokens.verify(SigningKey(f"stranger-{n}").sign(CLAIMS))
+            await asyncio.sleep(0)
+        assert key_set.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_keeps_keys(self):
+        """
+        Test that an unreachable or broken key set leaves the known keys in
+        use.
+        """
+        key = SigningKey("k1")
+        key_set = KeySet(key)
+        tokens = verifier(key_set)
+        await tokens.refresh()
+
+        async def broken():
+            return {"no": "keys"}
+
+        tokens._fetch = broken
+        assert await tokens.refresh() is False
+        assert tokens.verify(key.sign(CLAIMS)) == CLAIMS
+        assert tokens.stats()["refresh_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tokens_without_kid_use_the_fallback(self):
+        """
+        Test that HMAC tokens go to the shared secret verifier, and are
+        refused when there is none.
+        """
+        token = jwt.encode(CLAIMS, "change-me", algorithm="HS256")
+        fallback = HMACJWTVerifier("change-me", clock=lambda: 1_500.0)
+        with_secret = verifier(KeySet(), fallback=fallback)
+        without = verifier(KeySet())
+
+        assert with_secret.verify(token) == CLAIMS
+        with pytest.raises(InvalidTokenError):
+            without.verify(token)
+        with pytest.raises(InvalidTokenError):
+            with_secret.verify(jwt.encode(CLAIMS, "other", algorithm="HS256"))
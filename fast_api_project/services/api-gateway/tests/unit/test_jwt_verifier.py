@@ -0,0 +1,70 @@
+import base64
+import json
+
+import pytest
+from jose import jwt
+
+from gateway.jwt_verifier import ExpiredTokenError, HMACJWTVerifier, InvalidTokenError
+
+SECRET = "change-me"
+CLAIMS = {"sub": "1", "email": "alice@example.com", "exp": 2_000, "iat": 1_000}
+
+
+def verifier(now: float = 1_500.0, **kwargs) -> HMACJWTVerifier:
+    return HMACJWTVerifier(SECRET, clock=lambda: now, **kwargs)
+
+
+def segment(data: dict) -> str:
+    raw = json.dumps(data).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+class TestHMACJWTVerifier:
+    def test_accepts_python_jose_tokens(self):
+        """
+        Test that tokens signed by python-jose verify to the same claims.
+        """
+        for algorithm in ("HS256", "HS384", "HS512"):
+            token = jwt.encode(CLAIMS, SECRET, algorithm=algorithm)
+            assert verifier(algorithm=algorithm).verify(token) == CLAIMS
+
+    def test_rejects_bad_signatures_and_garbage(self):
+        """
+        Test that tampered, foreign and malformed tokens are invalid.
+        """
+        token = jwt.encode(CLAIMS, SECRET, algorithm="HS256")
+        header, payload, signature = token.split(".")
+        forged = segment({**CLAIMS, "sub": "2"})
+        bad_tokens = [
+            f"{header}.{forged}.{signature}",
+            jwt.encode(CLAIMS, "other-secret", algorithm="HS256"),
+            jwt.encode(CLAIMS, SECRET, algorithm="HS512"),
+            f"{segment({'alg': 'none', 'typ': 'JWT'})}.{payload}.",
+            "not-a-token",
+            "a.b.c.d",
+            "é.é.é",
+        ]
+        for bad in bad_tokens:
+            with pytest.raises(InvalidTokenError):
+                verifier().verify(bad)
+
+    def test_expiry_and_not_before(self):
+        """
+        Test that exp and nbf are enforced, within the leeway.
+        """
+        token = jwt.encode(CLAIMS, SECRET, algorithm="HS256")
+        with pytest.raises(ExpiredTokenError):
+            verifier(now=2_000).verify(token)
+        assert verifier(now=2_005, leeway=10).verify(token)
+
+        early = jwt.encode({**CLAIMS, "nbf": 1_800}, SECRET, algorithm="HS256")
+        with pytest.raises(InvalidTokenError):
+            verifier().verify(early)
+
+    def test_header_with_other_key_order(self):
+        """
+        Test that a header serialized differently but for the same
+        algorithm is accepted.
+        """
+        token = jwt.encode(CLAIMS, SECRET, algorithm="HS256", headers={"kid": "k1"})
+        assert verifier().verify(token) == CLAIMS
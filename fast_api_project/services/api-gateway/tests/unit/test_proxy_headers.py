@@ -0,0 +1,24 @@
+from gateway.proxy import forward_for
+
+
+class TestForwardFor:
+    def test_appends_the_client_address(self):
+        """
+        Test that the peer address is appended to any X-Forwarded-For chain,
+        in a single header.
+        """
+        assert forward_for([("accept", "*/*")], "203.0.113.1") == [
+            ("accept", "*/*"),
+            ("X-Forwarded-For", "203.0.113.1"),
+        ]
+        assert forward_for(
+            [("x-forwarded-for", "198.51.100.9"), ("X-Forwarded-For", "10.0.0.2")],
+            "203.0.113.1",
+        ) == [("X-Forwarded-For", "198.51.100.9, 10.0.0.2, 203.0.113.1")]
+
+    def test_without_a_client(self):
+        """
+        Test that headers are left alone when the peer is unknown.
+        """
+        headers = [("x-forwarded-for", "198.51.100.9")]
+        assert forward_for(headers, None) == headers
@@ -0,0 +1,117 @@
+from gateway.resilience import CircuitBreaker, LatencyTracker, RetryBudget
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    def make(self, clock):
+        return CircuitBreaker(
+            window=10, min_calls=4, failure_rate=0.5, open_seconds=5, clock=clock
+        )
+
+    def test_opens_on_error_rate(self):
+        """
+        Test that the breaker opens once the failure rate crosses the threshold.
+        """
+        breaker = self.make(FakeClock())
+        for ok in (True, False, True):
+            breaker.record(ok, 0.01)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record(False, 0.01)  # 2 of 4 failed
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allows(0)
+
+    def test_opens_on_slow_calls(self):
+        """
+        Test that slow calls count towards opening the breaker.
+        """
+        breaker = CircuitBreaker(
+            min_calls=2, slow_call_seconds=1.0, slow_call_rate=1.0, clock=FakeClock()
+        )
+        breaker.record(True, 2.0)
+        breaker.record(True, 3.0)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_trial_calls_close_it(self):
+        """
+        Test the open -> half-open -> closed recovery path.
+        """
+        clock = FakeClock()
+        breaker = self.make(clock)
+        breaker.half_open_calls = 2
+        for _ in range(4):
+            breaker.record(False, 0.01)
+
+        clock.now = 5
+        assert breaker.allows(0)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allows(2)  # trial slots are taken
+
+        breaker.record(True, 0.01)
+        breaker.record(True, 0.01)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        """
+        Test that a failed trial call opens the breaker again.
+        """
+        clock = FakeClock()
+        breaker = self.make(clock)
+        for _ in range(4):
+            breaker.record(False, 0.01)
+        clock.now = 5
+        breaker.allows(0)
+
+        breaker.record(False, 0.01)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+
+class TestRetryBudget:
+    def test_retries_are_a_fraction_of_requests(self):
+        """
+        Test that only `ratio` retries are allowed per request once drained.
+        """
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.25, min_per_second=0, clock=clock)
+        for _ in range(100):
+            budget.deposit()
+
+        allowed = sum(budget.try_withdraw() for _ in range(100))
+        assert allowed == 25
+
+    def test_min_per_second_refills(self):
+        """
+        Test that the budget refills over time without traffic.
+        """
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0, min_per_second=2, clock=clock)
+        while budget.try_withdraw():
+            pass
+
+        clock.now += 1
+        assert budget.try_withdraw()
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+
+
+class TestLatencyTracker:
+    def test_percentile_after_min_samples(self):
+        """
+        Test that the percentile is only reported once enough samples exist.
+        """
+        tracker = LatencyTracker(percentile=95, min_samples=10, refresh_every=1)
+        for i in range(9):
+            tracker.add(i / 100)
+        assert tracker.value() is None
+
+        for i in range(9, 100):
+            tracker.add(i / 100)
+        assert tracker.value() == 0.95
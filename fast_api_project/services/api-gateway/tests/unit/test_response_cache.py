@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from gateway.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeUpstream:
+    """Records forwarded requests and answers with a configurable response."""
+
+    def __init__(self, headers, body=b"payload", status=200):
+        self.headers = headers
+        self.body = body
+        self.status = status
+        self.calls = []
+
+    async def forward(self, extra_headers):
+        self.calls.append(dict(extra_headers))
+        if self.headers is not None and "if-none-match" in self.calls[-1]:
+            etag = dict(self.headers).get("etag")
+            if etag == self.calls[-1]["if-none-match"]:
+                return 304, [("cache-control", "max-age=60"), ("etag", etag)], b""
+        return self.status, list(self.headers), self.body
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_fresh_response_is_served_from_cache(self, clock):
+        """
+        Test that a max-age response is reused until it goes stale.
+        """
+        cache = ResponseCache(clock=clock)
+        upstream = FakeUpstream([("cache-control", "max-age=60")])
+
+        *_, first = await cache.fetch("auth /me", [], upstream.forward)
+        status, headers, body, second = await cache.fetch(
+            "auth /me", [], upstream.forward
+        )
+
+        assert (first, second) == ("MISS", "HIT")
+        assert body == b"payload" and status == 200
+        assert len(upstream.calls) == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+        assert cache.stats()["bytes_saved"] == len(b"payload")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("directive", ["no-store", "private, max-age=60"])
+    async def test_uncacheable_responses_are_not_stored(self, clock, directive):
+        """
+        Test that no-store and private responses always go upstream.
+        """
+        cache = ResponseCache(clock=clock)
+        upstream = FakeUpstream([("cache-control", directive)])
+
+        for _ in range(2):
+            await cache.fetch("auth /me", [], upstream.forward)
+        assert len(upstream.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated_with_etag(self, clock):
+        """
+        Test that a stale entry is revalidated with If-None-Match.
+        """
+        cache = ResponseCache(clock=clock)
+        upstream = FakeUpstream([("cache-control", "max-age=10"), ("etag", '"v1"')])
+        await cache.fetch("auth /me", [], upstream.forward)
+
+        clock.now += 11
+        _, _, body, cache_status = await cache.fetch("auth /me", [], upstream.forward)
+
+        assert cache_status == "REVALIDATED"
+        assert body == b"payload"
+        assert upstream.calls[-1] == {"if-none-match": '"v1"'}
+        assert cache.stats()["not_modified"] == 1
+
+        _, _, _, cache_status = await cache.fetch("auth /me", [], upstream.forward)
+        assert cache_status == "HIT"  # the 304 renewed freshness
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, clock):
+        """
+        Test that a stale entry is served while it is refreshed in the background.
+        """
+        cache = ResponseCache(clock=clock)
+        upstream = FakeUpstream(
+            [
+                ("cache-control", "max-age=10, stale-while-revalidate=30"),
+                ("etag", '"v1"'),
+            ]
+        )
+        await cache.fetch("auth /me", [], upstream.forward)
+
+        clock.now += 15
+        *_, cache_status = await cache.fetch("auth /me", [], upstream.forward)
+        assert cache_status == "STALE"
+
+        await asyncio.sleep(0)  # let the background revalidation run
+        assert upstream.calls[-1] == {"if-none-match": '"v1"'}
+        *_, cache_status = await cache.fetch("auth /me", [], upstream.forward)
+        assert cache_status == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_vary_keeps_variants_apart(self, clock):
+        """
+        Test that Vary'd request headers select separate entries.
+        """
+        cache = ResponseCache(clock=clock)
+        upstream = FakeUpstream(
+            [("cache-control", "max-age=60"), ("vary", "Accept-Language")]
+        )
+        en = [("accept-language", "en")]
+        fr = [("accept-language", "fr")]
+
+        await cache.fetch("auth /me", en, upstream.forward)
+        *_, fr_status = await cache.fetch("auth /me", fr, upstream.forward)
+        *_, en_status = await cache.fetch("auth /me", en, upstream.forward)
+
+        assert (fr_status, en_status) == ("MISS", "HIT")
+
+    @pytest.mark.asyncio
+    async def test_authorized_responses_are_never_shared(self, clock):
+        """
+        Test that a response for one user's credentials is not served to another.
+        """
+        cache = ResponseCache(clock=clock)
+        upstream = FakeUpstream([("cache-control", "public, max-age=60")])
+        alice = [("authorization", "Bearer alice")]
+        bob = [("authorization", "Bearer bob")]
+
+        await cache.fetch("auth /me", alice, upstream.forward)
+        *_, bob_status = await cache.fetch("auth /me", bob, upstream.forward)
+        *_, alice_status = await cache.fetch("auth /me", alice, upstream.forward)
+
+        assert (bob_status, alice_status) == ("MISS", "HIT")
+
+    @pytest.mark.asyncio
+    async def test_authorized_responses_need_explicit_consent(self, clock):
+        """
+        Test that plain max-age is not enough to store an authorized response.
+        """
+        cache = ResponseCache(clock=clock)
+        upstream = FakeUpstream([("cache-control", "max-age=60")])
+        alice = [("authorization", "Bearer alice")]
+
+        for _ in range(2):
+            await cache.fetch("auth /me", alice, upstream.forward)
+        assert len(upstream.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_byte_limit_evicts_least_recently_used(self, clock):
+        """
+        Test that the cache stays under max_bytes by evicting LRU entries.
+        """
+        cache = ResponseCache(max_bytes=200, clock=clock)  # ~53 bytes per entry
+        upstream = FakeUpstream([("cache-control", "max-age=60")], body=b"x" * 30)
+
+        for path in ("/a", "/b", "/c"):
+            await cache.fetch(path, [], upstream.forward)
+        await cache.fetch("/a", [], upstream.forward)  # "/b" is now LRU
+        await cache.fetch("/d", [], upstream.forward)
+
+        assert cache.size <= 200
+        assert cache.evictions == 1
+        *_, b_status = await cache.fetch("/b", [], upstream.forward)
+        assert b_status == "MISS"
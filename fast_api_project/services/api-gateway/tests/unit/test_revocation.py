@@ -0,0 +1,96 @@
+import pytest
+
+from gateway.revocation import RevocationList
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Feed:
+    """A fake auth service revocation feed."""
+
+    def __init__(self):
+        self.entries = []
+        self.reads = []
+
+    def revoke(self, jti: str, exp: float = 2_000) -> None:
+        self.entries.append({"seq": len(self.entries) + 1, "jti": jti, "exp": exp})
+
+    async def fetch(self, after: int, limit: int) -> dict:
+        self.reads.append(after)
+        page = [e for e in self.entries if e["seq"] > after][:limit]
+        return {"revocations": page, "next": page[-1]["seq"] if page else after}
+
+
+def revocation_list(feed: Feed, clock=None, **kwargs) -> RevocationList:
+    return RevocationList(
+        "http://auth/auth/revocations",
+        clock=clock or FakeClock(),
+        fetch=feed.fetch,
+        **kwargs,
+    )
+
+
+class TestRevocationList:
+    @pytest.mark.asyncio
+    async def test_follows_the_feed_incrementally(self):
+        """
+        Test that polls read only entries after the cursor, across pages,
+        and that revoked jtis are reported.
+        """
+        feed = Feed()
+        for n in range(5):
+            feed.revoke(f"jti-{n}")
+        revoked = revocation_list(feed, page_size=2)
+
+        assert await revoked.poll()
+        feed.revoke("jti-5")
+        assert await revoked.poll()
+
+        assert feed.reads == [0, 2, 4, 5]
+        assert all(revoked.is_revoked(f"jti-{n}") for n in range(6))
+        assert not revoked.is_revoked("someone-else")
+        assert not revoked.is_revoked(None)
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_dropped(self):
+        """
+        Test that revocations of expired tokens are forgotten.
+        """
+        clock = FakeClock()
+        feed = Feed()
+        for n in range(40):
+            feed.revoke(f"old-{n}", exp=1_500)
+        feed.revoke("recent", exp=5_000)
+        revoked = revocation_list(feed, clock=clock)
+        await revoked.poll()
+
+        clock.now = 1_600
+        revoked.expire()
+
+        assert not revoked.is_revoked("old-0")
+        assert revoked.is_revoked("recent")
+        assert revoked.stats()["revoked"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_poll_keeps_the_list(self):
+        """
+        Test that an unreachable feed keeps the known revocations.
+        """
+        feed = Feed()
+        feed.revoke("jti-1")
+        revoked = revocation_list(feed)
+        await revoked.resync()
+
+        async def broken(after, limit):
+            raise ValueError("bad JSON")
+
+        revoked._fetch = broken
+        assert await revoked.resync() is False
+        assert revoked.is_revoked("jti-1")
+        assert revoked.stats()["poll_failures"] >= 1
@@ -0,0 +1,126 @@
+import pytest
+
+from gateway.config import RouteConfig, ServiceConfig, Settings, load_routes
+from gateway.routing import MethodNotAllowedError, RouteTable
+
+
+def table(*routes):
+    return RouteTable(RouteConfig(**route) for route in routes)
+
+
+class TestRouteTable:
+    def test_longest_prefix_wins(self):
+        """
+        Test that the deepest matching prefix picks the service.
+        """
+        routes = table(
+            {"prefix": "/api", "service": "legacy"},
+            {"prefix": "/api/users", "service": "users"},
+        )
+
+        route, path = routes.match("GET", "/api/users/42")
+        assert route.service == "users"
+        assert path == "/api/users/42"
+
+        route, path = routes.match("GET", "/api/orders/7")
+        assert route.service == "legacy"
+        assert path == "/api/orders/7"
+
+    def test_prefix_matches_whole_segments_only(self):
+        """
+        Test that "/auth" does not match "/authz".
+        """
+        routes = table({"prefix": "/auth", "service": "auth"})
+
+        assert routes.match("GET", "/authz/login") is None
+        assert routes.match("GET", "/other") is None
+        assert routes.match("GET", "/auth")[1] == "/auth"
+        assert routes.match("GET", "/auth/")[1] == "/auth/"
+
+    def test_rewrite_template(self):
+        """
+        Test that {prefix} and {path} are substituted into the upstream path.
+        """
+        routes = table(
+            {"prefix": "/v1/users", "service": "auth", "rewrite": "/auth{path}"},
+            {"prefix": "/legacy", "service": "auth", "rewrite": "/api{prefix}{path}"},
+        )
+
+        assert routes.match("GET", "/v1/users/me")[1] == "/auth/me"
+        assert routes.match("GET", "/v1/users")[1] == "/auth"
+        assert routes.match("GET", "/legacy/x")[1] == "/api/legacy/x"
+
+    def test_root_route_catches_everything(self):
+        """
+        Test that a "/" route is the fallback for unmatched paths.
+        """
+        routes = table(
+            {"prefix": "/", "service": "web"},
+            {"prefix": "/auth", "service": "auth"},
+        )
+
+        assert routes.match("GET", "/about")[0].service == "web"
+        assert routes.match("GET", "/about")[1] == "/about"
+        assert routes.match("GET", "/auth/login")[0].service == "auth"
+
+    def test_method_filter(self):
+        """
+        Test that a route only serves its methods and others get 405.
+        """
+        routes = table(
+            {"prefix": "/users", "service": "reader", "methods": ["get"]},
+            {"prefix": "/users", "service": "writer", "methods": ["POST", "PUT"]},
+        )
+
+        assert routes.match("GET", "/users/1")[0].service == "reader"
+        assert routes.match("POST", "/users")[0].service == "writer"
+        with pytest.raises(MethodNotAllowedError) as e:
+            routes.match("DELETE", "/users/1")
+        assert e.value.allowed == ["GET", "POST", "PUT"]
+
+    def test_filtered_deeper_route_is_not_bypassed(self):
+        """
+        Test that a method rejected by a deeper route does not fall back to a
+        shorter prefix.
+        """
+        routes = table(
+            {"prefix": "/api", "service": "api"},
+            {"prefix": "/api/admin", "service": "admin", "methods": ["GET"]},
+        )
+
+        with pytest.raises(MethodNotAllowedError):
+            routes.match("POST", "/api/admin/users")
+        assert routes.match("POST", "/api/items")[0].service == "api"
+
+    def test_route_timeout(self):
+        """
+        Test that the per-route timeout is carried on the matched route.
+        """
+        routes = table({"prefix": "/slow", "service": "auth", "timeout": 60})
+
+        assert routes.match("GET", "/slow/report")[0].timeout == 60
+
+
+class TestLoadRoutes:
+    def test_default_route_per_service(self):
+        """
+        Test that each service gets a "/<name>" route when none are configured.
+        """
+        services = {
+            "auth": ServiceConfig(url="http://auth:8001"),
+            "users": ServiceConfig(url="http://users:8002"),
+        }
+        routes = RouteTable(load_routes(Settings(), services))
+
+        route, path = routes.match("POST", "/auth/register")
+        assert (route.service, path) == ("auth", "/auth/register")
+        assert routes.match("GET", "/users/profile")[1] == "/users/profile"
+
+    def test_unknown_service_is_rejected(self):
+        """
+        Test that a route to an unregistered service fails at startup.
+        """
+        settings = Settings(ROUTES=[{"prefix": "/x", "service": "missing"}])
+
+        with pytest.raises(ValueError):
+            load_routes(settings, {"auth": ServiceConfig(url="http://auth:8001")})
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from gateway.proxy import forward_for
+from gateway.singleflight import SingleFlight, request_key
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """
+        Test that callers arriving while a call is in flight share its result.
+        """
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+
+        assert results == ["result"] * 10
+        assert calls == 1
+        assert flight.stats()["coalesced"] == 9
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_bounded(self):
+        """
+        Test that callers beyond max_waiters make their own call.
+        """
+        flight = SingleFlight(max_waiters=2)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        assert calls == 3  # leader + 2 overflowing callers
+        assert flight.overflow == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self):
+        """
+        Test that every waiter sees the exception of the shared call.
+        """
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_leader_cancellation_does_not_fail_waiters(self):
+        """
+        Test that the shared call keeps running if the first caller goes away.
+        """
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        leader = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "result"
+
+    def test_key_ignores_unrelated_headers(self):
+        """
+        Test that only response-relevant headers are part of the key.
+        """
+        a = request_key("GET", "/me", [("user-agent", "a"), ("accept", "*/*")])
+        b = request_key("GET", "/me", [("user-agent", "b"), ("accept", "*/*")])
+        c = request_key("GET", "/me", [("authorization", "Bearer x")])
+        assert a == b
+        assert a != c
+
+    def test_key_separates_forwarded_clients(self):
+        """
+        Test that requests forwarded for different clients are not merged,
+        so an upstream limiting per client charges each its own request.
+        """
+        sent = [("accept", "*/*")]
+        first = request_key("GET", "/me", forward_for(sent, "203.0.113.1"))
+        again = request_key("GET", "/me", forward_for(sent, "203.0.113.1"))
+        other = request_key("GET", "/me", forward_for(sent, "203.0.113.2"))
+        assert first == again
+        assert first != other
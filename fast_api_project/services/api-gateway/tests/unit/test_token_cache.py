@@ -0,0 +1,174 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+import main
+from gateway.config import Settings
+from gateway.jwks import UnknownKeyError
+from gateway.jwt_verifier import InvalidTokenError
+from gateway.revocation import RevocationList
+from gateway.token_cache import MISSING, TokenCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenCache:
+    def test_hit_and_miss_counters(self):
+        """
+        Test that lookups are counted as hits or misses.
+        """
+        cache = TokenCache(clock=FakeClock())
+        assert cache.get("token") is MISSING
+
+        cache.put("token", {"sub": "1", "exp": 2_000})
+        assert cache.get("token") == {"sub": "1", "exp": 2_000}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entry_expires_at_exp(self):
+        """
+        Test that cached claims are dropped once the token expires.
+        """
+        clock = FakeClock()
+        cache = TokenCache(clock=clock)
+        cache.put("token", {"sub": "1", "exp": 1_010})
+
+        clock.now = 1_009.9
+        assert cache.get("token") is not MISSING
+        clock.now = 1_010
+        assert cache.get("token") is MISSING
+        assert cache.expirations == 1
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entry is evicted when full.
+        """
+        cache = TokenCache(max_size=2, clock=FakeClock())
+        cache.put("a", {"exp": 2_000})
+        cache.put("b", {"exp": 2_000})
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", {"exp": 2_000})
+
+        assert cache.get("b") is MISSING
+        assert cache.get("a") is not MISSING
+        assert cache.evictions == 1
+
+    def test_negative_entry_is_short_lived(self):
+        """
+        Test that invalid tokens are cached only for the negative TTL.
+        """
+        clock = FakeClock()
+        cache = TokenCache(negative_ttl=5, clock=clock)
+        cache.put_invalid("garbage")
+
+        assert cache.get("garbage") is None
+        clock.now += 5
+        assert cache.get("garbage") is MISSING
+
+
+class TestVerifyJwt:
+    def test_repeated_token_is_decoded_once(self, monkeypatch):
+        """
+        Test that verify_jwt serves repeated tokens from the cache.
+        """
+        monkeypatch.setattr(main, "token_cache", TokenCache())
+        token = jwt.encode(
+            {"sub": "1", "exp": int(time.time()) + 60},
+            main.settings.JWT_SECRET,
+            algorithm=main.settings.JWT_ALGORITHM,
+        )
+
+        for _ in range(3):
+            assert main.verify_jwt(token)["sub"] == "1"
+        assert main.token_cache.stats()["misses"] == 1
+        assert main.token_cache.stats()["hits"] == 2
+
+    def test_garbage_token_is_rejected_from_cache(self, monkeypatch):
+        """
+        Test that invalid tokens keep raising 401 without being re-decoded.
+        """
+        monkeypatch.setattr(main, "token_cache", TokenCache())
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc:
+                main.verify_jwt("not-a-jwt")
+            assert exc.value.status_code == 401
+        assert main.token_cache.stats()["hits"] == 1
+
+    def test_unknown_key_is_not_cached(self, monkeypatch):
+        """
+        Test that a token refused for an unknown kid is verified again next
+        time, since the key may have been fetched meanwhile.
+        """
+
+        class Rotating:
+            def verify(self, token):
+                raise UnknownKeyError("Unknown signing key")
+
+        monkeypatch.setattr(main, "token_cache", TokenCache())
+        monkeypatch.setattr(main, "jwt_verifier", Rotating())
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                main.verify_jwt("a.b.c")
+        assert main.token_cache.stats()["hits"] == 0
+
+    def test_revoked_token_is_rejected_even_when_cached(self, monkeypatch):
+        """
+        Test that a cached token is refused once its jti is revoked.
+        """
+        revocations = RevocationList("http://auth/auth/revocations")
+        monkeypatch.setattr(main, "token_cache", TokenCache())
+        monkeypatch.setattr(main, "revocations", revocations)
+        token = jwt.encode(
+            {"sub": "1", "jti": "j1", "exp": int(time.time()) + 60},
+            main.settings.JWT_SECRET,
+            algorithm=main.settings.JWT_ALGORITHM,
+        )
+
+        assert main.verify_jwt(token)["sub"] == "1"
+        revocations.add("j1", time.time() + 60)
+        with pytest.raises(HTTPException):
+            main.verify_jwt(token)
+
+
+class TestMakeJwtVerifier:
+    JWKS = "http://auth/.well-known/jwks.json"
+
+    def test_key_set_refuses_hmac_tokens_by_default(self):
+        """
+        Test that with JWKS_URL set a token signed with the secret and no
+        kid is refused unless the HMAC fallback is opted into.
+        """
+        token = jwt.encode({"sub": "1", "exp": int(time.time()) + 60}, "s3cret")
+
+        strict = main.make_jwt_verifier(
+            Settings(JWKS_URL=self.JWKS, JWT_SECRET="s3cret")
+        )
+        migrating = main.make_jwt_verifier(
+            Settings(JWKS_URL=self.JWKS, JWT_SECRET="s3cret", JWT_HMAC_FALLBACK=True)
+        )
+
+        assert strict.fallback is None
+        with pytest.raises(InvalidTokenError):
+            strict.verify(token)
+        assert migrating.verify(token)["sub"] == "1"
+
+    def test_needs_a_secret_or_key_set(self):
+        """
+        Test that there is no default secret to fall back on.
+        """
+        with pytest.raises(ValueError):
+            main.make_jwt_verifier(Settings(JWT_SECRET=None))
+        with pytest.raises(ValueError):
+            main.make_jwt_verifier(
+                Settings(JWKS_URL=self.JWKS, JWT_SECRET=None, JWT_HMAC_FALLBACK=True)
+            )
@@ -1,4 +1,4 @@
-from .password_hasher import PasswordHasher
+from .password_hasher import HasherOverloadedError, PasswordHasher
 from .token_generator import TokenGenerator
 
-__all__ = ["PasswordHasher", "TokenGenerator"]
+__all__ = ["HasherOverloadedError", "PasswordHasher", "TokenGenerator"]
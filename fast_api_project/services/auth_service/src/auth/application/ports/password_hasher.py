@@ -1,4 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import List, Sequence
+
+
+class HasherOverloadedError(Exception):
+    """
+    Raised when the hashing workers are saturated and the request is shed.
+    """
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing is at capacity, please retry later.")
+        self.retry_after = retry_after
 
 
 class PasswordHasher(ABC):
@@ -19,3 +30,45 @@ class PasswordHasher(ABC):
         Verify a plain password against a hashed password.
         """
         pass
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Whether a stored hash was made with weaker parameters than current.
+        """
+        return False
+
+    def recognizes(self, hashed_password: str) -> bool:
+        """
+        Whether a hash made elsewhere is in a format verify() understands,
+        so it can be stored as is.
+        """
+        return False
+
+    async def hash_async(self, plain_password: str) -> str:
+        """
+        Hash a plain password without blocking the event loop.
+
+        The default runs hash() inline; implementations backed by a worker
+        pool override it and may raise HasherOverloadedError.
+        """
+        return self.hash(plain_password)
+
+    async def hash_many(self, plain_passwords: Sequence[str]) -> List[str]:
+        """
+        Hash a batch of passwords, in order, for bulk imports.
+        """
+        return [await self.hash_async(password) for password in plain_passwords]
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password without blocking the event loop.
+        """
+        return self.verify(plain_password, hashed_password)
+
+    @abstractmethod
+    async def verify_dummy_async(self, plain_password: str) -> None:
+        """
+        Spend as long as verify_async() on a real hash, without one: for
+        logins of unknown users, so timing does not tell which emails exist.
+        """
+        pass
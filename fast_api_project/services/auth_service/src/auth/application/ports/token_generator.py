@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 class TokenGenerator(ABC):
@@ -7,10 +7,15 @@ class TokenGenerator(ABC):
     Abstract base class for token generation.
     """
 
+    expire_minutes: int  # lifetime of access tokens
+
     @abstractmethod
-    def create_access_token(self, user_id: int, email: str) -> str:
+    def create_access_token(
+        self, user_id: int, email: str, jti: Optional[str] = None
+    ) -> str:
         """
-        Create a JWT access token for the given user ID and email.
+        Create a JWT access token for the given user ID and email, with jti
+        as its id (a random one if not given).
         """
         pass
 
@@ -20,3 +25,10 @@ class TokenGenerator(ABC):
         Verify the given JWT token and return its payload.
         """
         pass
+
+    def jwks(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        The public keys tokens can be verified with, as a JWK Set. Empty
+        for shared-secret algorithms.
+        """
+        return {"keys": []}
@@ -1,3 +1,19 @@
+from .import_users import ImportReport, ImportRow, ImportUsers
+from .introspect import Introspection, IntrospectTokens
+from .login import LoginUser
 from .register import RegisterUser
+from .sessions import Logout, RefreshSession, TokenIssuer, TokenPair
 
-__all__ = ["RegisterUser"]
+__all__ = [
+    "ImportReport",
+    "ImportRow",
+    "ImportUsers",
+    "Introspection",
+    "IntrospectTokens",
+    "LoginUser",
+    "Logout",
+    "RefreshSession",
+    "RegisterUser",
+    "TokenIssuer",
+    "TokenPair",
+]
@@ -0,0 +1,74 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from ...domain.entities import User
+from ...domain.repositories import ITokenRepository, IUserRepository
+from ..ports import TokenGenerator
+
+
+class Introspection(NamedTuple):
+    active: bool
+    error: Optional[str] = None  # why the token is not active
+    claims: Optional[Dict] = None
+    user: Optional[User] = None
+
+
+class IntrospectTokens:
+    """
+    Use case for checking many access tokens at once.
+
+    Every token is verified locally, then the users they name are loaded
+    with one get_many_by_ids call and their jtis checked against the
+    revocation list with one more query, whatever the number of tokens. A
+    token is active if it verifies, is not revoked, and its user exists
+    and is active. Repeated tokens are verified once.
+    """
+
+    def __init__(
+        self,
+        user_repo: IUserRepository,
+        token_gen: TokenGenerator,
+        token_repo: Optional[ITokenRepository] = None,
+    ):
+        self.user_repo = user_repo
+        self.token_gen = token_gen
+        self.token_repo = token_repo
+
+    def _verify(self, token: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """The token's claims, with a numeric sub, or why it is not valid."""
+        try:
+            claims = self.token_gen.verify_token(token)
+        except ValueError as e:
+            return None, "expired" if "expired" in str(e) else "invalid"
+        sub = claims.get("sub")
+        if not isinstance(sub, str) or not sub.isdigit():
+            return None, "invalid"
+        return claims, None
+
+    async def execute(self, tokens: Sequence[str]) -> List[Introspection]:
+        verified = {token: self._verify(token) for token in dict.fromkeys(tokens)}
+        valid = [claims for claims, _ in verified.values() if claims is not None]
+
+        users = await self.user_repo.get_many_by_ids(
+            [int(claims["sub"]) for claims in valid]
+        )
+        revoked: Set[str] = set()
+        if self.token_repo is not None:
+            revoked = await self.token_repo.revoked_among(
+                {claims["jti"] for claims in valid if "jti" in claims}
+            )
+
+        results = {}
+        for token, (claims, error) in verified.items():
+            if claims is None:
+                results[token] = Introspection(False, error)
+                continue
+            user = users.get(int(claims["sub"]))
+            if claims.get("jti") in revoked:
+                results[token] = Introspection(False, "revoked")
+            elif user is None:
+                results[token] = Introspection(False, "user_not_found")
+            elif not user.is_active:
+                results[token] = Introspection(False, "user_inactive", claims, user)
+            else:
+                results[token] = Introspection(True, None, claims, user)
+        return [results[token] for token in tokens]
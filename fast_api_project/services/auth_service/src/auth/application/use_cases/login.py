@@ -1,14 +1,49 @@
-# from ...domain.repositories import IUserRepository
-# from ..ports import PasswordHasher, TokenGenerator
+from typing import Callable, Optional
 
+from ...domain.exceptions import InvalidCredentialsError
+from ...domain.repositories import IUserRepository
+from ..ports import PasswordHasher, TokenGenerator
+from .sessions import TokenIssuer, TokenPair
 
-# class LoginUser:
-#     """Use case for logging in a user."""
+# schedule_rehash(user_id, plain_password), run after the response is sent
+RehashScheduler = Callable[[int, str], None]
 
-#     def __init__(self, user_repo: IUserRepository, hasher: PasswordHasher, token_gen: TokenGenerator):
-#         self.user_repo = user_repo
-#         self.hasher = hasher
-#         self.token_gen = token_gen
 
-#     async def execute(self, email: str, password:str) -> Login
+class LoginUser:
+    """Use case for logging in a user."""
 
+    def __init__(
+        self,
+        user_repo: IUserRepository,
+        hasher: PasswordHasher,
+        token_gen: TokenGenerator,
+        schedule_rehash: Optional[RehashScheduler] = None,
+        issuer: Optional[TokenIssuer] = None,
+    ):
+        self.user_repo = user_repo
+        self.hasher = hasher
+        self.token_gen = token_gen
+        self.schedule_rehash = schedule_rehash
+        self.issuer = issuer or TokenIssuer(token_gen)  # access tokens only
+
+    async def execute(self, email: str, password: str) -> TokenPair:
+        """
+        Check the credentials and return the tokens of a new session.
+
+        A hash made with an outdated cost is replaced in the background with
+        one at the current cost, so cost changes roll out as users log in.
+        Unknown and inactive users cost a password check as well, so the
+        response time does not reveal whether an email is registered.
+        """
+        user = await self.user_repo.get_by_email(email)
+        if user is None or not user.is_active:
+            await self.hasher.verify_dummy_async(password)
+            raise InvalidCredentialsError()
+
+        if not await self.hasher.verify_async(password, user.hashed_password):
+            raise InvalidCredentialsError()
+
+        if self.schedule_rehash and self.hasher.needs_rehash(user.hashed_password):
+            self.schedule_rehash(user.id, password)
+
+        return await self.issuer.start(user)
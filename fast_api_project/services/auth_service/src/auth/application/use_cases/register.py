@@ -1,5 +1,6 @@
+from typing import Union
+
 from auth.domain.entities import User
-from auth.domain.exceptions import UserAlreadyExistsError
 
 from ...domain.repositories import IUserRepository
 from ...domain.value_objects import Email, Password
@@ -13,21 +14,22 @@ class RegisterUser:
         self.user_repo = user_repo
         self.hasher = hasher
 
-    async def execute(self, username: str, email: str, password: str) -> User:
+    async def execute(
+        self, username: str, email: Union[str, Email], password: str
+    ) -> User:
+        """
+        Create the user, or raise UserAlreadyExistsError.
+
+        There is no lookup beforehand: the repository's unique constraints
+        decide, so two concurrent registrations cannot both succeed.
+        An Email is taken as already validated.
+        """
         # validate
-        email_vo = Email(email)
+        email_vo = email if isinstance(email, Email) else Email(email)
         password_vo = Password(password)
 
-        # check exists
-        existing_user = await self.user_repo.get_by_email(email_vo.value)
-
-        if existing_user:
-            raise UserAlreadyExistsError(
-                f"User with email {email_vo.value} already exists."
-            )
-
         # hash password
-        hashed = self.hasher.hash(password_vo.value)
+        hashed = await self.hasher.hash_async(password_vo.value)
 
         # create user entity
         new_user = User(
@@ -0,0 +1,171 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Optional
+
+from ...domain.entities import RefreshToken, User
+from ...domain.exceptions import InvalidRefreshTokenError
+from ...domain.repositories import ITokenRepository, IUserRepository
+from ..ports import TokenGenerator
+
+
+class TokenPair(NamedTuple):
+    access_token: str
+    refresh_token: Optional[str]  # None without a token store
+    expires_in: int  # seconds the access token is valid
+
+
+def hash_refresh_token(token: str) -> str:
+    """Refresh tokens are random, so a plain SHA-256 is enough to store."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenIssuer:
+    """
+    Issues the short-lived access token and the refresh token of a session.
+
+    Each access token gets a random jti, recorded with its refresh token so
+    the pair can be revoked together.
+    """
+
+    def __init__(
+        self,
+        token_gen: TokenGenerator,
+        token_repo: Optional[ITokenRepository] = None,
+        refresh_ttl: timedelta = timedelta(days=30),
+    ):
+        self.token_gen = token_gen
+        self.token_repo = token_repo
+        self.refresh_ttl = refresh_ttl
+
+    def _next(self, user: User, family_id: str, now: datetime):
+        jti = secrets.token_urlsafe(16)
+        access_token = self.token_gen.create_access_token(user.id, user.email, jti)
+        refresh_token = secrets.token_urlsafe(32)
+        record = RefreshToken(
+            id=None,
+            user_id=user.id,
+            family_id=family_id,
+            token_hash=hash_refresh_token(refresh_token),
+            access_jti=jti,
+            access_expires_at=now + timedelta(minutes=self.token_gen.expire_minutes),
+            expires_at=now + self.refresh_ttl,
+            created_at=now,
+        )
+        pair = TokenPair(
+            access_token, refresh_token, self.token_gen.expire_minutes * 60
+        )
+        return pair, record
+
+    async def start(self, user: User) -> TokenPair:
+        """Tokens of a new session."""
+        if self.token_repo is None:
+            return TokenPair(
+                self.token_gen.create_access_token(user.id, user.email),
+                None,
+                self.token_gen.expire_minutes * 60,
+            )
+        now = datetime.now(timezone.utc)
+        pair, record = self._next(user, secrets.token_urlsafe(16), now)
+        await self.token_repo.add(record)
+        return pair
+
+    async def rotate(self, user: User, used: RefreshToken) -> Optional[TokenPair]:
+        """
+        The next tokens of used's session, or None if used was consumed by
+        someone else meanwhile.
+        """
+        now = datetime.now(timezone.utc)
+        pair, record = self._next(user, used.family_id, now)
+        if not await self.token_repo.rotate(used, record):
+            return None
+        return pair
+
+
+class RefreshSession:
+    """
+    Use case for exchanging a refresh token for new tokens.
+
+    Refresh tokens are single use. Presenting one that was already used
+    means two parties hold it, so the whole session is revoked and both
+    have to log in again.
+    """
+
+    def __init__(
+        self,
+        user_repo: IUserRepository,
+        token_repo: ITokenRepository,
+        issuer: TokenIssuer,
+    ):
+        self.user_repo = user_repo
+        self.token_repo = token_repo
+        self.issuer = issuer
+
+    async def execute(self, refresh_token: str) -> TokenPair:
+        token = await self.token_repo.get_by_hash(hash_refresh_token(refresh_token))
+        if token is None or token.revoked_at is not None:
+            raise InvalidRefreshTokenError()
+        if token.used_at is not None:  # replayed
+            await self.token_repo.revoke_sessions(family_id=token.family_id)
+            raise InvalidRefreshTokenError()
+        if not token.is_usable(datetime.now(timezone.utc)):
+            raise InvalidRefreshTokenError()
+
+        user = await self.user_repo.get_by_id(token.user_id)
+        if user is None or not user.is_active:
+            await self.token_repo.revoke_sessions(family_id=token.family_id)
+            raise InvalidRefreshTokenError()
+
+        pair = await self.issuer.rotate(user, token)
+        if pair is None:  # used concurrently: a replay as well
+            await self.token_repo.revoke_sessions(family_id=token.family_id)
+            raise InvalidRefreshTokenError()
+        return pair
+
+
+class Logout:
+    """
+    Use case for ending a session, or every session of a user.
+
+    The refresh token stops working at once; the access tokens of the
+    sessions are added to the revocation list, which the gateway checks,
+    until they expire.
+    """
+
+    def __init__(self, token_repo: ITokenRepository):
+        self.token_repo = token_repo
+
+    async def execute(
+        self,
+        refresh_token: Optional[str] = None,
+        access_claims: Optional[Dict] = None,
+        all_sessions: bool = False,
+    ) -> int:
+        """
+        Revoke the session of refresh_token and/or of the access token
+        with access_claims; with all_sessions, every session of its user.
+        Returns the number of sessions revoked.
+        """
+        token = None
+        if refresh_token:
+            token = await self.token_repo.get_by_hash(hash_refresh_token(refresh_token))
+            if token is None:
+                raise InvalidRefreshTokenError()
+
+        user_id = token.user_id if token is not None else None
+        if access_claims is not None:
+            user_id = int(access_claims["sub"])
+            if token is not None and token.user_id != user_id:
+                raise InvalidRefreshTokenError()  # someone else's session
+            await self.token_repo.revoke_access_token(
+                access_claims["jti"],
+                datetime.fromtimestamp(access_claims["exp"], timezone.utc),
+            )
+        if user_id is None:
+            raise InvalidRefreshTokenError()
+
+        if all_sessions:
+            return await self.token_repo.revoke_sessions(user_id=user_id)
+        if token is not None:
+            return await self.token_repo.revoke_sessions(family_id=token.family_id)
+        return 0
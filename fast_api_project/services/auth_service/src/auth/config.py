@@ -1,8 +1,14 @@
+import os
+import tempfile
 from functools import lru_cache  # caching decorator
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from pydantic import Field  # field definitions with validation
 from pydantic_settings import BaseSettings  # base class for settings management
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
 )  # async database engine
@@ -24,13 +30,64 @@ class Settings(BaseSettings):
     PORT: int = 8000
 
     DATABASE_URL: str = Field(default="sqlite+aiosqlite:///./auth.db")
+    # read replicas for user lookups; writes always go to DATABASE_URL
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_RETRY_AFTER: float = 5.0  # skip a failed replica this long
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0  # seconds between replica pings
+    # read users written by this worker from the primary, above replication lag
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DB_ECHO: Optional[bool] = None  # log SQL; None = in dev only
+    DB_POOL_SIZE: int = 5  # connections kept open per worker
+    DB_MAX_OVERFLOW: int = 10  # extra connections allowed under load
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # reconnect after this many seconds, -1 = never
+    # test connections on checkout (one round trip each); None = except SQLite
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_STATEMENT_CACHE_SIZE: int = 256  # asyncpg prepared statements, 0 = off
+    # SQLite pragmas, set on every new connection ("" leaves the default)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers no longer block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # no fsync per commit in WAL mode
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes read through mmap, 0 = off
+    SQLITE_CACHE_SIZE: int = -64_000  # pages, or KiB when negative
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait this long for the write lock
 
     JWT_SECRET: str = "change-me"  # should be overridden in production
-    JWT_ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRES_MIN: int = 60
+    JWT_ALGORITHM: str = "HS256"  # or "EdDSA"/"ES256" with a private key
+    JWT_PRIVATE_KEY_FILE: Optional[str] = None  # PEM signing key for EdDSA/ES256
+    # PEM public keys also published and accepted: the previous key while its
+    # tokens expire, or the next one before it starts signing
+    JWT_PUBLISHED_KEY_FILES: List[str] = []
+    ACCESS_TOKEN_EXPIRES_MIN: int = 15  # short: refresh tokens renew them
+    REFRESH_TOKEN_EXPIRES_DAYS: int = 30  # a session ends this long after login
+    TOKEN_PURGE_INTERVAL: float = 3600.0  # seconds between expired token sweeps
+    INTROSPECT_MAX_TOKENS: int = 1000  # tokens accepted per introspection call
 
     BCRYPT_ROUNDS: int = 12  # higher = more secure but slower
+    # pick the cost at startup: highest whose hash takes at most this long
+    BCRYPT_TARGET_MS: Optional[float] = None  # None = use BCRYPT_ROUNDS as is
+    BCRYPT_MIN_ROUNDS: int = 10  # calibration never goes below this
+    BCRYPT_MAX_ROUNDS: int = 16
+    HASHER_EXECUTOR: Literal["thread", "process"] = "thread"  # where bcrypt runs
+    HASHER_WORKERS: Optional[int] = None  # None = one per CPU core
+    HASHER_MAX_QUEUE: int = 64  # waiting hash jobs before requests get 503
+    HASHER_RETRY_AFTER: int = 1  # Retry-After seconds on those 503s
     REQUESTS_PER_MINUTE: int = 60  # simple rate limit knob
+    RATE_LIMIT_ALGORITHM: Literal["token_bucket", "sliding_window"] = "sliding_window"
+    RATE_LIMIT_ROUTES: Dict[str, int] = {}  # path prefix -> requests per minute
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # tracked clients before LRU eviction
+    RATE_LIMIT_IDLE_SECONDS: float = 120.0  # forget clients idle this long
+    # "shared": one sliding window table in a memory-mapped file for all workers
+    RATE_LIMIT_BACKEND: Literal["memory", "shared"] = "memory"
+    RATE_LIMIT_SHARED_FILE: str = os.path.join(
+        tempfile.gettempdir(), "auth-rate-limit"
+    )  # /dev/shm keeps it off disk
+    RATE_LIMIT_SHARED_SLOTS: int = 262_144  # 32 bytes each
+    # gateway addresses or networks (e.g. "172.18.0.0/16"): requests from them
+    # are limited by the client address in their X-Forwarded-For
+    RATE_LIMIT_TRUSTED_PROXIES: List[str] = []
+    USER_CACHE_SIZE: int = 10_000  # cached user lookups per worker, 0 = off
+    USER_CACHE_TTL: float = 30.0  # seconds a cached user is trusted
+    USER_CACHE_NEGATIVE_TTL: float = 2.0  # seconds "no such user" is trusted
 
     class Config:
         env_file = ".env"  # load variables from .env file
@@ -43,11 +100,88 @@ def get_settings() -> Settings:
 
 settings = get_settings()  # singleton settings instance
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.ENV == "dev",  # log SQL queries in dev mode
-    pool_pre_ping=True,  # check if connections are alive
-)
+
+def database_url(settings: Settings, url: Optional[str] = None) -> URL:
+    """
+    DATABASE_URL (or url) with an async driver: plain postgres:// URLs use
+    asyncpg.
+    """
+    url = make_url(url or settings.DATABASE_URL)
+    if url.drivername in ("postgres", "postgresql"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+def engine_options(
+    settings: Settings, url: Optional[str] = None
+) -> Tuple[URL, Dict[str, Any]]:
+    """
+    URL and create_async_engine() keyword arguments for the settings.
+    """
+    url = database_url(settings, url)
+    backend = url.get_backend_name()
+    options: Dict[str, Any] = {
+        "echo": settings.ENV == "dev" if settings.DB_ECHO is None else settings.DB_ECHO,
+        "pool_pre_ping": (
+            backend != "sqlite"
+            if settings.DB_POOL_PRE_PING is None
+            else settings.DB_POOL_PRE_PING
+        ),
+    }
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        return url, options  # a single shared connection, nothing to size
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.drivername == "postgresql+asyncpg":
+        options["connect_args"] = {
+            # asyncpg's own cache, and SQLAlchemy's cache of prepared statements
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return url, options
+
+
+def sqlite_pragmas(settings: Settings) -> Dict[str, Any]:
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    return {name: value for name, value in pragmas.items() if value != ""}
+
+
+def build_engine(settings: Settings, url: Optional[str] = None) -> AsyncEngine:
+    """
+    The async engine for the settings (or another database, such as a
+    replica, with the same tuning), with SQLite pragmas applied to each new
+    connection.
+    """
+    url, options = engine_options(settings, url)
+    engine = create_async_engine(url, **options)
+    if url.get_backend_name() == "sqlite":
+        pragmas = sqlite_pragmas(settings)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            cursor.close()
+
+    return engine
+
+
+engine = build_engine(settings)
+replica_engines = [
+    build_engine(settings, url) for url in settings.DATABASE_REPLICA_URLS
+]
 
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
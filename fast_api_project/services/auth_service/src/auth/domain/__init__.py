@@ -3,20 +3,24 @@
 from auth.domain.exceptions import (
     AuthDomainException,
     InvalidCredentialsError,
+    InvalidRefreshTokenError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
 
+from .entities.refresh_token import RefreshToken
 from .entities.user import User
 from .value_objects.email import Email
 from .value_objects.password import Password
 
 __all__ = [
     "User",
+    "RefreshToken",
     "Email",
     "Password",
     "AuthDomainException",
     "InvalidCredentialsError",
+    "InvalidRefreshTokenError",
     "UserAlreadyExistsError",
     "UserNotFoundError",
 ]
@@ -0,0 +1,5 @@
+import sys
+
+# dataclass(**SLOTS): instances without a __dict__, smaller and quicker to
+# read. slots= needs Python 3.10; on 3.9 the classes keep their __dict__.
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -1,3 +1,4 @@
+from .refresh_token import RefreshToken
 from .user import User
 
-__all__ = ["User"]
+__all__ = ["RefreshToken", "User"]
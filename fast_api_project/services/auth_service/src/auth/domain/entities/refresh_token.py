@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+
+@dataclass
+class RefreshToken:
+    """
+    One refresh token of a login session.
+
+    Only a hash of the token is kept. Each refresh uses the token up and
+    issues the next one of the same family (the session); a used token
+    presented again means it leaked, and the whole family is revoked. The
+    access token issued with it is remembered so revoking the session can
+    revoke that too.
+    """
+
+    id: Optional[int]
+    user_id: int
+    family_id: str  # shared by every token of one login
+    token_hash: str
+    access_jti: str  # jti of the access token issued alongside
+    access_expires_at: datetime
+    expires_at: datetime
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    used_at: Optional[datetime] = None  # when it was exchanged for the next one
+    revoked_at: Optional[datetime] = None
+
+    def is_usable(self, now: datetime) -> bool:
+        return (
+            self.used_at is None and self.revoked_at is None and (self.expires_at > now)
+        )
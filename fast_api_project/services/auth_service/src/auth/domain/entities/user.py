@@ -5,8 +5,10 @@ from dataclasses import (  # generates useful methods like __init__, __repr__, e
 from datetime import datetime, timezone  # python's built-in datetime module
 from typing import Optional  # for optional type hinting
 
+from .._slots import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class User:
     """
     Represents a user in the authentication system.
@@ -22,16 +24,30 @@ class User:
     email: str  # Email address of the user
     hashed_password: str  # Hashed password for security
     is_active: bool = True  # Indicates if the user account is active
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))  # Timestamp of when the user was created
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )  # Timestamp of when the user was created
+
+    def __copy__(self) -> "User":
+        # much quicker than copy's generic path, which goes through pickling
+        # support; the user cache copies on every hit
+        return User(
+            self.id,
+            self.username,
+            self.email,
+            self.hashed_password,
+            self.is_active,
+            self.created_at,
+        )
 
     def deactivate(self):
-        '''
+        """
         Deactivates the user account.
-        '''
+        """
         self.is_active = False
 
     def activate(self):
-        '''
+        """
         Activates the user account.
-        '''
+        """
         self.is_active = True
@@ -2,6 +2,8 @@
 Domain exceptions for the auth service.
 """
 
+from typing import Optional
+
 
 class AuthDomainException(Exception):
     """Base exception for auth domain errors."""
@@ -14,9 +16,13 @@ class AuthDomainException(Exception):
 class UserAlreadyExistsError(AuthDomainException):
     """Exception raised when attempting to create a user that already exists."""
 
-    def __init__(self, email: str):
-        super().__init__(f"User with email {email} already exists.")
+    def __init__(self, email: str, username: Optional[str] = None):
+        if username is not None:  # the username was the one taken
+            super().__init__(f"User with username {username} already exists.")
+        else:
+            super().__init__(f"User with email {email} already exists.")
         self.email = email
+        self.username = username
 
 
 class UserNotFoundError(AuthDomainException):
@@ -32,3 +38,10 @@ class InvalidCredentialsError(AuthDomainException):
 
     def __init__(self):
         super().__init__("Invalid email or password.")
+
+
+class InvalidRefreshTokenError(AuthDomainException):
+    """Exception raised for an unknown, used, revoked or expired refresh token."""
+
+    def __init__(self):
+        super().__init__("Invalid or expired refresh token.")
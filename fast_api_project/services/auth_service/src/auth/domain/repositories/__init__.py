@@ -1,3 +1,4 @@
-from auth.domain.repositories.user_repository import IUserRepository
+from auth.domain.repositories.token_repository import ITokenRepository, Revocation
+from auth.domain.repositories.user_repository import BulkCreateResult, IUserRepository
 
-__all__ = ["IUserRepository"]
+__all__ = ["BulkCreateResult", "ITokenRepository", "IUserRepository", "Revocation"]
@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Collection, List, NamedTuple, Optional, Set
+
+from ..entities import RefreshToken
+
+
+class Revocation(NamedTuple):
+    seq: int  # position in the revocation feed, increasing
+    jti: str  # id of the revoked access token
+    expires_at: datetime  # when the token would have expired anyway
+
+
+class ITokenRepository(ABC):
+    """
+    Abstract base class for the refresh token and revocation store.
+    """
+
+    @abstractmethod
+    async def add(self, token: RefreshToken) -> RefreshToken:
+        """
+        Store the first refresh token of a session.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        """
+        Retrieve a refresh token by the hash of its value.
+        """
+        pass
+
+    @abstractmethod
+    async def rotate(self, used: RefreshToken, token: RefreshToken) -> bool:
+        """
+        Mark used as used and store its successor, atomically. False, and
+        nothing stored, if used was already used or revoked.
+        """
+        pass
+
+    @abstractmethod
+    async def revoke_sessions(
+        self, family_id: Optional[str] = None, user_id: Optional[int] = None
+    ) -> int:
+        """
+        Revoke the refresh tokens of one session (family_id) or of every
+        session of a user, and the access tokens issued with them that have
+        not expired yet. Returns the number of sessions revoked.
+        """
+        pass
+
+    @abstractmethod
+    async def revoke_access_token(self, jti: str, expires_at: datetime) -> None:
+        """
+        Add an access token to the revocation list until it expires.
+        """
+        pass
+
+    @abstractmethod
+    async def revoked_among(self, jtis: Collection[str]) -> Set[str]:
+        """
+        The jtis, of those given, that are on the revocation list.
+        """
+        pass
+
+    @abstractmethod
+    async def revocations_since(self, seq: int, limit: int = 1000) -> List[Revocation]:
+        """
+        Unexpired revocations after seq, oldest first.
+        """
+        pass
+
+    @abstractmethod
+    async def purge_expired(self, now: datetime) -> int:
+        """
+        Delete expired refresh tokens and revocations; returns how many.
+        """
+        pass
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Sequence
 
 from ..entities import User
 
 
+class BulkCreateResult(NamedTuple):
+    created: List[User]  # with their new ids
+    duplicates: List[User]  # the given users whose email or username is taken
+
+
 class IUserRepository(ABC):
     """
     Abstract base class for User repository.
@@ -16,6 +21,13 @@ class IUserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def create_many(self, users: Sequence[User]) -> BulkCreateResult:
+        """
+        Create many users at once, skipping duplicates instead of failing.
+        """
+        pass
+
     @abstractmethod
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """
@@ -23,9 +35,30 @@ class IUserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_many_by_ids(self, user_ids: Sequence[int]) -> Dict[int, User]:
+        """
+        Retrieve many users by ID at once. Ids with no user are left out.
+        """
+        pass
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[User]:
         """
         Retrieve a user by their email.
         """
         pass
+
+    @abstractmethod
+    async def set_active(self, user_id: int, is_active: bool) -> None:
+        """
+        Activate or deactivate a user.
+        """
+        pass
+
+    @abstractmethod
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        """
+        Replace the stored password hash of a user.
+        """
+        pass
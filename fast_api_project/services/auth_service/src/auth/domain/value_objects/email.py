@@ -3,12 +3,26 @@ from dataclasses import (
     dataclass,  # generates useful methods like __init__, __repr__, etc.
 )
 
+from .._slots import SLOTS
 
-@dataclass(frozen=True)  # frozen makes the instance immutable
+# compiled once, at import: dot-separated atoms before the @, and after it
+# labels that neither start nor end with a hyphen, under an alphabetic TLD
+_ATOM = r"[a-zA-Z0-9_%+-]+"
+_LABEL = r"[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+_EMAIL = re.compile(rf"{_ATOM}(?:\.{_ATOM})*@((?:{_LABEL}\.)+[a-zA-Z]{{2,63}})")
+
+# Reserved names (RFC 6761 and friends) that no mailbox can be under
+_SPECIAL_USE = frozenset({"arpa", "invalid", "local", "localhost", "onion", "test"})
+
+
+@dataclass(frozen=True, **SLOTS)  # frozen makes the instance immutable
 class Email:
     """
     Value Object representing an Email address.
 
+    The domain is lowercased, as domains are case-insensitive; the local
+    part is kept as given.
+
     LEARN:
     - This class is part of the DOMAIN layer.
     - It has no framework dependencies (pure Python).
@@ -18,10 +32,15 @@ class Email:
     value: str  # The actual email address
 
     def __post_init__(self):
-        if not self._is_valid(self.value):
+        match = _EMAIL.fullmatch(self.value)
+        if (
+            match is None
+            or match.start(1) > 65  # local part over 64 characters
+            or len(self.value) > 254
+            or match.group(1).rpartition(".")[2].lower() in _SPECIAL_USE
+        ):
             raise ValueError(f"Invalid email address: {self.value}")
-
-    @staticmethod
-    def _is_valid(email: str) -> bool:
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return bool(re.match(pattern, email))
+        domain = match.group(1)
+        if not domain.islower():
+            normalized = self.value[: match.start(1)] + domain.lower()
+            object.__setattr__(self, "value", normalized)
@@ -1,10 +1,49 @@
-import re  # regular expression matching patterns
+import string
 from dataclasses import (
     dataclass,  # generates useful methods like __init__, __repr__, etc.
 )
+from typing import NamedTuple, Tuple
 
+from .._slots import SLOTS
 
-@dataclass(frozen=True)  # frozen makes the instance immutable
+MIN_LENGTH = 8
+
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+_ALNUM = _UPPER | _LOWER | _DIGITS
+
+
+class Strength(NamedTuple):
+    strong: bool
+    missing: Tuple[str, ...]  # requirements not met, as worded in the error
+
+
+def check_strength(password: str) -> Strength:
+    """
+    Check password against every rule in one pass over its characters.
+
+    The pass collects the distinct characters; the character classes are
+    then tested on those, so the cost barely grows with the length.
+    Uppercase, lowercase and digits are ASCII only; a special character is
+    anything that is not a letter or a digit in any script, or "_".
+    """
+    chars = set(password)
+    missing = []
+    if len(password) < MIN_LENGTH:
+        missing.append(f"at least {MIN_LENGTH} characters")
+    if chars.isdisjoint(_UPPER):
+        missing.append("one uppercase letter")
+    if chars.isdisjoint(_LOWER):
+        missing.append("one lowercase letter")
+    if chars.isdisjoint(_DIGITS):
+        missing.append("one digit")
+    if not any(c == "_" or not c.isalnum() for c in chars - _ALNUM):
+        missing.append("one special character")
+    return Strength(not missing, tuple(missing))
+
+
+@dataclass(frozen=True, **SLOTS)  # frozen makes the instance immutable
 class Password:
     """
     Value Object representing a Password.
@@ -18,34 +57,10 @@ class Password:
     value: str  # password string
 
     def __post_init__(self):
-        if not self._is_strong(self.value):
-            raise ValueError(f"Weak password: {self._error_message(self.value)}")
-
-    @staticmethod
-    def _is_strong(password: str) -> bool:
-        if len(password) < 8:
-            return False
-        if not re.search(r"[A-Z]", password):
-            return False
-        if not re.search(r"[a-z]", password):
-            return False
-        if not re.search(r"[0-9]", password):
-            return False
-        if not re.search(r"[\W_]", password):  # special characters
-            return False
-        return True
-
-    @staticmethod
-    def _error_message(password: str) -> str:
-        messages = []
-        if len(password) < 8:
-            messages.append("at least 8 characters")
-        if not re.search(r"[A-Z]", password):
-            messages.append("one uppercase letter")
-        if not re.search(r"[a-z]", password):
-            messages.append("one lowercase letter")
-        if not re.search(r"[0-9]", password):
-            messages.append("one digit")
-        if not re.search(r"[\W_]", password):  # special characters
-            messages.append("one special character")
-        return "Password must contain: " + ", ".join(messages) + "."
+        strength = check_strength(self.value)
+        if not strength.strong:
+            raise ValueError(
+                "Weak password: Password must contain: "
+                + ", ".join(strength.missing)
+                + "."
+            )
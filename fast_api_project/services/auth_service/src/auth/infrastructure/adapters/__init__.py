@@ -1,4 +1,16 @@
-from .bcrypt_hasher import BcryptHasher
+from app_shared.jwt_codec import HMACJWTCodec
+
+from .bcrypt_hasher import BcryptHasher, calibrate_cost, dummy_hash
+from .hashing_pool import HashingPool
+from .jwt_keys import AsymmetricJWTCodec
 from .jwt_token_generator import JWTTokenGenerator
 
-__all__ = ["BcryptHasher", "JWTTokenGenerator"]
+__all__ = [
+    "AsymmetricJWTCodec",
+    "BcryptHasher",
+    "HMACJWTCodec",
+    "HashingPool",
+    "JWTTokenGenerator",
+    "calibrate_cost",
+    "dummy_hash",
+]
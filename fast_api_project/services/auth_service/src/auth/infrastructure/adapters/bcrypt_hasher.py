@@ -1,19 +1,132 @@
+import asyncio
+import re
+import secrets
+import time
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
+
 import bcrypt
 
 from ...application.ports import PasswordHasher
+from .hashing_pool import HashingPool
+
+BCRYPT_HASH = re.compile(r"^\$2[aby]\$(0[4-9]|[12][0-9]|3[01])\$[./A-Za-z0-9]{53}$")
+
+
+def hash_password(password: str, cost: int) -> str:
+    salt = bcrypt.gensalt(rounds=cost)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def hash_passwords(passwords: Sequence[str], cost: int) -> List[str]:
+    """
+    Hash a chunk of passwords in one worker call, saving a round trip per
+    password on a process pool.
+    """
+    return [hash_password(password, cost) for password in passwords]
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+def cost_of(hashed: str) -> Optional[int]:
+    """
+    Cost factor stored in a bcrypt hash ("$2b$12$..." -> 12).
+    """
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+@lru_cache()
+def dummy_hash(cost: int) -> str:
+    """
+    A hash of a random password at cost, made once per process, to verify
+    against when there is no user so the check takes as long as a real one.
+    """
+    return hash_password(secrets.token_urlsafe(16), cost)
+
+
+def time_hash(cost: int) -> float:
+    start = time.perf_counter()
+    hash_password("calibration-password", cost)
+    return time.perf_counter() - start
+
+
+def calibrate_cost(
+    target_seconds: float,
+    min_cost: int = 10,
+    max_cost: int = 16,
+    measure: Callable[[int], float] = time_hash,
+) -> int:
+    """
+    Highest bcrypt cost whose hash takes at most target_seconds on this host.
+
+    Each cost step doubles the work, so costs are timed upwards from
+    min_cost and the search stops as soon as the next step would overshoot.
+    Never returns less than min_cost, even on hosts slower than the target.
+    """
+    cost = min_cost
+    elapsed = min(measure(cost) for _ in range(2))  # best of two, skip warm-up
+    while cost < max_cost and elapsed * 2 <= target_seconds:
+        elapsed = measure(cost + 1)
+        if elapsed > target_seconds:
+            break
+        cost += 1
+    return cost
 
 
 class BcryptHasher(PasswordHasher):
     """
     Bcrypt implementation of the PasswordHasher interface.
+
+    With a HashingPool the async variants run on the pool's workers;
+    without one they hash inline like the sync methods.
     """
 
-    def __init__(self, cost: int = 12):
+    def __init__(self, cost: int = 12, pool: Optional[HashingPool] = None):
         self.cost = cost
+        self.pool = pool
 
     def hash(self, password: str) -> str:
-        salt = bcrypt.gensalt(rounds=self.cost)
-        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+        return hash_password(password, self.cost)
 
     def verify(self, password: str, hashed: str) -> bool:
-        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        return verify_password(password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        # only upwards: workers calibrate to slightly different costs and
+        # must not rehash an account back and forth between them
+        cost = cost_of(hashed)
+        return cost is None or cost < self.cost
+
+    def recognizes(self, hashed: str) -> bool:
+        return BCRYPT_HASH.match(hashed) is not None
+
+    async def hash_async(self, password: str) -> str:
+        if self.pool is None:
+            return self.hash(password)
+        return await self.pool.run(hash_password, password, self.cost)
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """
+        Hash passwords in one chunk per pool worker, all running at once.
+        """
+        if self.pool is None or not passwords:
+            return hash_passwords(passwords, self.cost)
+        size = -(-len(passwords) // self.pool.workers)  # ceiling division
+        chunks = [passwords[i : i + size] for i in range(0, len(passwords), size)]
+        hashed = await asyncio.gather(
+            *(self.pool.run(hash_passwords, chunk, self.cost) for chunk in chunks)
+        )
+        return [h for chunk in hashed for h in chunk]
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        if self.pool is None:
+            return self.verify(password, hashed)
+        return await self.pool.run(verify_password, password, hashed)
+
+    async def verify_dummy_async(self, password: str) -> None:
+        await self.verify_async(password, dummy_hash(self.cost))
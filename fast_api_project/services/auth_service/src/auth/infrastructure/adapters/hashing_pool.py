@@ -0,0 +1,78 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from ...application.ports import HasherOverloadedError
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """
+    Bounded worker pool for CPU-heavy password hashing.
+
+    Work runs on a thread pool (bcrypt releases the GIL) or a process pool,
+    so the event loop keeps serving other requests. At most `workers` jobs
+    run and `max_queue` more wait; anything beyond that is rejected at once
+    with HasherOverloadedError instead of queueing without limit.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: int = 64,
+        kind: str = "thread",
+        retry_after: int = 1,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.kind = kind
+        self.retry_after = retry_after
+        self.pending = 0  # jobs running or waiting for a worker
+        self.rejected = 0
+        self._lock = threading.Lock()  # pending is also released by workers
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:  # created on first use, e.g. after fork
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="hasher"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(*args) on the pool, or raise HasherOverloadedError when full.
+
+        The slot is held until the job itself ends, not until the caller
+        stops waiting: a cancelled request leaves its job queued or running,
+        and it still counts against the bound. With a process pool fn and
+        args must be picklable.
+        """
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HasherOverloadedError(self.retry_after)
+            self.pending += 1
+        try:
+            job = self.executor.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        job.add_done_callback(self._release)  # on a worker thread, or here
+        return await asyncio.wrap_future(job)
+
+    def _release(self, job) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
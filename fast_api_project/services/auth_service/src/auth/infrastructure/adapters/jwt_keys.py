@@ -0,0 +1,164 @@
+import hashlib
+import time
+from typing import Callable, Dict, List, Sequence
+
+from app_shared.jwt_codec import (
+    InvalidTokenError,
+    b64url_encode,
+    check_times,
+    decode_segment,
+    decode_signature,
+    encode_claims,
+    json_encode,
+    split_token,
+)
+from app_shared.jwt_keys import (
+    ASYMMETRIC_ALGORITHMS,
+    PrivateKey,
+    PublicKey,
+    sign,
+    verify,
+)
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+
+def generate_private_key(algorithm: str) -> PrivateKey:
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    raise ValueError(f"Unsupported algorithm {algorithm}")
+
+
+def private_key_pem(key: PrivateKey) -> bytes:
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def _check_key(key, algorithm: str):
+    if algorithm == "EdDSA" and isinstance(
+        key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)
+    ):
+        return key
+    if (
+        algorithm == "ES256"
+        and isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey))
+        and isinstance(key.curve, ec.SECP256R1)
+    ):
+        return key
+    raise ValueError(f"Key does not match algorithm {algorithm}")
+
+
+def load_private_key(pem: bytes, algorithm: str) -> PrivateKey:
+    """An unencrypted PEM private key, checked against algorithm."""
+    return _check_key(serialization.load_pem_private_key(pem, None), algorithm)
+
+
+def load_public_key(pem: bytes, algorithm: str) -> PublicKey:
+    """The public half of a PEM public or private key."""
+    if b"PRIVATE KEY" in pem:
+        return load_private_key(pem, algorithm).public_key()
+    return _check_key(serialization.load_pem_public_key(pem), algorithm)
+
+
+def public_jwk(key: PublicKey) -> Dict[str, str]:
+    """The required JWK members of a public key (RFC 8037, RFC 7518)."""
+    if isinstance(key, ed25519.Ed25519PublicKey):
+        raw = key.public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        return {"crv": "Ed25519", "kty": "OKP", "x": b64url_encode(raw).decode()}
+    numbers = key.public_numbers()
+    return {
+        "crv": "P-256",
+        "kty": "EC",
+        "x": b64url_encode(numbers.x.to_bytes(32, "big")).decode(),
+        "y": b64url_encode(numbers.y.to_bytes(32, "big")).decode(),
+    }
+
+
+def jwk_thumbprint(jwk: Dict[str, str]) -> str:
+    """
+    RFC 7638 thumbprint: the SHA-256 of the required members, sorted and
+    compact. Used as the kid, so a key always has the same id.
+    """
+    members = {name: jwk[name] for name in sorted(jwk)}
+    digest = hashlib.sha256(json_encode(members).encode("utf-8")).digest()
+    return b64url_encode(digest).decode()
+
+
+class AsymmetricJWTCodec:
+    """
+    Encoder and verifier for JWTs signed with EdDSA (Ed25519) or ES256.
+
+    Tokens carry the signing key's id (its RFC 7638 thumbprint) in the kid
+    header, so verifiers holding the published keys (see jwks()) pick the
+    right one without trying each. `published_keys` are other public keys
+    still accepted and published: the previous key while its tokens run
+    out, or the next one ahead of a rotation.
+    """
+
+    def __init__(
+        self,
+        private_key: PrivateKey,
+        algorithm: str = "EdDSA",
+        published_keys: Sequence[PublicKey] = (),
+        leeway: int = 0,  # seconds of clock skew tolerated on exp/nbf
+        clock: Callable[[], float] = time.time,
+    ):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm {algorithm}")
+        self.algorithm = algorithm
+        self.leeway = leeway
+        self.clock = clock
+        self._private_key = _check_key(private_key, algorithm)
+        self._keys: Dict[str, PublicKey] = {}
+        self._jwks: List[Dict[str, str]] = []
+        for key in [private_key.public_key(), *published_keys]:
+            jwk = public_jwk(_check_key(key, algorithm))
+            kid = jwk_thumbprint(jwk)
+            if kid not in self._keys:
+                self._keys[kid] = key
+                self._jwks.append({**jwk, "kid": kid, "alg": algorithm, "use": "sig"})
+        self.key_id = self._jwks[0]["kid"]
+        # header segment -> key, for the headers this codec writes
+        self._headers: Dict[bytes, PublicKey] = {
+            self._header(kid): key for kid, key in self._keys.items()
+        }
+        self._own_header = self._header(self.key_id)
+
+    def _header(self, kid: str) -> bytes:
+        header = {"alg": self.algorithm, "kid": kid, "typ": "JWT"}
+        return b64url_encode(json_encode(header).encode("utf-8"))
+
+    def encode(self, claims: Dict) -> str:
+        payload = b64url_encode(encode_claims(claims).encode("ascii"))
+        signing_input = self._own_header + b"." + payload
+        signature = sign(self._private_key, self.algorithm, signing_input)
+        return (signing_input + b"." + b64url_encode(signature)).decode("ascii")
+
+    def decode(self, token: str) -> Dict:
+        """
+        Claims of a token with a valid signature that is not expired.
+
+        Raises ExpiredTokenError or InvalidTokenError.
+        """
+        signing_input, header, payload, signature = split_token(token)
+        key = self._headers.get(header)
+        if key is None:
+            fields = decode_segment(header)
+            kid = fields.get("kid")
+            key = self._keys.get(kid) if isinstance(kid, str) else None
+            if key is None or fields.get("alg") != self.algorithm:
+                raise InvalidTokenError("Invalid token")
+        if not verify(key, self.algorithm, decode_signature(signature), signing_input):
+            raise InvalidTokenError("Invalid token")
+        return check_times(decode_segment(payload), self.clock(), self.leeway)
+
+    def jwks(self) -> Dict[str, List[Dict[str, str]]]:
+        """The public keys as a JWK Set, the signing key first."""
+        return {"keys": [dict(jwk) for jwk in self._jwks]}
@@ -1,34 +1,93 @@
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
+from app_shared.jwt_codec import HMAC_ALGORITHMS, ExpiredTokenError, HMACJWTCodec
 from jose import jwt
 
 from ...application.ports.token_generator import TokenGenerator
+from .jwt_keys import (
+    ASYMMETRIC_ALGORITHMS,
+    AsymmetricJWTCodec,
+    load_private_key,
+    load_public_key,
+)
+
+
+def new_token_id() -> str:
+    return secrets.token_urlsafe(16)
 
 
 class JWTTokenGenerator(TokenGenerator):
     """
     JWT implementation of the TokenGenerator interface.
+
+    HMAC algorithms use the prepared HMACJWTCodec, EdDSA and ES256 the
+    AsymmetricJWTCodec with private_key (PEM); any other algorithm goes
+    through python-jose. published_keys are PEM public keys accepted and
+    published next to the signing key, for key rotation.
     """
 
     def __init__(
-        self, secret_key: str, algorithm: str = "HS256", expire_minutes: int = 1440
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        expire_minutes: int = 1440,
+        private_key: Optional[bytes] = None,
+        published_keys: Sequence[bytes] = (),
     ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.expire_minutes = expire_minutes
+        if algorithm in HMAC_ALGORITHMS:
+            self.codec = HMACJWTCodec(secret_key, algorithm)
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            if private_key is None:
+                raise ValueError(f"{algorithm} needs a private key")
+            self.codec = AsymmetricJWTCodec(
+                load_private_key(private_key, algorithm),
+                algorithm,
+                [load_public_key(pem, algorithm) for pem in published_keys],
+            )
+        else:
+            self.codec = None
+
+    def create_access_token(
+        self, user_id: int, email: str, jti: Optional[str] = None
+    ) -> str:
+        jti = jti or new_token_id()
+        if self.codec is not None:
+            now = int(time.time())
+            return self.codec.encode(
+                {
+                    "sub": str(user_id),  # JWT standard uses string for subject
+                    "email": email,
+                    "exp": now + self.expire_minutes * 60,
+                    "iat": now,
+                    "jti": jti,  # what revocation refers to
+                }
+            )
 
-    def create_access_token(self, user_id: int, email: str) -> str:
         payload = {
             "sub": str(user_id),  # JWT standard uses string for subject
             "email": email,
             "exp": datetime.now(timezone.utc) + timedelta(minutes=self.expire_minutes),
             "iat": datetime.now(timezone.utc),
+            "jti": jti,
         }
 
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
 
     def verify_token(self, token: str) -> Optional[Dict]:
+        if self.codec is not None:
+            try:
+                return self.codec.decode(token)
+            except ExpiredTokenError:
+                raise ValueError("Token has expired")
+            except ValueError:
+                raise ValueError("Invalid token")
+
         try:
             return jwt.decode(
                 token,
@@ -37,5 +96,10 @@ class JWTTokenGenerator(TokenGenerator):
             )
         except jwt.ExpiredSignatureError:
             raise ValueError("Token has expired")
-        except jwt.InvalidTokenError:
+        except jwt.JWTError:
             raise ValueError("Invalid token")
+
+    def jwks(self) -> Dict[str, List[Dict[str, str]]]:
+        if isinstance(self.codec, AsymmetricJWTCodec):
+            return self.codec.jwks()
+        return {"keys": []}
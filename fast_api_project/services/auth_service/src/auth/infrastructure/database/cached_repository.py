@@ -0,0 +1,242 @@
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+from auth.domain.entities import User
+from auth.domain.repositories.user_repository import (
+    BulkCreateResult,
+    IUserRepository,
+)
+
+
+class _Entry:
+    __slots__ = ("user", "expires_at")
+
+    def __init__(self, user: Optional[User], expires_at: float):
+        self.user = user  # None caches "no such user"
+        self.expires_at = expires_at
+
+
+class _LoadCancelled(Exception):
+    """The caller running a shared load was cancelled; waiters load again."""
+
+
+class UserCache:
+    """
+    Process-wide LRU/TTL cache of users, keyed by id and by email.
+
+    Users found are kept for `ttl` seconds, lookups that found nobody for
+    `negative_ttl`. Both keys of a user share one entry and are dropped
+    together. Concurrent misses for the same key share one load; if the
+    caller running it is cancelled, the others load again.
+    Invalidation is local to the process, so with several workers a change
+    made elsewhere shows up once the entry expires.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 30.0,
+        negative_ttl: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0  # bumped by every invalidation
+
+        self.hits = 0
+        self.negative_hits = 0  # hits on a cached "no such user"
+        self.misses = 0
+        self.collapsed = 0  # misses that waited for another caller's load
+        self.evictions = 0
+
+    async def get(
+        self, key: Hashable, load: Callable[[], Awaitable[Optional[User]]]
+    ) -> Optional[User]:
+        """
+        The user under key, from cache or through load().
+
+        Returns a copy, so callers can modify it without touching the cache.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > self.clock():
+                self._entries.move_to_end(key)
+                if entry.user is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return copy.copy(entry.user)
+            self._drop(key)
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.collapsed += 1
+            try:
+                return copy.copy(await asyncio.shield(pending))
+            except _LoadCancelled:
+                return await self.get(key, load)
+
+        self.misses += 1
+        generation = self._generation
+        pending = self._loading[key] = asyncio.get_running_loop().create_future()
+        try:
+            user = await load()
+        except BaseException as e:
+            # a cancelled load fails only its own caller; the load runs on
+            # that caller's session, so the waiters retry with their own
+            if isinstance(e, asyncio.CancelledError):
+                e = _LoadCancelled()
+            pending.set_exception(e)
+            pending.exception()  # retrieved, even if nobody was waiting
+            raise
+        else:
+            if generation == self._generation:  # not invalidated while loading
+                self.put(key, user)
+            pending.set_result(user)
+        finally:
+            del self._loading[key]
+        return copy.copy(user)
+
+    async def get_many(
+        self,
+        keys: Sequence[Hashable],
+        load: Callable[[List[Hashable]], Awaitable[Dict[Hashable, User]]],
+    ) -> Dict[Hashable, Optional[User]]:
+        """
+        The users under keys, cached ones from cache and the rest with one
+        load(missing_keys) call, which leaves out keys with no user.
+        """
+        found: Dict[Hashable, Optional[User]] = {}
+        missing = []
+        now = self.clock()
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                if entry.user is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                found[key] = copy.copy(entry.user)
+            else:
+                if entry is not None:
+                    self._drop(key)
+                missing.append(key)
+        if missing:
+            self.misses += len(missing)
+            generation = self._generation
+            loaded = await load(missing)
+            for key in missing:
+                user = loaded.get(key)
+                if generation == self._generation:
+                    self.put(key, user)
+                found[key] = copy.copy(user)
+        return found
+
+    def put(self, key: Hashable, user: Optional[User]) -> None:
+        if user is None:
+            self._insert(key, _Entry(None, self.clock() + self.negative_ttl))
+            return
+        entry = _Entry(copy.copy(user), self.clock() + self.ttl)
+        self._drop(("id", user.id))  # no stale twin under the other key
+        self._drop(("email", user.email))
+        self._insert(("id", user.id), entry)
+        self._insert(("email", user.email), entry)
+
+    def invalidate(self, user_id: Optional[int] = None, email: Optional[str] = None):
+        """
+        Forget a user under both keys, given either of them.
+        """
+        self._generation += 1
+        for key in (("id", user_id), ("email", email)):
+            if key[1] is not None:
+                self._drop(key)
+
+    def _insert(self, key: Hashable, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.user is not None:
+            for twin in (("id", entry.user.id), ("email", entry.user.email)):
+                if self._entries.get(twin) is entry:
+                    del self._entries[twin]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.negative_hits + self.misses + self.collapsed
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "collapsed": self.collapsed,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+
+class CachedUserRepository(IUserRepository):
+    """
+    Read-through caching decorator for another IUserRepository.
+
+    Reads go through the shared UserCache; writes go to the wrapped
+    repository and then invalidate the user's entries.
+    """
+
+    def __init__(self, inner: IUserRepository, cache: UserCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def create(self, user: User) -> User:
+        created = await self.inner.create(user)
+        self.cache.invalidate(created.id, created.email)  # e.g. a negative entry
+        return created
+
+    async def create_many(self, users: Sequence[User]) -> BulkCreateResult:
+        result = await self.inner.create_many(users)
+        for user in result.created:
+            self.cache.invalidate(user.id, user.email)
+        return result
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.cache.get(
+            ("id", user_id), lambda: self.inner.get_by_id(user_id)
+        )
+
+    async def get_many_by_ids(self, user_ids: Sequence[int]) -> Dict[int, User]:
+        async def load(keys):
+            users = await self.inner.get_many_by_ids([user_id for _, user_id in keys])
+            return {("id", user_id): user for user_id, user in users.items()}
+
+        found = await self.cache.get_many(
+            [("id", user_id) for user_id in dict.fromkeys(user_ids)], load
+        )
+        return {key[1]: user for key, user in found.items() if user is not None}
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.cache.get(
+            ("email", email), lambda: self.inner.get_by_email(email)
+        )
+
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        await self.inner.update_password_hash(user_id, hashed_password)
+        self.cache.invalidate(user_id)
+
+    async def set_active(self, user_id: int, is_active: bool) -> None:
+        await self.inner.set_active(user_id, is_active)
+        self.cache.invalidate(user_id)
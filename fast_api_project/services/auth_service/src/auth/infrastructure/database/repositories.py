@@ -1,24 +1,42 @@
-from typing import Optional
+import dataclasses
+from typing import Dict, List, Optional, Sequence
 
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from auth.domain.entities import User
-from auth.domain.repositories.user_repository import IUserRepository
+from auth.domain.exceptions import UserAlreadyExistsError
+from auth.domain.repositories.user_repository import (
+    BulkCreateResult,
+    IUserRepository,
+)
 
+from .routing import ReadRouter
 from .user_model import UserModel
 
 
 class SQLAlchemyUserRepository(IUserRepository):
     """
     SQLAlchemy implementation of the User repository.
+
+    With a ReadRouter, lookups run on a read replica in their own short
+    session; writes, and every lookup after this repository wrote, run on
+    the primary session.
     """
 
+    MAX_IDS_PER_QUERY = 1000  # well under every driver's bind parameter limit
+
     def __init__(
-        self, session: AsyncSession
+        self, session: AsyncSession, reads: Optional[ReadRouter] = None
     ):  # Initialize with an async database session.
         self.session = session
+        self.reads = reads
+        self._wrote = False  # read your own writes from the primary
 
+    @staticmethod
     def to_domain(user_model: UserModel) -> User:
         """
         Convert a UserModel instance to a User entity.
@@ -32,6 +50,7 @@ class SQLAlchemyUserRepository(IUserRepository):
             created_at=user_model.created_at,
         )
 
+    @staticmethod
     def to_model(user: User) -> UserModel:
         """
         Convert a User entity to a UserModel instance.
@@ -46,22 +65,176 @@ class SQLAlchemyUserRepository(IUserRepository):
         )
 
     async def create(self, user: User) -> User:
-        user_model = self.to_model(user)
-        self.session.add(user_model)
+        """
+        Insert a user with one INSERT ... RETURNING and commit.
+
+        A clash with the unique email or username raises
+        UserAlreadyExistsError.
+        """
+        try:
+            result = await self.session.execute(
+                insert(UserModel)
+                .values(
+                    username=user.username,
+                    email=user.email,
+                    hashed_password=user.hashed_password,
+                    is_active=user.is_active,
+                    created_at=user.created_at,
+                )
+                .returning(UserModel.id, UserModel.created_at)
+            )
+            user_id, created_at = result.one()
+            self._written(user_id, user.email)
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            column = self._unique_violation(e)
+            if column is None:
+                raise
+            username = user.username if column == "username" else None
+            raise UserAlreadyExistsError(user.email, username) from e
+        return dataclasses.replace(user, id=user_id, created_at=created_at)
+
+    @staticmethod
+    def _unique_violation(error: IntegrityError) -> Optional[str]:
+        """
+        The users column whose unique constraint an error reports, if any.
+        """
+        message = str(error.orig)
+        for column in ("email", "username"):
+            # SQLite: "UNIQUE constraint failed: users.email",
+            # PostgreSQL: 'violates unique constraint "users_email_key"'
+            if f"users.{column}" in message or f"users_{column}_key" in message:
+                return column
+        return None
+
+    async def create_many(self, users: Sequence[User]) -> BulkCreateResult:
+        """
+        Insert users with one multi-row INSERT, committed as one transaction.
+
+        Rows clashing with a stored email or username, or with an earlier
+        row of the batch, are skipped by ON CONFLICT DO NOTHING and returned
+        as duplicates; the rest of the batch is still stored. Needs a
+        dialect with ON CONFLICT and RETURNING (SQLite, PostgreSQL).
+        """
+        rows, duplicates = [], []
+        emails, usernames = set(), set()
+        for user in users:
+            if user.email in emails or user.username in usernames:
+                duplicates.append(user)  # would conflict within the statement
+                continue
+            emails.add(user.email)
+            usernames.add(user.username)
+            rows.append(user)
+        if not rows:
+            return BulkCreateResult([], duplicates)
+
+        result = await self.session.execute(
+            self._insert_ignoring_conflicts()
+            .values(
+                [
+                    {
+                        "username": user.username,
+                        "email": user.email,
+                        "hashed_password": user.hashed_password,
+                        "is_active": user.is_active,
+                        "created_at": user.created_at,
+                    }
+                    for user in rows
+                ]
+            )
+            .returning(UserModel.id, UserModel.email)
+        )
+        ids = {email: user_id for user_id, email in result.all()}
+        for email, user_id in ids.items():
+            self._written(user_id, email)
         await self.session.commit()
-        await self.session.refresh(user_model)
-        return self.to_domain(user_model)
+
+        created = []
+        for user in rows:
+            if user.email in ids:
+                created.append(dataclasses.replace(user, id=ids[user.email]))
+            else:
+                duplicates.append(user)
+        return BulkCreateResult(created, duplicates)
+
+    def _insert_ignoring_conflicts(self):
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(UserModel).on_conflict_do_nothing()
+        if dialect == "sqlite":
+            return sqlite.insert(UserModel).on_conflict_do_nothing()
+        raise RuntimeError(
+            f"create_many needs PostgreSQL or SQLite, not the {dialect!r} dialect"
+        )
 
     async def get_by_id(self, user_id: int) -> Optional[User]:
-        result = await self.session.execute(
-            select(UserModel).where(UserModel.id == user_id)
+        return await self._lookup(
+            ("id", user_id), select(UserModel).where(UserModel.id == user_id)
         )
-        user_model = result.scalar_one_or_none()
-        return self.to_domain(user_model) if user_model else None
+
+    async def get_many_by_ids(self, user_ids: Sequence[int]) -> Dict[int, User]:
+        """
+        Users by id with one SELECT ... WHERE id IN (...) per
+        MAX_IDS_PER_QUERY ids.
+        """
+        ids = list(dict.fromkeys(user_ids))
+        users: Dict[int, User] = {}
+        for start in range(0, len(ids), self.MAX_IDS_PER_QUERY):
+            chunk = ids[start : start + self.MAX_IDS_PER_QUERY]
+            models = await self._select(
+                [("id", user_id) for user_id in chunk],
+                select(UserModel).where(UserModel.id.in_(chunk)),
+            )
+            users.update((model.id, self.to_domain(model)) for model in models)
+        return users
 
     async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._lookup(
+            ("email", email), select(UserModel).where(UserModel.email == email)
+        )
+
+    async def _lookup(self, key, statement) -> Optional[User]:
+        models = await self._select([key], statement)
+        return self.to_domain(models[0]) if models else None
+
+    async def _select(self, keys, statement) -> List[UserModel]:
+        """
+        Run a user SELECT on a replica if one is due for all keys, else on
+        the primary. A replica that fails is marked down and the primary
+        used.
+        """
+        replica = None
+        if self.reads is not None and not self._wrote:
+            replica = self.reads.replica_for(*keys)
+        if replica is not None:
+            try:
+                async with replica.sessions() as session:
+                    result = await session.execute(statement)
+                    return list(result.scalars())
+            except (DBAPIError, OSError) as e:
+                self.reads.mark_down(replica, e)
+        result = await self.session.execute(statement)
+        return list(result.scalars())
+
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        await self._update(user_id, hashed_password=hashed_password)
+
+    async def set_active(self, user_id: int, is_active: bool) -> None:
+        await self._update(user_id, is_active=is_active)
+
+    async def _update(self, user_id: int, **values) -> None:
         result = await self.session.execute(
-            select(UserModel).where(UserModel.email == email)
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(**values)
+            .returning(UserModel.email)  # to route its lookups too, no extra trip
         )
-        user_model = result.scalar_one_or_none()
-        return self.to_domain(user_model) if user_model else None
+        for (email,) in result.all():
+            self._written(user_id, email)
+        await self.session.commit()
+
+    def _written(self, user_id: int, email: str) -> None:
+        self._wrote = True
+        if self.reads is not None:
+            self.reads.note_write(("id", user_id), ("email", email))
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    """A read replica engine, its sessions, and whether it is usable."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.sessions = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.down_until = 0.0  # skipped until then after a failure
+        self.reads = 0
+        self.failures = 0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReadRouter:
+    """
+    Sends lookups to read replicas, keeping writes and fresh reads on the
+    primary.
+
+    Replicas are used in turn, skipping any that failed a query or a health
+    check in the last `retry_after` seconds; with none usable, lookups go to
+    the primary. Keys written through this process are read from the
+    primary for `recent_writes_ttl` seconds, longer than replication lag,
+    so a user who just registered or changed can log in at once.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[AsyncEngine],
+        retry_after: float = 5.0,
+        recent_writes_ttl: float = 5.0,
+        max_recent_writes: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.replicas: List[Replica] = [Replica(engine) for engine in replicas]
+        self.retry_after = retry_after
+        self.recent_writes_ttl = recent_writes_ttl
+        self.max_recent_writes = max_recent_writes
+        self.clock = clock
+        self._next = 0
+        # key -> read from the primary until; in expiry order
+        self._recent: Dict[Hashable, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.primary_reads = 0
+        self.fallbacks = 0  # primary reads because no replica was usable
+
+    def note_write(self, *keys: Hashable) -> None:
+        """Read keys from the primary for a while, they just changed."""
+        now = self.clock()
+        recent = self._recent
+        for key in keys:
+            recent.pop(key, None)
+            recent[key] = now + self.recent_writes_ttl
+        # drop expired keys from the front, or the oldest past the cap
+        stale = []
+        for key, until in recent.items():
+            if until > now and len(recent) - len(stale) <= self.max_recent_writes:
+                break
+            stale.append(key)
+        for key in stale:
+            del recent[key]
+
+    def replica_for(self, *keys: Hashable) -> Optional[Replica]:
+        """
+        The replica to read keys from, or None to read from the primary
+        because one of them was written recently.
+        """
+        now = self.clock()
+        for key in keys:
+            until = self._recent.get(key)
+            if until is not None and until > now:
+                self.primary_reads += 1
+                return None
+        replica = self._healthy()
+        if replica is None:
+            self.primary_reads += 1
+            if self.replicas:
+                self.fallbacks += 1
+        return replica
+
+    def _healthy(self) -> Optional[Replica]:
+        now = self.clock()
+        count = len(self.replicas)
+        for i in range(count):
+            replica = self.replicas[(self._next + i) % count]
+            if replica.down_until <= now:
+                self._next = (self._next + i + 1) % count
+                replica.reads += 1
+                return replica
+        return None
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        replica.failures += 1
+        replica.down_until = self.clock() + self.retry_after
+        logger.warning("read replica %s is down: %s", replica.name, error)
+
+    async def check(self) -> None:
+        """Ping every replica, marking the ones that fail as down."""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            except Exception as e:
+                self.mark_down(replica, e)
+            else:
+                replica.down_until = 0.0
+
+    def start(self, interval: float = 5.0) -> None:
+        """Health check the replicas every `interval` seconds."""
+        if self._task is None and self.replicas:
+            self._task = asyncio.create_task(self._check_forever(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _check_forever(self, interval: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "primary_reads": self.primary_reads,
+            "fallbacks": self.fallbacks,
+            "replicas": [
+                {
+                    "url": replica.name,
+                    "up": replica.down_until <= self.clock(),
+                    "reads": replica.reads,
+                    "failures": replica.failures,
+                }
+                for replica in self.replicas
+            ],
+        }
@@ -0,0 +1,193 @@
+from datetime import datetime, timezone
+from typing import Collection, List, Optional, Set
+
+from sqlalchemy import delete, insert, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from auth.domain.entities import RefreshToken
+from auth.domain.repositories.token_repository import ITokenRepository, Revocation
+
+from .token_model import RefreshTokenModel, RevokedTokenModel
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """SQLite hands timestamps back without a zone; they were stored in UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class SQLAlchemyTokenRepository(ITokenRepository):
+    """
+    SQLAlchemy implementation of the refresh token and revocation store.
+
+    Every write is one transaction, committed before returning.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def to_domain(model: RefreshTokenModel) -> RefreshToken:
+        return RefreshToken(
+            id=model.id,
+            user_id=model.user_id,
+            family_id=model.family_id,
+            token_hash=model.token_hash,
+            access_jti=model.access_jti,
+            access_expires_at=_utc(model.access_expires_at),
+            expires_at=_utc(model.expires_at),
+            created_at=_utc(model.created_at),
+            used_at=_utc(model.used_at),
+            revoked_at=_utc(model.revoked_at),
+        )
+
+    def _insert(self, token: RefreshToken):
+        return (
+            insert(RefreshTokenModel)
+            .values(
+                user_id=token.user_id,
+                family_id=token.family_id,
+                token_hash=token.token_hash,
+                access_jti=token.access_jti,
+                access_expires_at=token.access_expires_at,
+                expires_at=token.expires_at,
+                created_at=token.created_at,
+            )
+            .returning(RefreshTokenModel.id)
+        )
+
+    async def add(self, token: RefreshToken) -> RefreshToken:
+        token.id = (await self.session.execute(self._insert(token))).scalar_one()
+        await self.session.commit()
+        return token
+
+    async def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
+        result = await self.session.execute(
+            select(RefreshTokenModel).where(RefreshTokenModel.token_hash == token_hash)
+        )
+        model = result.scalar_one_or_none()
+        return self.to_domain(model) if model else None
+
+    async def rotate(self, used: RefreshToken, token: RefreshToken) -> bool:
+        # the conditional UPDATE decides a race between two uses of one token
+        result = await self.session.execute(
+            update(RefreshTokenModel)
+            .where(
+                RefreshTokenModel.id == used.id,
+                RefreshTokenModel.used_at.is_(None),
+                RefreshTokenModel.revoked_at.is_(None),
+            )
+            .values(used_at=token.created_at)
+            .returning(RefreshTokenModel.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await self.session.rollback()
+            return False
+        token.id = (await self.session.execute(self._insert(token))).scalar_one()
+        await self.session.commit()
+        used.used_at = token.created_at
+        return True
+
+    async def revoke_sessions(
+        self, family_id: Optional[str] = None, user_id: Optional[int] = None
+    ) -> int:
+        if family_id is None and user_id is None:
+            raise ValueError("Give a family_id or a user_id")
+        now = datetime.now(timezone.utc)
+        condition = (
+            RefreshTokenModel.family_id == family_id
+            if family_id is not None
+            else RefreshTokenModel.user_id == user_id
+        )
+        # the live token of each session holds its current access token
+        result = await self.session.execute(
+            update(RefreshTokenModel)
+            .where(
+                condition,
+                RefreshTokenModel.used_at.is_(None),
+                RefreshTokenModel.revoked_at.is_(None),
+            )
+            .values(revoked_at=now)
+            .returning(
+                RefreshTokenModel.access_jti, RefreshTokenModel.access_expires_at
+            )
+        )
+        sessions = result.all()
+        access_tokens = [
+            {"jti": jti, "expires_at": expires_at}
+            for jti, expires_at in sessions
+            if _utc(expires_at) > now
+        ]
+        await self.session.execute(
+            update(RefreshTokenModel)
+            .where(condition, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        if access_tokens:
+            await self.session.execute(self._revoke(access_tokens))
+        await self.session.commit()
+        return len(sessions)
+
+    def _revoke(self, access_tokens: List[dict]):
+        dialect = self.session.bind.dialect.name
+        if dialect == "sqlite":
+            stmt = sqlite.insert(RevokedTokenModel)
+        elif dialect == "postgresql":
+            stmt = postgresql.insert(RevokedTokenModel)
+        else:
+            raise RuntimeError(
+                f"Revocation needs PostgreSQL or SQLite, not the {dialect!r} dialect"
+            )
+        return stmt.on_conflict_do_nothing(index_elements=["jti"]).values(access_tokens)
+
+    async def revoke_access_token(self, jti: str, expires_at: datetime) -> None:
+        await self.session.execute(
+            self._revoke([{"jti": jti, "expires_at": expires_at}])
+        )
+        await self.session.commit()
+
+    async def revoked_among(self, jtis: Collection[str]) -> Set[str]:
+        if not jtis:
+            return set()
+        result = await self.session.execute(
+            select(RevokedTokenModel.jti).where(RevokedTokenModel.jti.in_(list(jtis)))
+        )
+        return set(result.scalars())
+
+    async def revocations_since(self, seq: int, limit: int = 1000) -> List[Revocation]:
+        result = await self.session.execute(
+            select(
+                RevokedTokenModel.id,
+                RevokedTokenModel.jti,
+                RevokedTokenModel.expires_at,
+            )
+            .where(
+                RevokedTokenModel.id > seq,
+                RevokedTokenModel.expires_at > datetime.now(timezone.utc),
+            )
+            .order_by(RevokedTokenModel.id)
+            .limit(limit)
+        )
+        return [
+            Revocation(seq=id_, jti=jti, expires_at=_utc(expires_at))
+            for id_, jti, expires_at in result.all()
+        ]
+
+    async def purge_expired(self, now: datetime) -> int:
+        tokens = await self.session.execute(
+            delete(RefreshTokenModel).where(
+                or_(
+                    RefreshTokenModel.expires_at <= now,
+                    # used tokens stay until they expire, so reuse is caught
+                    RefreshTokenModel.revoked_at <= now,
+                )
+            )
+        )
+        revoked = await self.session.execute(
+            delete(RevokedTokenModel).where(RevokedTokenModel.expires_at <= now)
+        )
+        await self.session.commit()
+        return tokens.rowcount + revoked.rowcount
@@ -1,3 +1,6 @@
 from .rate_limiter import RateLimiterMiddleware
 
+# SharedRateLimiter is POSIX-only (fcntl): import it from .shared_rate_limiter
+# where it is used, so the package loads everywhere
+
 __all__ = ["RateLimiterMiddleware"]
@@ -1,60 +1,396 @@
-import time  # time module for tracking request timestamps
-from collections import (
-    defaultdict,  # for default dictionary to store request timestamps
-)
-
-from fastapi import (  # FastAPI request and exception handling
-    HTTPException,
-    Request,
-    status,
-)
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,  # base class for creating middleware
-)
-
-
-class RateLimiter:  # core logic
-    """In memory rate limiter"""
-
-    def __init__(self, request_per_minute: int):
-        self.request_per_minute = request_per_minute  # max requests per minute
-        self.requests = defaultdict(list)  # store request timestamps
-
-    def is_allowed(self, identifier: str) -> bool:
-        now = time.time()  # current timestamp
-        minute_ago = now - 60  # timestamp one minute ago
-
-        # Remove old requests
-        self.requests[identifier] = [
-            req_time for req_time in self.requests[identifier] if req_time > minute_ago
-        ]
+import asyncio
+import ipaddress
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Sequence, Tuple
+
+
+class RateLimit(NamedTuple):
+    """At most `requests` per `period` seconds."""
+
+    requests: int
+    period: float = 60.0
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int  # requests left right now
+    retry_after: float  # seconds until the next request would be allowed
+    reset_after: float  # seconds until the full limit is available again
+
+
+class _Bucket:
+    __slots__ = ("tokens", "stamp")
+
+    def __init__(self, tokens: float, stamp: float):
+        self.tokens = tokens
+        self.stamp = stamp  # last refill, also the last time the key was seen
+
+
+class _Window:
+    __slots__ = ("index", "current", "previous", "stamp")
+
+    def __init__(self, index: int, stamp: float):
+        self.index = index  # number of the current fixed window
+        self.current = 0  # requests counted in the current window
+        self.previous = 0  # requests counted in the window before it
+        self.stamp = stamp  # last time the key was seen
+
+
+class KeyedRateLimiter(ABC):
+    """
+    Abstract base for rate limiters holding a constant-size slot per key.
+
+    Slots live in a plain dict kept in least recently used order (a key is
+    re-inserted when seen). Reaching max_keys evicts the least recently used
+    1/64th in one pass, and evict_idle() (run periodically once start() is
+    called) drops keys idle for idle_seconds. Keep idle_seconds at least
+    twice the longest period so an evicted key would have been back to a
+    full allowance anyway.
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 100_000,
+        idle_seconds: float = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        self._slots: Dict[Hashable, object] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.evictions = 0
+
+    def check(self, key: Hashable, limit: RateLimit) -> RateLimitResult:
+        """
+        Count one request for key against limit.
+        """
+        now = self.clock()
+        slots = self._slots
+        slot = slots.pop(key, None)
+        if slot is None:
+            if len(slots) >= self.max_keys:
+                self._evict(max(1, self.max_keys // 64))
+            slot = self._new_slot(now, limit)
+        slots[key] = slot  # most recently used last
+        return self._take(slot, now, limit)
 
-        # check if within limit
-        if len(self.requests[identifier]) < self.request_per_minute:
-            self.requests[identifier].append(now)  # log current request
-            return True
-        return False
+    def _evict(self, count: int) -> None:
+        """Drop the `count` least recently used keys."""
+        slots = self._slots
+        for key in [key for key, _ in zip(slots, range(count))]:
+            del slots[key]
+        self.evictions += count
 
+    @abstractmethod
+    def _new_slot(self, now: float, limit: RateLimit):
+        """
+        The state of a key seen for the first time, with a full allowance.
+        """
+        pass
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):  # middleware class
-    """Rate limit middleware"""
+    @abstractmethod
+    def _take(self, slot, now: float, limit: RateLimit) -> RateLimitResult:
+        """
+        Count one request against a key's slot, updating it in place.
+        """
+        pass
 
-    def __init__(self, app, request_per_minute: int):
-        super().__init__(app)
-        self.rate_limiter = RateLimiter(request_per_minute)  # instantiate rate limiter
+    def evict_idle(self) -> int:
+        """
+        Drop keys not seen for idle_seconds; returns how many were dropped.
+        """
+        cutoff = self.clock() - self.idle_seconds
+        idle = []
+        for key, slot in self._slots.items():
+            if slot.stamp > cutoff:
+                break  # the rest were seen more recently
+            idle.append(key)
+        for key in idle:
+            del self._slots[key]
+        self.evictions += len(idle)
+        return len(idle)
 
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host  # identify client by IP
+    def start(self, interval: float = 10.0) -> None:
+        """Evict idle keys every `interval` seconds in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sweep(interval))
 
-        if not self.rate_limiter.is_allowed(client_ip):
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many requests, please try again later.",
-            )
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
 
-        response = await call_next(request)  # proceed with request
-        response.headers["X-RateLimit-Limit"] = str(
-            self.rate_limiter.request_per_minute
+    async def _sweep(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class TokenBucketLimiter(KeyedRateLimiter):
+    """
+    Token bucket: bursts of up to `requests`, refilled evenly over `period`.
+
+    State per key is two floats (tokens, last refill).
+    """
+
+    def _new_slot(self, now: float, limit: RateLimit) -> _Bucket:
+        return _Bucket(float(limit.requests), now)
+
+    def _take(self, slot: _Bucket, now: float, limit: RateLimit) -> RateLimitResult:
+        rate = limit.requests / limit.period  # tokens per second
+        tokens = min(float(limit.requests), slot.tokens + (now - slot.stamp) * rate)
+        slot.stamp = now
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        slot.tokens = tokens
+        return RateLimitResult(
+            allowed,
+            limit.requests,
+            int(tokens),
+            0.0 if tokens >= 1 else (1 - tokens) / rate,  # retry_after
+            (limit.requests - tokens) / rate,  # reset_after
         )
 
-        return response
+
+class SlidingWindowLimiter(KeyedRateLimiter):
+    """
+    Sliding window counter: counts per fixed window, with the previous
+    window weighted by how much of it still overlaps the sliding one.
+
+    Approximates a true sliding log with three integers per key.
+    """
+
+    def _new_slot(self, now: float, limit: RateLimit) -> _Window:
+        return _Window(int(now // limit.period), now)
+
+    def _take(self, slot: _Window, now: float, limit: RateLimit) -> RateLimitResult:
+        period = limit.period
+        index = int(now // period)
+        if index != slot.index:
+            # the current window became the previous one, or both expired
+            slot.previous = slot.current if index == slot.index + 1 else 0
+            slot.current = 0
+            slot.index = index
+        slot.stamp = now
+
+        into_window = now - index * period
+        weight = 1 - into_window / period  # share of the previous window still in
+        estimate = slot.previous * weight + slot.current
+
+        allowed = estimate + 1 <= limit.requests
+        if allowed:
+            slot.current += 1
+            estimate += 1
+
+        remaining = max(0, math.floor(limit.requests - estimate))
+        window_left = period - into_window
+        if remaining:
+            retry_after = 0.0
+        elif slot.current < limit.requests:
+            # wait until enough of the previous window has slid out
+            needed = (estimate + 1 - limit.requests) / slot.previous * period
+            retry_after = min(needed, window_left)
+        else:
+            # the current window alone is full: wait into the next one
+            next_window = 1 - (limit.requests - 1) / slot.current
+            retry_after = window_left + next_window * period
+        reset_after = window_left + (period if slot.current else 0)
+        return RateLimitResult(
+            allowed, limit.requests, remaining, retry_after, reset_after
+        )
+
+
+RATE_LIMITERS = {
+    "token_bucket": TokenBucketLimiter,
+    "sliding_window": SlidingWindowLimiter,
+}
+
+
+class RouteLimits:
+    """
+    Per-route limits by path prefix, longest prefix first, with a default.
+    """
+
+    def __init__(
+        self, default: RateLimit, routes: Optional[Dict[str, RateLimit]] = None
+    ):
+        self.default = default
+        self.routes = sorted(
+            (routes or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    def for_path(self, path: str) -> Tuple[str, RateLimit]:
+        """
+        (route prefix, limit) for a request path; "" is the default route.
+        """
+        for prefix, limit in self.routes:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return prefix, limit
+        return "", self.default
+
+
+# never limited
+EXEMPT_PATHS = ("/health",)
+
+# endpoints the gateway polls: limiting its own polls stalls revocations and
+# key rotation for everyone, but clients reaching them through it are limited
+PROXY_EXEMPT_PATHS = ("/auth/revocations", "/.well-known/jwks.json")
+
+
+class TrustedProxies:
+    """
+    Addresses (or networks) of proxies whose X-Forwarded-For is believed.
+    """
+
+    def __init__(self, proxies: Sequence[str] = ()):
+        self.networks = [ipaddress.ip_network(p, strict=False) for p in proxies]
+        self._known: Dict[str, bool] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.networks)
+
+    def __contains__(self, host: str) -> bool:
+        trusted = self._known.get(host)
+        if trusted is None:
+            try:
+                address = ipaddress.ip_address(host)
+            except ValueError:
+                trusted = False
+            else:
+                trusted = any(address in network for network in self.networks)
+            if len(self._known) < 1024:  # peers are few: the proxies
+                self._known[host] = trusted
+        return trusted
+
+
+def forwarded_for(headers) -> Optional[str]:
+    """
+    The address the nearest proxy saw, i.e. the last X-Forwarded-For entry;
+    earlier entries come from the client and can be anything.
+    """
+    value = None
+    for key, raw in headers:
+        if key == b"x-forwarded-for":
+            value = raw
+    if value is None:
+        return None
+    last = value.decode("latin-1").rsplit(",", 1)[-1].strip()
+    return last or None
+
+
+class RateLimiterMiddleware:  # raw ASGI middleware
+    """
+    Rate limit middleware, per client IP and route.
+
+    Requests from a trusted proxy (the gateway) are counted against the
+    client address it forwards, not against the proxy's own. The proxy's
+    own requests, which forward no client, to proxy_exempt_paths are not
+    limited.
+
+    Works on the raw ASGI scope: rejected requests get a 429 with
+    Retry-After and X-RateLimit-* headers without the app (or any Request
+    object) being involved, and allowed ones get the X-RateLimit-* headers
+    added to their response start message. The limiter's idle-key sweeper
+    runs for the lifetime of the app.
+    """
+
+    REJECT_BODY = b'{"detail":"Too many requests, please try again later."}'
+
+    def __init__(
+        self,
+        app,
+        request_per_minute: int,
+        algorithm: str = "sliding_window",
+        routes: Optional[Dict[str, int]] = None,  # path prefix -> per minute
+        max_keys: int = 100_000,
+        idle_seconds: float = 120.0,
+        exempt_paths: Tuple[str, ...] = EXEMPT_PATHS,
+        proxy_exempt_paths: Tuple[str, ...] = PROXY_EXEMPT_PATHS,
+        limiter: Optional[KeyedRateLimiter] = None,
+        trusted_proxies: Sequence[str] = (),
+    ):
+        self.app = app
+        self.rate_limiter = limiter or RATE_LIMITERS[algorithm](
+            max_keys=max_keys, idle_seconds=idle_seconds
+        )
+        self.routes = RouteLimits(
+            RateLimit(request_per_minute),
+            {prefix: RateLimit(n) for prefix, n in (routes or {}).items()},
+        )
+        self.exempt_paths = exempt_paths
+        self.proxy_exempt_paths = proxy_exempt_paths
+        self.trusted_proxies = TrustedProxies(trusted_proxies)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.app(scope, receive, self._lifespan_send(send))
+            return
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"  # identify client by IP
+        if self.trusted_proxies and client_ip in self.trusted_proxies:
+            forwarded = forwarded_for(scope["headers"])
+            if forwarded is None and scope["path"] in self.proxy_exempt_paths:
+                await self.app(scope, receive, send)
+                return
+            client_ip = forwarded or client_ip
+        route, limit = self.routes.for_path(scope["path"])
+        result = self.rate_limiter.check((route, client_ip), limit)
+
+        headers = [
+            (b"x-ratelimit-limit", str(result.limit).encode()),
+            (b"x-ratelimit-remaining", str(result.remaining).encode()),
+            (b"x-ratelimit-reset", str(math.ceil(result.reset_after)).encode()),
+        ]
+        if not result.allowed:
+            await self._reject(send, result, headers)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _reject(self, send, result: RateLimitResult, headers) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(self.REJECT_BODY)).encode()),
+                    (b"retry-after", str(math.ceil(result.retry_after)).encode()),
+                    *headers,
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": self.REJECT_BODY})
+
+    def _lifespan_send(self, send):
+        async def lifespan_send(message):
+            if message["type"] == "lifespan.startup.complete":
+                self.rate_limiter.start()
+            elif message["type"] == "lifespan.shutdown.complete":
+                await self.rate_limiter.stop()
+            await send(message)
+
+        return lifespan_send
@@ -0,0 +1,148 @@
+import fcntl  # byte-range locks shared by every process on the host
+import hashlib
+import mmap
+import os
+import struct
+import time
+from typing import Callable, Hashable
+
+from .rate_limiter import RateLimit, RateLimitResult, SlidingWindowLimiter, _Window
+
+MAGIC = b"AUTHRL01"
+HEADER = struct.Struct("<8sQ")  # magic, number of buckets
+HEADER_SIZE = 64
+# key hash, window index, current count, previous count, last seen
+SLOT = struct.Struct("<QqIId")
+SLOTS_PER_BUCKET = 8
+BUCKET_SIZE = SLOT.size * SLOTS_PER_BUCKET
+
+
+def key_hash(key: Hashable) -> int:
+    """
+    Stable 64-bit hash of a key (hash() is salted per process). Never 0,
+    which marks an empty slot.
+    """
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class SharedRateLimiter(SlidingWindowLimiter):
+    """
+    Sliding window counter limiter whose state lives in a memory-mapped file,
+    so every worker process on the host enforces one shared limit.
+
+    The file is a fixed array of buckets of 8 slots; a key hashes to one
+    bucket and takes a free slot in it, or the slot seen least recently when
+    the bucket is full. Each check holds an fcntl lock on just its bucket,
+    so workers only contend when their keys share a bucket. Memory is fixed
+    at creation: slots x 32 bytes.
+
+    Locks are per process: share an instance between coroutines, not
+    threads.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        slots: int = 262_144,
+        clock: Callable[[], float] = time.time,  # the same in every process
+    ):
+        super().__init__(max_keys=slots, clock=clock)
+        self.path = path
+        self.buckets = max(1, slots // SLOTS_PER_BUCKET)
+        size = HEADER_SIZE + self.buckets * BUCKET_SIZE
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+            try:
+                self._init_file(size)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+            self._map = mmap.mmap(self._fd, size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _init_file(self, size: int) -> None:
+        """Create the table, or check an existing one has the same layout."""
+        if os.fstat(self._fd).st_size == 0:
+            os.ftruncate(self._fd, size)  # zero filled: every slot empty
+            os.pwrite(self._fd, HEADER.pack(MAGIC, self.buckets), 0)
+            return
+        magic, buckets = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+        if magic != MAGIC or buckets != self.buckets:
+            raise ValueError(
+                f"{self.path} holds a different rate limit table "
+                f"({buckets} buckets, expected {self.buckets})"
+            )
+
+    def check(self, key: Hashable, limit: RateLimit) -> RateLimitResult:
+        """
+        Count one request for key against limit, across all processes.
+        """
+        hashed = key_hash(key)
+        start = HEADER_SIZE + (hashed % self.buckets) * BUCKET_SIZE
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, BUCKET_SIZE, start)
+        try:
+            now = self.clock()
+            offset, found = self._find(hashed, start)
+            slot = _Window(int(now // limit.period), now)
+            if found is not None:
+                _, slot.index, slot.current, slot.previous, slot.stamp = found
+            result = self._take(slot, now, limit)
+            SLOT.pack_into(
+                self._map,
+                offset,
+                hashed,
+                slot.index,
+                slot.current,
+                slot.previous,
+                slot.stamp,
+            )
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, BUCKET_SIZE, start)
+        return result
+
+    def _find(self, hashed: int, start: int):
+        """
+        (offset, stored slot) of the key in its bucket, or (offset to use,
+        None) for a new key: a free slot, else the one seen least recently.
+        """
+        free = None
+        oldest, oldest_stamp = start, float("inf")
+        bucket = self._map[start : start + BUCKET_SIZE]
+        for i, stored in enumerate(SLOT.iter_unpack(bucket)):
+            offset = start + i * SLOT.size
+            if stored[0] == hashed:
+                return offset, stored
+            if stored[0] == 0:
+                if free is None:
+                    free = offset
+            elif stored[4] < oldest_stamp:
+                oldest, oldest_stamp = offset, stored[4]
+        if free is not None:
+            return free, None
+        self.evictions += 1
+        return oldest, None
+
+    def evict_idle(self) -> int:
+        return 0  # slots are reused in place, there is nothing to sweep
+
+    def start(self, interval: float = 10.0) -> None:
+        pass
+
+    async def stop(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+            os.close(self._fd)
+
+    def __len__(self) -> int:
+        used = 0
+        for offset in range(HEADER_SIZE, len(self._map), SLOT.size):
+            if SLOT.unpack_from(self._map, offset)[0]:
+                used += 1
+        return used
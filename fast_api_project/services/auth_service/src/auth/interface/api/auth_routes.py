@@ -1,24 +1,124 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+
+from auth.application.ports import (
+    HasherOverloadedError,
+    PasswordHasher,
+    TokenGenerator,
+)
+from auth.application.use_cases.introspect import IntrospectTokens
+from auth.application.use_cases.login import LoginUser
 from auth.application.use_cases.register import RegisterUser
-from auth.config import get_db
-from auth.domain.exceptions import UserAlreadyExistsError
-from auth.infrastructure.adapters import BcryptHasher
-from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.application.use_cases.sessions import Logout, RefreshSession, TokenIssuer
+from auth.config import AsyncSessionLocal, get_settings
+from auth.domain.exceptions import (
+    InvalidCredentialsError,
+    InvalidRefreshTokenError,
+    UserAlreadyExistsError,
+)
+from auth.domain.repositories.token_repository import ITokenRepository
+from auth.domain.repositories.user_repository import IUserRepository
+from auth.interface.api.schemas.introspect import (
+    IntrospectRequest,
+    IntrospectResponse,
+    TokenIntrospection,
+)
+from auth.interface.api.schemas.login_request import LoginRequest
+from auth.interface.api.schemas.logout_request import LogoutRequest
+from auth.interface.api.schemas.refresh_request import RefreshRequest
 from auth.interface.api.schemas.register_request import RegisterRequest
+from auth.interface.api.schemas.token_response import TokenResponse
 from auth.interface.api.schemas.user_response import UserResponse
+from auth.interface.api.v1.dependencies import (
+    build_user_repository,
+    get_password_hasher,
+    get_token_generator,
+    get_token_issuer,
+    get_token_repository,
+    get_user_repository,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-def get_register_use_case(db: AsyncSession = Depends(get_db)) -> RegisterUser:
+def get_register_use_case(
+    user_repo: IUserRepository = Depends(get_user_repository),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+) -> RegisterUser:
     """Dependency to get the RegisterUser use case."""
-    user_repo = SQLAlchemyUserRepository(db)
-    hasher = BcryptHasher(cost=12)
     return RegisterUser(user_repo, hasher)
 
 
+async def rehash_password(hasher: PasswordHasher, user_id: int, password: str):
+    """
+    Store a fresh hash of a password, in its own session after the response.
+    """
+    try:
+        hashed = await hasher.hash_async(password)
+    except HasherOverloadedError:
+        return  # retried on the user's next login
+    async with AsyncSessionLocal() as session:
+        await build_user_repository(session).update_password_hash(user_id, hashed)
+
+
+def get_login_use_case(
+    background_tasks: BackgroundTasks,
+    user_repo: IUserRepository = Depends(get_user_repository),
+    hasher: PasswordHasher = Depends(get_password_hasher),
+    token_gen: TokenGenerator = Depends(get_token_generator),
+    issuer: TokenIssuer = Depends(get_token_issuer),
+) -> LoginUser:
+    """Dependency to get the LoginUser use case."""
+
+    def schedule_rehash(user_id: int, password: str) -> None:
+        background_tasks.add_task(rehash_password, hasher, user_id, password)
+
+    return LoginUser(user_repo, hasher, token_gen, schedule_rehash, issuer)
+
+
+def get_refresh_use_case(
+    user_repo: IUserRepository = Depends(get_user_repository),
+    token_repo: ITokenRepository = Depends(get_token_repository),
+    issuer: TokenIssuer = Depends(get_token_issuer),
+) -> RefreshSession:
+    """Dependency to get the RefreshSession use case."""
+    return RefreshSession(user_repo, token_repo, issuer)
+
+
+def get_logout_use_case(
+    token_repo: ITokenRepository = Depends(get_token_repository),
+) -> Logout:
+    """Dependency to get the Logout use case."""
+    return Logout(token_repo)
+
+
+def get_introspect_use_case(
+    user_repo: IUserRepository = Depends(get_user_repository),
+    token_gen: TokenGenerator = Depends(get_token_generator),
+    token_repo: ITokenRepository = Depends(get_token_repository),
+) -> IntrospectTokens:
+    """Dependency to get the IntrospectTokens use case."""
+    return IntrospectTokens(user_repo, token_gen, token_repo)
+
+
+def invalid_refresh_token(e: InvalidRefreshTokenError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=str(e),
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
@@ -45,3 +145,146 @@ async def register(
 
     except UserAlreadyExistsError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    except HasherOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+@router.post("/login", response_model=TokenResponse)
+async def login(
+    request: LoginRequest, use_case: LoginUser = Depends(get_login_use_case)
+):
+    """
+    Log a user in and return an access token and a refresh token.
+    """
+    try:
+        tokens = await use_case.execute(
+            email=request.email.value, password=request.password
+        )
+        return TokenResponse(
+            access_token=tokens.access_token,
+            refresh_token=tokens.refresh_token,
+            expires_in=tokens.expires_in,
+        )
+
+    except InvalidCredentialsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    except HasherOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(
+    request: RefreshRequest,
+    use_case: RefreshSession = Depends(get_refresh_use_case),
+):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    """
+    try:
+        tokens = await use_case.execute(request.refresh_token)
+    except InvalidRefreshTokenError as e:
+        raise invalid_refresh_token(e)
+    return TokenResponse(
+        access_token=tokens.access_token,
+        refresh_token=tokens.refresh_token,
+        expires_in=tokens.expires_in,
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: LogoutRequest,
+    authorization: Optional[str] = Header(None),
+    use_case: Logout = Depends(get_logout_use_case),
+    token_gen: TokenGenerator = Depends(get_token_generator),
+):
+    """
+    End the session of the refresh token and/or bearer access token, or
+    every session of the user with all_sessions.
+    """
+    claims = None
+    if authorization and authorization.startswith("Bearer "):
+        try:
+            claims = token_gen.verify_token(authorization[len("Bearer ") :])
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(e),
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if "jti" not in claims:
+            claims = None  # issued before revocation existed, expires soon
+    try:
+        await use_case.execute(request.refresh_token, claims, request.all_sessions)
+    except InvalidRefreshTokenError as e:
+        raise invalid_refresh_token(e)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/revocations")
+async def revocations(
+    after: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10_000),
+    token_repo: ITokenRepository = Depends(get_token_repository),
+):
+    """
+    Feed of revoked access tokens that have not expired yet, for gateways.
+
+    Entries come in seq order; pass the returned next as after to get only
+    newer ones.
+    """
+    entries = await token_repo.revocations_since(after, limit)
+    return {
+        "revocations": [
+            {"seq": e.seq, "jti": e.jti, "exp": int(e.expires_at.timestamp())}
+            for e in entries
+        ],
+        "next": entries[-1].seq if entries else after,
+    }
+
+
+@router.post("/introspect", response_model=IntrospectResponse)
+async def introspect(
+    request: IntrospectRequest,
+    use_case: IntrospectTokens = Depends(get_introspect_use_case),
+):
+    """
+    Check many access tokens in one call, for services behind the gateway.
+
+    Results come in the order of the tokens, with the user's current state
+    for every token that names an existing user.
+    """
+    max_tokens = get_settings().INTROSPECT_MAX_TOKENS
+    if len(request.tokens) > max_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_tokens} tokens per request",
+        )
+    results = []
+    for result in await use_case.execute(request.tokens):
+        item = TokenIntrospection(active=result.active, error=result.error)
+        if result.claims is not None:
+            item.sub = result.claims.get("sub")
+            item.jti = result.claims.get("jti")
+            item.exp = result.claims.get("exp")
+        if result.user is not None:
+            item.user_id = result.user.id
+            item.username = result.user.username
+            item.email = result.user.email
+            item.is_active = result.user.is_active
+        results.append(item)
+    return IntrospectResponse(results=results)
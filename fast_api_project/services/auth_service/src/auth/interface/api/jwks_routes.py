@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from auth.application.ports import TokenGenerator
+from auth.interface.api.v1.dependencies import get_token_generator
+
+router = APIRouter(tags=["auth"])
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks(
+    response: Response, token_gen: TokenGenerator = Depends(get_token_generator)
+):
+    """
+    The public keys access tokens are signed with, as a JWK Set.
+
+    Not found when tokens are signed with a shared secret.
+    """
+    keys = token_gen.jwks()
+    if not keys["keys"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    # verifiers refresh on their own schedule and on an unknown kid
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return keys
@@ -0,0 +1,22 @@
+from typing import Annotated, Any
+
+from pydantic import PlainValidator, WithJsonSchema
+
+from auth.domain.value_objects import Email
+
+
+def _to_email(value: Any) -> Email:
+    if isinstance(value, Email):
+        return value
+    if not isinstance(value, str):
+        raise ValueError("Email address must be a string")
+    return Email(value)  # ValueError becomes a 422
+
+
+# An email address checked once, by the domain's own rule, as the request is
+# parsed; use cases take the Email as is instead of checking it again.
+EmailAddress = Annotated[
+    Email,
+    PlainValidator(_to_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
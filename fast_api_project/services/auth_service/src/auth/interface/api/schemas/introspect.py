@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class IntrospectRequest(BaseModel):
+    """
+    Request schema for checking access tokens in bulk.
+    """
+
+    tokens: List[str] = Field(min_length=1)
+
+
+class TokenIntrospection(BaseModel):
+    """
+    What one token stands for, in the order the tokens were sent.
+    """
+
+    active: bool
+    error: Optional[str] = None  # expired, invalid, revoked, user_not_found, ...
+    sub: Optional[str] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
+    user_id: Optional[int] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
+class IntrospectResponse(BaseModel):
+    results: List[TokenIntrospection]
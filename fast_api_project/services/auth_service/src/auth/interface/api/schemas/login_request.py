@@ -1,4 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
+
+from .fields import EmailAddress
 
 
 class LoginRequest(BaseModel):
@@ -6,5 +8,5 @@ class LoginRequest(BaseModel):
     Request schema for user login.
     """
 
-    email: EmailStr
+    email: EmailAddress
     password: str
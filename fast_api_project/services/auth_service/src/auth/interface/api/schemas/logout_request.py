@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LogoutRequest(BaseModel):
+    """
+    Request schema for logging out, with the session's refresh token and/or
+    its access token as the bearer token.
+    """
+
+    refresh_token: Optional[str] = None
+    all_sessions: bool = False  # end every session of the user
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class RefreshRequest(BaseModel):
+    """
+    Request schema for exchanging a refresh token.
+    """
+
+    refresh_token: str
@@ -1,5 +1,6 @@
+from pydantic import BaseModel
 
-from pydantic import BaseModel, EmailStr
+from .fields import EmailAddress
 
 
 class RegisterRequest(BaseModel):
@@ -8,5 +9,5 @@ class RegisterRequest(BaseModel):
     """
 
     username: str
-    email: EmailStr
+    email: EmailAddress
     password: str
@@ -1,6 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "Bearer"
+    expires_in: Optional[int] = None  # seconds the access token is valid
+    refresh_token: Optional[str] = None
@@ -0,0 +1,141 @@
+import logging
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.application.ports import PasswordHasher, TokenGenerator
+from auth.application.use_cases.sessions import TokenIssuer
+from auth.config import get_db, get_settings, replica_engines
+from auth.domain.repositories.token_repository import ITokenRepository
+from auth.domain.repositories.user_repository import IUserRepository
+from auth.infrastructure.adapters import (
+    BcryptHasher,
+    HashingPool,
+    JWTTokenGenerator,
+    calibrate_cost,
+)
+from auth.infrastructure.database.cached_repository import (
+    CachedUserRepository,
+    UserCache,
+)
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.infrastructure.database.routing import ReadRouter
+from auth.infrastructure.database.token_repository import SQLAlchemyTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()  # one pool per process, shared by every request
+def get_hashing_pool() -> HashingPool:
+    settings = get_settings()
+    return HashingPool(
+        workers=settings.HASHER_WORKERS,
+        max_queue=settings.HASHER_MAX_QUEUE,
+        kind=settings.HASHER_EXECUTOR,
+        retry_after=settings.HASHER_RETRY_AFTER,
+    )
+
+
+@lru_cache()  # calibrated once per process, at startup
+def get_bcrypt_cost() -> int:
+    """
+    BCRYPT_ROUNDS, or the cost calibrated to BCRYPT_TARGET_MS on this host.
+    """
+    settings = get_settings()
+    if settings.BCRYPT_TARGET_MS is None:
+        return settings.BCRYPT_ROUNDS
+    cost = calibrate_cost(
+        settings.BCRYPT_TARGET_MS / 1000,
+        min_cost=settings.BCRYPT_MIN_ROUNDS,
+        max_cost=settings.BCRYPT_MAX_ROUNDS,
+    )
+    logger.info("bcrypt cost %d calibrated for %.0fms", cost, settings.BCRYPT_TARGET_MS)
+    return cost
+
+
+@lru_cache()  # one cache per process, shared by every request
+def get_user_cache() -> Optional[UserCache]:
+    """The process-wide user cache, or None when USER_CACHE_SIZE is 0."""
+    settings = get_settings()
+    if settings.USER_CACHE_SIZE <= 0:
+        return None
+    return UserCache(
+        max_size=settings.USER_CACHE_SIZE,
+        ttl=settings.USER_CACHE_TTL,
+        negative_ttl=settings.USER_CACHE_NEGATIVE_TTL,
+    )
+
+
+@lru_cache()  # replica health and recent writes are tracked per process
+def get_read_router() -> Optional[ReadRouter]:
+    """The router sending lookups to read replicas, or None without any."""
+    settings = get_settings()
+    if not replica_engines:
+        return None
+    return ReadRouter(
+        replica_engines,
+        retry_after=settings.DB_REPLICA_RETRY_AFTER,
+        recent_writes_ttl=settings.DB_READ_YOUR_WRITES_SECONDS,
+    )
+
+
+def build_user_repository(session: AsyncSession) -> IUserRepository:
+    """
+    A user repository on session, reading from replicas when configured and
+    through the user cache if enabled.
+    """
+    repo = SQLAlchemyUserRepository(session, reads=get_read_router())
+    cache = get_user_cache()
+    return CachedUserRepository(repo, cache) if cache is not None else repo
+
+
+def get_user_repository(db: AsyncSession = Depends(get_db)) -> IUserRepository:
+    """Dependency to get the user repository for the request's session."""
+    return build_user_repository(db)
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Dependency to get the password hasher backed by the hashing pool."""
+    return BcryptHasher(cost=get_bcrypt_cost(), pool=get_hashing_pool())
+
+
+def _read_key(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@lru_cache()  # keys are loaded and parsed once per process
+def get_token_generator() -> TokenGenerator:
+    """Dependency to get the access token generator."""
+    settings = get_settings()
+    return JWTTokenGenerator(
+        secret_key=settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+        expire_minutes=settings.ACCESS_TOKEN_EXPIRES_MIN,
+        private_key=(
+            _read_key(settings.JWT_PRIVATE_KEY_FILE)
+            if settings.JWT_PRIVATE_KEY_FILE
+            else None
+        ),
+        published_keys=[_read_key(path) for path in settings.JWT_PUBLISHED_KEY_FILES],
+    )
+
+
+def get_token_repository(db: AsyncSession = Depends(get_db)) -> ITokenRepository:
+    """Dependency to get the refresh token store for the request's session."""
+    return SQLAlchemyTokenRepository(db)
+
+
+def get_token_issuer(
+    token_repo: ITokenRepository = Depends(get_token_repository),
+    token_gen: TokenGenerator = Depends(get_token_generator),
+) -> TokenIssuer:
+    """Dependency to get the issuer of access and refresh tokens."""
+    return TokenIssuer(
+        token_gen,
+        token_repo,
+        timedelta(days=get_settings().REFRESH_TOKEN_EXPIRES_DAYS),
+    )
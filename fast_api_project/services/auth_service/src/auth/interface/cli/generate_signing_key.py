@@ -0,0 +1,41 @@
+"""
+Create a token signing key.
+
+    python -m auth.interface.cli.generate_signing_key jwt-key.pem --algorithm EdDSA
+
+Writes an unencrypted PKCS#8 PEM private key for JWT_PRIVATE_KEY_FILE and
+prints its kid. To rotate, publish the new key first (JWT_PUBLISHED_KEY_FILES)
+so gateways fetch it, then sign with it and keep the old one published
+until its last tokens have expired.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from auth.infrastructure.adapters.jwt_keys import (
+    ASYMMETRIC_ALGORITHMS,
+    generate_private_key,
+    jwk_thumbprint,
+    private_key_pem,
+    public_jwk,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Create a token signing key.")
+    parser.add_argument("path", help="PEM file to write")
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, default="EdDSA")
+    args = parser.parse_args(argv)
+
+    key = generate_private_key(args.algorithm)
+    fd = os.open(args.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(private_key_pem(key))
+    print(jwk_thumbprint(public_jwk(key.public_key())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
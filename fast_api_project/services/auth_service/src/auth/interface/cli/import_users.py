@@ -0,0 +1,133 @@
+"""
+Bulk import of users from a legacy export.
+
+    python -m auth.interface.cli.import_users users.csv --rejects rejects.csv
+
+Reads CSV (with a header row) or JSON Lines, streaming, with the fields
+username, email and either password or password_hash (a bcrypt hash, kept
+as is). Passwords are hashed on a process pool; rows are stored in
+batches, one transaction each. Progress and throughput go to stderr, and
+every skipped row is listed in the --rejects file.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+from auth.application.use_cases import ImportReport, ImportRow, ImportUsers
+from auth.config import AsyncSessionLocal, engine
+from auth.infrastructure.adapters import BcryptHasher, HashingPool
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.infrastructure.database.user_model import Base
+from auth.interface.api.v1.dependencies import get_bcrypt_cost
+
+
+def _row(line: int, record: dict) -> ImportRow:
+    return ImportRow(
+        line=line,
+        username=record.get("username") or "",
+        email=record.get("email") or "",
+        password=record.get("password") or None,
+        password_hash=record.get("password_hash") or None,
+    )
+
+
+def read_rows(
+    path: str, fmt: Optional[str] = None, errors: Optional[List[Tuple[int, str]]] = None
+) -> Iterator[ImportRow]:
+    """
+    Rows of a CSV or JSONL file, one at a time. The format defaults to the
+    file extension; unreadable lines are added to errors and skipped.
+    """
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+    errors = errors if errors is not None else []
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield _row(reader.line_num, record)
+            return
+        for line, text in enumerate(f, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as e:
+                errors.append((line, f"Invalid JSON: {e}"))
+                continue
+            if not isinstance(record, dict):
+                errors.append((line, "Not a JSON object"))
+                continue
+            yield _row(line, record)
+
+
+def print_progress(report: ImportReport) -> None:
+    print(
+        f"{report.read} rows: {report.created} created, "
+        f"{len(report.duplicates)} duplicates, {len(report.invalid)} invalid, "
+        f"{report.rate:.0f} rows/s",
+        file=sys.stderr,
+    )
+
+
+def write_rejects(path: str, report: ImportReport) -> None:
+    rejects = [(line, "duplicate", email) for line, email in report.duplicates]
+    rejects += [(line, "invalid", reason) for line, reason in report.invalid]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "status", "detail"])
+        writer.writerows(sorted(rejects))
+
+
+async def run(args: argparse.Namespace) -> ImportReport:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    read_errors: List[Tuple[int, str]] = []
+    pool = HashingPool(workers=args.workers, max_queue=0, kind="process")
+    hasher = BcryptHasher(cost=args.cost or get_bcrypt_cost(), pool=pool)
+    try:
+        async with AsyncSessionLocal() as session:
+            use_case = ImportUsers(
+                SQLAlchemyUserRepository(session), hasher, args.batch_size
+            )
+            report = await use_case.execute(
+                read_rows(args.path, args.format, read_errors),
+                on_batch=print_progress,
+            )
+    finally:
+        pool.shutdown()
+        await engine.dispose()
+    report.invalid.extend(read_errors)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import users in bulk.")
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="hashing processes"
+    )
+    parser.add_argument("--cost", type=int, help="bcrypt cost for plain passwords")
+    parser.add_argument("--rejects", help="write skipped rows to this CSV file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.rejects:
+        write_rejects(args.rejects, report)
+    print(
+        f"Imported {report.created} of {report.read} rows in {report.seconds:.1f}s "
+        f"({report.rate:.0f} rows/s): {len(report.duplicates)} duplicates, "
+        f"{len(report.invalid)} invalid"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
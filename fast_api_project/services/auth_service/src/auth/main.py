@@ -1,12 +1,40 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 from fastapi import FastAPI
 
-from .config import engine  # async database engine
+from .config import AsyncSessionLocal, engine, settings  # async database engine
+from .infrastructure.adapters import dummy_hash
+from .infrastructure.database.token_repository import SQLAlchemyTokenRepository
 from .infrastructure.database.user_model import (
     Base,
 )  # async database connection handling
+from .infrastructure.middleware import RateLimiterMiddleware
 from .interface.api.auth_routes import router as auth_router  # auth routes
+from .interface.api.jwks_routes import router as jwks_router
+from .interface.api.v1.dependencies import (
+    get_bcrypt_cost,
+    get_hashing_pool,
+    get_read_router,
+    get_token_generator,
+    get_user_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_expired_tokens(interval: float):
+    """Delete expired refresh tokens and revocations every interval seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as session:
+                repo = SQLAlchemyTokenRepository(session)
+                await repo.purge_expired(datetime.now(timezone.utc))
+        except Exception:
+            logger.exception("purging expired tokens failed")
 
 
 @asynccontextmanager
@@ -17,22 +45,62 @@ async def lifespan(app: FastAPI):
 
     print("🚀 Starting auth service...")
 
+    # pick the bcrypt cost now rather than on the first registration, and
+    # make the hash unknown users are checked against
+    print(f"🔐 bcrypt cost {get_bcrypt_cost()}")
+    dummy_hash(get_bcrypt_cost())
+    # load the signing keys now, so a missing or wrong key stops startup
+    get_token_generator()
+
     # Initialize resources here (e.g., database connections)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
         # You can run startup SQL commands here if needed
         pass
 
+    read_router = get_read_router()
+    if read_router is not None:
+        print(f"📚 reading users from {len(read_router.replicas)} replica(s)")
+        read_router.start(settings.DB_REPLICA_CHECK_INTERVAL)
+    purging = asyncio.create_task(purge_expired_tokens(settings.TOKEN_PURGE_INTERVAL))
+
     yield  # Application runs here
 
     print("👋 Shutting down...")
+    purging.cancel()
+    if read_router is not None:
+        await read_router.stop()
+    get_hashing_pool().shutdown()
     await engine.dispose()
 
 
 app = FastAPI(title="Auth Service", lifespan=lifespan)
 
+# Rate limit state shared by the workers of this host, if configured
+shared_limiter = None
+if settings.RATE_LIMIT_BACKEND == "shared":
+    # POSIX only (fcntl), so imported only when chosen
+    from .infrastructure.middleware.shared_rate_limiter import SharedRateLimiter
+
+    shared_limiter = SharedRateLimiter(
+        settings.RATE_LIMIT_SHARED_FILE, slots=settings.RATE_LIMIT_SHARED_SLOTS
+    )
+
+# Per-client rate limiting, before any routing happens
+app.add_middleware(
+    RateLimiterMiddleware,
+    request_per_minute=settings.REQUESTS_PER_MINUTE,
+    algorithm=settings.RATE_LIMIT_ALGORITHM,
+    routes=settings.RATE_LIMIT_ROUTES,
+    max_keys=settings.RATE_LIMIT_MAX_KEYS,
+    idle_seconds=settings.RATE_LIMIT_IDLE_SECONDS,
+    trusted_proxies=settings.RATE_LIMIT_TRUSTED_PROXIES,
+    limiter=shared_limiter,
+)
+
 # Include routers
 app.include_router(auth_router)
+app.include_router(jwks_router)
 
 
 @app.get("/health")
@@ -40,6 +108,17 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/admin/stats")
+async def admin_stats():
+    """User cache and read replica counters for this worker."""
+    cache = get_user_cache()
+    read_router = get_read_router()
+    return {
+        "user_cache": cache.stats() if cache is not None else None,
+        "read_router": read_router.stats() if read_router is not None else None,
+    }
+
+
 # ============================================================================
 # RUN SERVER: python -m src.auth.main
 # ============================================================================
@@ -0,0 +1,66 @@
+"""
+Benchmark: storing BENCH_IMPORT_ROWS users with legacy hashes through
+create_many in batches, against the per-user create() the registration
+endpoint uses (one INSERT, COMMIT and refresh each), on the test SQLite
+database. No hashing is involved, only the storage path.
+"""
+
+import os
+import time
+
+import pytest
+
+from auth.config import AsyncSessionLocal, engine
+from auth.domain.entities import User
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.infrastructure.database.user_model import Base
+
+ROWS = int(os.environ.get("BENCH_IMPORT_ROWS", "20000"))
+SINGLE_ROWS = 2000  # the one-by-one path is too slow for the full set
+BATCH = 1000
+LEGACY_HASH = "$2b$12$" + "a" * 53
+
+
+def users(prefix: str, count: int):
+    return [
+        User(
+            id=None,
+            username=f"{prefix}{n}",
+            email=f"{prefix}{n}@example.com",
+            hashed_password=LEGACY_HASH,
+        )
+        for n in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batched_import_against_single_inserts():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        async with AsyncSessionLocal() as session:
+            repo = SQLAlchemyUserRepository(session)
+
+            start = time.perf_counter()
+            for user in users("single", SINGLE_ROWS):
+                await repo.create(user)
+            single = (time.perf_counter() - start) / SINGLE_ROWS
+
+            batch = users("batch", ROWS)
+            start = time.perf_counter()
+            created = 0
+            for i in range(0, ROWS, BATCH):
+                created += len((await repo.create_many(batch[i : i + BATCH])).created)
+            batched = (time.perf_counter() - start) / ROWS
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    print(
+        f"\ncreate(): {1 / single:.0f} rows/s, "
+        f"create_many({BATCH}): {1 / batched:.0f} rows/s, "
+        f"{single / batched:.1f}x"
+    )
+    assert created == ROWS
+    assert batched * 5 < single
@@ -0,0 +1,144 @@
+"""
+Microbenchmark: the domain's value objects, a registration request's
+validation and User copies as the user cache makes them, against the
+previous implementations, BENCH_DOMAIN_OPS times each.
+"""
+
+import copy
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel, EmailStr
+
+from auth.domain import Email, Password, User
+from auth.interface.api.schemas.register_request import RegisterRequest
+
+OPS = int(os.environ.get("BENCH_DOMAIN_OPS", "50000"))
+STRONG = "Str0ngP@ssw0rd!"
+WEAK = "weakpassword"
+BODY = {"username": "alice", "email": "alice@example.com", "password": STRONG}
+
+
+@dataclass(frozen=True)
+class OldEmail:
+    value: str
+
+    def __post_init__(self):
+        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+        if not re.match(pattern, self.value):
+            raise ValueError(f"Invalid email address: {self.value}")
+
+
+@dataclass(frozen=True)
+class OldPassword:
+    value: str
+
+    def __post_init__(self):
+        if not self._is_strong(self.value):
+            raise ValueError(f"Weak password: {self._error_message(self.value)}")
+
+    @staticmethod
+    def _is_strong(password: str) -> bool:
+        if len(password) < 8:
+            return False
+        if not re.search(r"[A-Z]", password):
+            return False
+        if not re.search(r"[a-z]", password):
+            return False
+        if not re.search(r"[0-9]", password):
+            return False
+        if not re.search(r"[\W_]", password):
+            return False
+        return True
+
+    @staticmethod
+    def _error_message(password: str) -> str:
+        messages = []
+        if len(password) < 8:
+            messages.append("at least 8 characters")
+        if not re.search(r"[A-Z]", password):
+            messages.append("one uppercase letter")
+        if not re.search(r"[a-z]", password):
+            messages.append("one lowercase letter")
+        if not re.search(r"[0-9]", password):
+            messages.append("one digit")
+        if not re.search(r"[\W_]", password):
+            messages.append("one special character")
+        return "Password must contain: " + ", ".join(messages) + "."
+
+
+@dataclass
+class OldUser:
+    id: Optional[int]
+    username: str
+    email: str
+    hashed_password: str
+    is_active: bool = True
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class OldRegisterRequest(BaseModel):
+    username: str
+    email: EmailStr
+    password: str
+
+
+def old_registration(body: dict) -> None:
+    # EmailStr in the schema, then the use case's Email and Password
+    request = OldRegisterRequest.model_validate(body)
+    OldEmail(request.email)
+    OldPassword(request.password)
+
+
+def registration(body: dict) -> None:
+    request = RegisterRequest.model_validate(body)
+    Password(request.password)  # the Email comes validated
+
+
+def per_op_us(fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(OPS):
+        try:
+            fn(*args)
+        except ValueError:
+            pass
+    return (time.perf_counter() - start) / OPS * 1e6
+
+
+def test_domain_validation_against_previous():
+    user = User(1, "alice", "alice@example.com", "hash")
+    old_user = OldUser(1, "alice", "alice@example.com", "hash")
+
+    results = {
+        "strong password": (
+            per_op_us(Password, STRONG),
+            per_op_us(OldPassword, STRONG),
+        ),
+        "weak password": (per_op_us(Password, WEAK), per_op_us(OldPassword, WEAK)),
+        "email": (
+            per_op_us(Email, "alice@example.com"),
+            per_op_us(OldEmail, "alice@example.com"),
+        ),
+        "registration request": (
+            per_op_us(registration, BODY),
+            per_op_us(old_registration, BODY),
+        ),
+        "user copy": (per_op_us(copy.copy, user), per_op_us(copy.copy, old_user)),
+    }
+    new_size = sys.getsizeof(user)
+    old_size = sys.getsizeof(old_user) + sys.getsizeof(vars(old_user))
+
+    print()
+    for name, (new, old) in results.items():
+        print(f"{name}: {new:.2f} us, previously {old:.2f} us, {old / new:.1f}x")
+    print(f"User instance: {new_size} bytes, previously {old_size} bytes")
+    for name in ("strong password", "weak password", "registration request"):
+        new, old = results[name]
+        assert new < old
+    new, old = results["user copy"]
+    assert new < old / 2
@@ -0,0 +1,90 @@
+"""
+Benchmark: a concurrent register/lookup workload on SQLite with the engine
+as it used to be configured (rollback journal, synchronous=FULL, pre-ping
+on every checkout) against the tuned defaults (WAL, synchronous=NORMAL,
+mmap and a larger page cache, no pre-ping).
+
+BENCH_DB_WORKERS tasks each register BENCH_DB_OPS users, looking up
+LOOKUPS_PER_WRITE existing users after each registration.
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from auth.config import Settings, build_engine
+from auth.domain.entities import User
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.infrastructure.database.user_model import Base
+
+WORKERS = int(os.environ.get("BENCH_DB_WORKERS", "20"))
+OPS = int(os.environ.get("BENCH_DB_OPS", "50"))
+LOOKUPS_PER_WRITE = 4
+
+PROFILES = {
+    "previous": dict(
+        DB_POOL_PRE_PING=True,
+        SQLITE_JOURNAL_MODE="DELETE",
+        SQLITE_SYNCHRONOUS="FULL",
+        SQLITE_MMAP_SIZE=0,
+        SQLITE_CACHE_SIZE=-2000,
+    ),
+    "tuned": {},
+}
+
+
+async def worker(sessions, n: int, latencies: list) -> None:
+    async with sessions() as session:
+        repo = SQLAlchemyUserRepository(session)
+        for i in range(OPS):
+            start = time.perf_counter()
+            await repo.create(
+                User(
+                    id=None,
+                    username=f"w{n}u{i}",
+                    email=f"w{n}u{i}@example.com",
+                    hashed_password="$2b$12$" + "a" * 53,
+                )
+            )
+            for _ in range(LOOKUPS_PER_WRITE):
+                j = random.randrange(i + 1)
+                assert await repo.get_by_email(f"w{n}u{j}@example.com")
+            latencies.append(time.perf_counter() - start)
+
+
+@pytest.mark.asyncio
+async def test_engine_profiles():
+    results = {}
+    for name, overrides in PROFILES.items():
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        settings = Settings(
+            DATABASE_URL=f"sqlite+aiosqlite:///{path}", DB_ECHO=False, **overrides
+        )
+        engine = build_engine(settings)
+        sessions = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        latencies: list = []
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(sessions, n, latencies) for n in range(WORKERS)))
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+
+        ops = WORKERS * OPS * (1 + LOOKUPS_PER_WRITE)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        results[name] = ops / elapsed
+        print(
+            f"\n{name}: {ops / elapsed:.0f} queries/s, "
+            f"register+lookups p50 {1000 * statistics.median(latencies):.1f}ms "
+            f"p95 {1000 * p95:.1f}ms"
+        )
+
+    assert results["tuned"] > results["previous"]
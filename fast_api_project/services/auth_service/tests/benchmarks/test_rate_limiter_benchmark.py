@@ -0,0 +1,63 @@
+"""
+Microbenchmark: one request from each of BENCH_KEYS distinct clients (a
+scan), then repeated requests from a hot set, for the token bucket and
+sliding window limiters of RateLimiterMiddleware.
+"""
+
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from auth.infrastructure.middleware.rate_limiter import (
+    RateLimit,
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+)
+
+KEYS = int(os.environ.get("BENCH_KEYS", "1000000"))
+HOT_KEYS = 1000
+HOT_REQUESTS = 200_000
+LIMIT = RateLimit(requests=int(os.environ.get("BENCH_LIMIT", "600")), period=60)
+
+
+def build(name: str, max_keys: int):
+    cls = TokenBucketLimiter if name == "token_bucket" else SlidingWindowLimiter
+    limiter = cls(max_keys=max_keys)
+    return limiter, lambda key: limiter.check(key, LIMIT).allowed
+
+
+def run(check, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        check(key)
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("name", ["token_bucket", "sliding_window"])
+def test_rate_limiter_with_a_million_keys(name):
+    keys = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(KEYS)]
+    hot = [keys[i % HOT_KEYS] for i in range(HOT_REQUESTS)]
+
+    _, check = build(name, max_keys=KEYS)
+    scan = run(check, keys)
+    repeat = run(check, hot)
+
+    tracemalloc.start()
+    limiter, check = build(name, max_keys=KEYS)
+    run(check, keys)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"\n{name}: scan {1e9 * scan / KEYS:.0f} ns/key, "
+        f"hot {1e9 * repeat / HOT_REQUESTS:.0f} ns/request, "
+        f"{memory / KEYS:.0f} bytes/key"
+    )
+    assert len(limiter) == KEYS
+
+    # capped: the same scan keeps only max_keys slots
+    capped, check = build(name, max_keys=KEYS // 10)
+    run(check, keys)
+    assert KEYS // 10 - KEYS // 640 <= len(capped) <= KEYS // 10
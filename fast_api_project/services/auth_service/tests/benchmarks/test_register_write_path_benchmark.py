@@ -0,0 +1,109 @@
+"""
+Benchmark: round trips and latency of one registration's database writes,
+the old way (SELECT by email, INSERT, COMMIT, refresh SELECT) against the
+single INSERT ... RETURNING of SQLAlchemyUserRepository.create().
+
+Runs on the test SQLite database; on SQLite with BENCH_DB_RTT_MS of delay
+added to every round trip, standing in for a database across the network;
+and on a real PostgreSQL when BENCH_POSTGRES_URL is set
+(e.g. postgresql+asyncpg://postgres@localhost/auth_bench).
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from auth.config import engine as sqlite_engine
+from auth.domain.entities import User
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.infrastructure.database.user_model import Base, UserModel
+
+REGISTRATIONS = int(os.environ.get("BENCH_REGISTRATIONS", "300"))
+RTT = float(os.environ.get("BENCH_DB_RTT_MS", "0.5")) / 1000
+POSTGRES_URL = os.environ.get("BENCH_POSTGRES_URL")
+
+
+async def old_register(session: AsyncSession, user: User) -> None:
+    existing = await session.execute(
+        select(UserModel).where(UserModel.email == user.email)
+    )
+    assert existing.scalar_one_or_none() is None
+    model = SQLAlchemyUserRepository.to_model(user)
+    session.add(model)
+    await session.commit()
+    await session.refresh(model)
+
+
+async def new_register(session: AsyncSession, user: User) -> None:
+    await SQLAlchemyUserRepository(session).create(user)
+
+
+def users(prefix: str):
+    for n in range(REGISTRATIONS):
+        yield User(
+            id=None,
+            username=f"{prefix}{n}",
+            email=f"{prefix}{n}@example.com",
+            hashed_password="$2b$12$" + "a" * 53,
+        )
+
+
+def add_latency(target) -> None:
+    def delay(*args):
+        time.sleep(RTT)
+
+    for name in ("before_cursor_execute", "commit"):
+        event.listen(target.sync_engine, name, delay)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "sqlite+rtt", "postgresql"])
+async def test_register_write_path(backend, count_round_trips):
+    if backend == "postgresql":
+        if not POSTGRES_URL:
+            pytest.skip("set BENCH_POSTGRES_URL to run against PostgreSQL")
+        db = create_async_engine(POSTGRES_URL)
+    elif backend == "sqlite+rtt":
+        db = create_async_engine(sqlite_engine.url)
+        add_latency(db)
+    else:
+        db = sqlite_engine
+    sessions = sessionmaker(db, class_=AsyncSession, expire_on_commit=False)
+
+    async with db.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    results = {}
+    try:
+        for name, register in (("old", old_register), ("new", new_register)):
+            latencies = []
+            async with sessions() as session:
+                with count_round_trips(db) as trips:
+                    for user in users(name):
+                        start = time.perf_counter()
+                        await register(session, user)
+                        latencies.append(time.perf_counter() - start)
+            results[name] = (trips.total / REGISTRATIONS, latencies)
+    finally:
+        async with db.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        if db is not sqlite_engine:
+            await db.dispose()
+
+    print()
+    for name, (trips, latencies) in results.items():
+        print(
+            f"{backend} {name}: {trips:.0f} round trips, "
+            f"p50 {1000 * statistics.median(latencies):.2f}ms, "
+            f"mean {1000 * statistics.mean(latencies):.2f}ms"
+        )
+    assert results["old"][0] == 4
+    assert results["new"][0] == 2
+    if backend != "sqlite":  # with real round trips, fewer is faster
+        old, new = (statistics.median(results[k][1]) for k in ("old", "new"))
+        assert new < old
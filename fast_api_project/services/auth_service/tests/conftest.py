@@ -0,0 +1,65 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# auth.config builds the engine at import time, so point it at a scratch
+# database before any test module imports the app
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'auth_test.db')}",
+)
+os.environ.setdefault("ENV", "test")
+# tests share one app (and its rate limiter) from a single client address
+os.environ.setdefault("REQUESTS_PER_MINUTE", "100000")
+
+
+class RoundTrips:
+    """Statements (by first keyword), commits and rollbacks sent to a DB."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.statements) + self.commits + self.rollbacks
+
+    def on_execute(self, conn, cursor, statement, parameters, context, many):
+        self.statements.append(statement.split(None, 1)[0].upper())
+
+    def on_commit(self, conn):
+        self.commits += 1
+
+    def on_rollback(self, conn):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def count_round_trips():
+    """
+    Context manager factory counting the round trips made on an async engine
+    while it is open.
+    """
+
+    @contextmanager
+    def count(async_engine):
+        trips = RoundTrips()
+        target = async_engine.sync_engine
+        listeners = [
+            ("before_cursor_execute", trips.on_execute),
+            ("commit", trips.on_commit),
+            ("rollback", trips.on_rollback),
+        ]
+        for name, fn in listeners:
+            event.listen(target, name, fn)
+        try:
+            yield trips
+        finally:
+            for name, fn in listeners:
+                event.remove(target, name, fn)
+
+    return count
@@ -0,0 +1,37 @@
+import httpx
+import pytest_asyncio
+
+from auth.config import engine
+from auth.infrastructure.adapters import BcryptHasher
+from auth.infrastructure.database.user_model import Base
+from auth.interface.api.v1.dependencies import get_password_hasher, get_user_cache
+from auth.main import app
+
+
+@pytest_asyncio.fixture
+async def client_factory():
+    """
+    Fresh tables and a factory for in-process clients of the app, hashing
+    with the given cost and pool.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    pools = []
+
+    def make(pool=None, cost=10):
+        if pool is not None:
+            pools.append(pool)
+        app.dependency_overrides[get_password_hasher] = lambda: BcryptHasher(
+            cost=cost, pool=pool
+        )
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+    yield make
+
+    app.dependency_overrides.clear()
+    get_user_cache.cache_clear()  # cached users refer to the dropped tables
+    for pool in pools:
+        pool.shutdown()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
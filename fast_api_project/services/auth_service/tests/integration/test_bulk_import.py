@@ -0,0 +1,124 @@
+import argparse
+import csv
+import json
+
+import pytest
+
+from auth.config import AsyncSessionLocal
+from auth.domain.entities import User
+from auth.infrastructure.adapters.bcrypt_hasher import hash_password, verify_password
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.interface.cli.import_users import read_rows, run, write_rejects
+
+
+def user(n: int, username: str = "") -> User:
+    return User(
+        id=None,
+        username=username or f"user{n}",
+        email=f"user{n}@example.com",
+        hashed_password="hash",
+    )
+
+
+class TestCreateMany:
+    @pytest.mark.asyncio
+    async def test_inserts_batch_and_reports_duplicates(self, client_factory):
+        """
+        Test that one call stores new users and skips clashing ones.
+        """
+        async with AsyncSessionLocal() as session:
+            repo = SQLAlchemyUserRepository(session)
+            await repo.create(user(1))
+
+            result = await repo.create_many(
+                [
+                    user(1),  # email taken
+                    user(2),
+                    user(3, username="user2"),  # username taken in the batch
+                    user(4, username="user1"),  # username taken in the table
+                    user(5),
+                    user(5),  # repeated in the batch
+                ]
+            )
+
+            assert [u.email for u in result.created] == [
+                "user2@example.com",
+                "user5@example.com",
+            ]
+            assert all(u.id for u in result.created)
+            assert len(result.duplicates) == 4
+            stored = await repo.get_by_id(result.created[1].id)
+            assert stored.email == "user5@example.com"
+
+
+class TestImportCli:
+    @pytest.mark.asyncio
+    async def test_imports_csv_and_jsonl(self, client_factory, tmp_path):
+        """
+        Test that the CLI imports both formats, hashing plain passwords and
+        keeping bcrypt hashes, and lists what it skipped.
+        """
+        legacy = hash_password("Legacy!Pass1", 4)
+        csv_path = tmp_path / "users.csv"
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["username", "email", "password", "password_hash"])
+            writer.writerow(["alice", "alice@example.com", "Plain!Pass1", ""])
+            writer.writerow(["bob", "bob@example.com", "", legacy])
+            writer.writerow(["eve", "bad-email", "Plain!Pass1", ""])
+        jsonl_path = tmp_path / "users.jsonl"
+        jsonl_path.write_text(
+            json.dumps(
+                {
+                    "username": "carol",
+                    "email": "carol@example.com",
+                    "password": "Plain!Pass1",
+                }
+            )
+            + "\n"
+            "{not json\n"
+            + json.dumps(
+                {
+                    "username": "alice2",
+                    "email": "alice@example.com",
+                    "password": "Plain!Pass1",
+                }
+            )
+            + "\n"
+        )
+
+        def args(path):
+            return argparse.Namespace(
+                path=str(path), format=None, batch_size=2, workers=1, cost=4
+            )
+
+        first = await run(args(csv_path))
+        second = await run(args(jsonl_path))
+
+        assert (first.read, first.created) == (3, 2)
+        assert first.invalid[0][0] == 4
+        assert (second.read, second.created) == (2, 1)
+        assert second.duplicates == [(3, "alice@example.com")]
+        assert [line for line, _ in second.invalid] == [2]
+
+        async with AsyncSessionLocal() as session:
+            repo = SQLAlchemyUserRepository(session)
+            alice = await repo.get_by_email("alice@example.com")
+            bob = await repo.get_by_email("bob@example.com")
+        assert verify_password("Plain!Pass1", alice.hashed_password)
+        assert bob.hashed_password == legacy
+
+        rejects = tmp_path / "rejects.csv"
+        write_rejects(str(rejects), second)
+        lines = rejects.read_text().splitlines()
+        assert lines[0] == "line,status,detail"
+        assert lines[2].startswith("3,duplicate,")
+
+    def test_read_rows_streams_csv(self, tmp_path):
+        """
+        Test that CSV rows carry their line numbers and blank fields are None.
+        """
+        path = tmp_path / "users.csv"
+        path.write_text("username,email,password\nann,ann@example.com,\n")
+        [row] = list(read_rows(str(path)))
+        assert (row.line, row.username, row.password) == (2, "ann", None)
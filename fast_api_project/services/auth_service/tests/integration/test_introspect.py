@@ -0,0 +1,91 @@
+import pytest
+
+from auth.config import AsyncSessionLocal, engine
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.interface.api.v1.dependencies import get_user_cache
+
+
+def user(n: int) -> dict:
+    return {
+        "username": f"user{n}",
+        "email": f"user{n}@example.com",
+        "password": "Str0ng!Pass",
+    }
+
+
+async def login(client, n: int) -> dict:
+    await client.post("/auth/register", json=user(n))
+    response = await client.post(
+        "/auth/login", json={"email": user(n)["email"], "password": "Str0ng!Pass"}
+    )
+    return response.json()
+
+
+class TestIntrospect:
+    @pytest.mark.asyncio
+    async def test_results_per_token_in_order(self, client_factory):
+        """
+        Test that each token gets its verdict and user state, in order:
+        active, revoked, inactive user, garbage, and a repeat.
+        """
+        async with client_factory(cost=4) as client:
+            active, revoked, inactive = [await login(client, n) for n in range(3)]
+            await client.post(
+                "/auth/logout",
+                json={"refresh_token": revoked["refresh_token"]},
+                headers={"Authorization": f"Bearer {revoked['access_token']}"},
+            )
+            async with AsyncSessionLocal() as session:
+                await SQLAlchemyUserRepository(session).set_active(3, False)
+            get_user_cache().invalidate(3)
+
+            tokens = [t["access_token"] for t in (active, revoked, inactive)]
+            response = await client.post(
+                "/auth/introspect", json={"tokens": tokens + ["garbage", tokens[0]]}
+            )
+
+        results = response.json()["results"]
+        assert response.status_code == 200
+        assert [r["active"] for r in results] == [True, False, False, False, True]
+        assert [r["error"] for r in results] == [
+            None,
+            "revoked",
+            "user_inactive",
+            "invalid",
+            None,
+        ]
+        assert results[0]["username"] == "user0" and results[0]["is_active"]
+        assert results[2]["is_active"] is False
+        assert results[3]["user_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_many_tokens_take_two_queries(
+        self, client_factory, count_round_trips
+    ):
+        """
+        Test that introspecting many tokens loads all users with one query
+        and checks revocations with one more.
+        """
+        async with client_factory(cost=4) as client:
+            tokens = [(await login(client, n))["access_token"] for n in range(20)]
+            for user_id in range(1, 21):  # cached by login
+                get_user_cache().invalidate(user_id)
+            with count_round_trips(engine) as trips:
+                response = await client.post(
+                    "/auth/introspect", json={"tokens": tokens}
+                )
+
+        assert all(r["active"] for r in response.json()["results"])
+        assert trips.statements == ["SELECT", "SELECT"]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_capped(self, client_factory):
+        """
+        Test that more tokens than INTROSPECT_MAX_TOKENS are refused.
+        """
+        async with client_factory() as client:
+            response = await client.post(
+                "/auth/introspect", json={"tokens": ["t"] * 1001}
+            )
+
+        assert response.status_code == 400
@@ -0,0 +1,46 @@
+import pytest
+
+from auth.infrastructure.adapters import JWTTokenGenerator
+from auth.infrastructure.adapters.jwt_keys import generate_private_key, private_key_pem
+from auth.interface.api.v1.dependencies import get_token_generator
+from auth.main import app
+
+USER = {"username": "alice", "email": "alice@example.com", "password": "Str0ng!Pass"}
+
+
+class TestJWKS:
+    @pytest.mark.asyncio
+    async def test_published_key_verifies_login_tokens(self, client_factory):
+        """
+        Test that the JWK Set names the key the login token was signed with.
+        """
+        tokens = JWTTokenGenerator(
+            "unused",
+            "EdDSA",
+            private_key=private_key_pem(generate_private_key("EdDSA")),
+        )
+        app.dependency_overrides[get_token_generator] = lambda: tokens
+        async with client_factory(cost=4) as client:
+            await client.post("/auth/register", json=USER)
+            login = await client.post(
+                "/auth/login",
+                json={"email": USER["email"], "password": USER["password"]},
+            )
+            response = await client.get("/.well-known/jwks.json")
+
+        keys = response.json()["keys"]
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=300"
+        assert [key["kid"] for key in keys] == [tokens.codec.key_id]
+        assert "d" not in keys[0]
+        assert tokens.verify_token(login.json()["access_token"])["sub"]
+
+    @pytest.mark.asyncio
+    async def test_not_found_for_shared_secret(self, client_factory):
+        """
+        Test that nothing is published when tokens are HMAC-signed.
+        """
+        async with client_factory() as client:
+            response = await client.get("/.well-known/jwks.json")
+
+        assert response.status_code == 404
@@ -0,0 +1,83 @@
+import pytest
+
+from auth.config import AsyncSessionLocal
+from auth.infrastructure.adapters import BcryptHasher
+from auth.infrastructure.adapters.bcrypt_hasher import cost_of
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+
+USER = {"username": "alice", "email": "alice@example.com", "password": "Str0ng!Pass"}
+
+
+async def stored_hash(email: str) -> str:
+    async with AsyncSessionLocal() as session:
+        user = await SQLAlchemyUserRepository(session).get_by_email(email)
+        return user.hashed_password
+
+
+class TestLogin:
+    @pytest.mark.asyncio
+    async def test_login_returns_token(self, client_factory):
+        """
+        Test that valid credentials get an access token and bad ones a 401.
+        """
+        async with client_factory(cost=4) as client:
+            await client.post("/auth/register", json=USER)
+            ok = await client.post(
+                "/auth/login",
+                json={"email": USER["email"], "password": USER["password"]},
+            )
+            wrong = await client.post(
+                "/auth/login", json={"email": USER["email"], "password": "Wr0ng!Pass"}
+            )
+
+        assert ok.status_code == 200
+        assert ok.json()["token_type"] == "Bearer"
+        assert ok.json()["access_token"].count(".") == 2
+        assert wrong.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_unknown_email_costs_a_password_check(
+        self, client_factory, monkeypatch
+    ):
+        """
+        Test that a login with an unknown email checks the password against
+        a hash at the current cost, like a login with a known one.
+        """
+        checked = []
+
+        async def verify_async(self, password, hashed):
+            checked.append(cost_of(hashed))
+            return self.verify(password, hashed)
+
+        monkeypatch.setattr(BcryptHasher, "verify_async", verify_async)
+        async with client_factory(cost=4) as client:
+            await client.post("/auth/register", json=USER)
+            unknown = await client.post(
+                "/auth/login",
+                json={"email": "bob@example.com", "password": USER["password"]},
+            )
+            known = await client.post(
+                "/auth/login", json={"email": USER["email"], "password": "Wr0ng!Pass"}
+            )
+
+        assert unknown.status_code == known.status_code == 401
+        assert unknown.json() == known.json()
+        assert checked == [4, 4]
+
+    @pytest.mark.asyncio
+    async def test_outdated_hash_is_upgraded_on_login(self, client_factory):
+        """
+        Test that logging in rehashes a password stored with an old cost.
+        """
+        async with client_factory(cost=4) as client:
+            await client.post("/auth/register", json=USER)
+        assert cost_of(await stored_hash(USER["email"])) == 4
+
+        async with client_factory(cost=5) as client:
+            response = await client.post(
+                "/auth/login",
+                json={"email": USER["email"], "password": USER["password"]},
+            )
+
+        assert response.status_code == 200
+        assert cost_of(await stored_hash(USER["email"])) == 5
@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from auth.infrastructure.middleware import RateLimiterMiddleware
+from auth.main import app as auth_app
+
+
+def limited_client(**options):
+    app = FastAPI()
+    calls = []
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def endpoint(path: str):
+        calls.append(path)
+        return {"path": path}
+
+    app.add_middleware(RateLimiterMiddleware, **options)
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test"), calls
+
+
+class TestRateLimiterMiddleware:
+    @pytest.mark.asyncio
+    async def test_rejects_over_limit_without_calling_the_app(self):
+        """
+        Test that requests over the limit get a 429 and never reach the app.
+        """
+        client, calls = limited_client(request_per_minute=2)
+        async with client:
+            responses = [await client.get("/auth/me") for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert len(calls) == 2
+        rejected = responses[-1]
+        assert rejected.json() == {
+            "detail": "Too many requests, please try again later."
+        }
+        assert int(rejected.headers["retry-after"]) > 0
+        assert rejected.headers["x-ratelimit-remaining"] == "0"
+
+    @pytest.mark.asyncio
+    async def test_adds_headers_on_success(self):
+        """
+        Test that allowed responses carry the X-RateLimit-* headers.
+        """
+        client, _ = limited_client(request_per_minute=5, algorithm="token_bucket")
+        async with client:
+            response = await client.get("/auth/me")
+
+        assert response.status_code == 200
+        assert response.headers["x-ratelimit-limit"] == "5"
+        assert response.headers["x-ratelimit-remaining"] == "4"
+        assert int(response.headers["x-ratelimit-reset"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_route_limits_and_exempt_paths(self):
+        """
+        Test per-route limits and that /health is never limited.
+        """
+        client, _ = limited_client(request_per_minute=100, routes={"/auth/login": 1})
+        async with client:
+            logins = [await client.post("/auth/login") for _ in range(2)]
+            other = await client.get("/auth/me")
+            health = [await client.get("/health") for _ in range(3)]
+
+        assert [r.status_code for r in logins] == [200, 429]
+        assert other.status_code == 200
+        assert all(r.status_code == 200 for r in health)
+        assert "x-ratelimit-limit" not in health[0].headers
+
+    @pytest.mark.asyncio
+    async def test_gateway_polls_are_not_limited(self):
+        """
+        Test that the trusted proxy's own polls of the revocation feed and
+        key set are exempt, while clients reaching them through it or
+        directly are limited.
+        """
+        paths = ["/auth/revocations", "/.well-known/jwks.json"]
+        trusting, _ = limited_client(
+            request_per_minute=1, trusted_proxies=["127.0.0.0/8"]
+        )
+        untrusting, _ = limited_client(request_per_minute=1)
+        forwarded = {"x-forwarded-for": "203.0.113.1"}
+
+        async with trusting:
+            polls = [await trusting.get(path) for path in paths * 3]
+            proxied = [
+                await trusting.get(path, headers=forwarded) for path in paths * 2
+            ]
+        async with untrusting:
+            direct = [await untrusting.get(path) for path in paths * 2]
+
+        assert all(r.status_code == 200 for r in polls)
+        assert [r.status_code for r in proxied] == [200, 429, 429, 429]
+        assert [r.status_code for r in direct] == [200, 429, 429, 429]
+
+    @pytest.mark.asyncio
+    async def test_forwarded_client_from_trusted_proxy(self):
+        """
+        Test that behind a trusted proxy each forwarded client has its own
+        allowance, taken from the last X-Forwarded-For entry, and that the
+        header is ignored from anyone else.
+        """
+        trusting, _ = limited_client(
+            request_per_minute=1, trusted_proxies=["127.0.0.0/8"]
+        )
+        untrusting, _ = limited_client(
+            request_per_minute=1, trusted_proxies=["10.0.0.1"]
+        )
+
+        def via(*chain):
+            return {"x-forwarded-for": ", ".join(chain)}
+
+        async with trusting:
+            first = await trusting.get("/auth/me", headers=via("203.0.113.1"))
+            second = await trusting.get("/auth/me", headers=via("203.0.113.2"))
+            spoofed = await trusting.get(
+                "/auth/me", headers=via("198.51.100.9", "203.0.113.1")
+            )
+        async with untrusting:
+            direct = [
+                await untrusting.get("/auth/me", headers=via(f"203.0.113.{n}"))
+                for n in (1, 2)
+            ]
+
+        assert first.status_code == second.status_code == 200
+        assert spoofed.status_code == 429  # still 203.0.113.1
+        assert [r.status_code for r in direct] == [200, 429]
+
+    def test_registered_on_auth_app(self):
+        """
+        Test that the auth service app is wrapped by the rate limiter.
+        """
+        assert any(m.cls is RateLimiterMiddleware for m in auth_app.user_middleware)
+
+    def test_auth_app_loads_without_fcntl(self):
+        """
+        Test that the app imports on hosts without fcntl (non-POSIX) when
+        the shared backend is not chosen.
+        """
+        code = "import sys; sys.modules['fcntl'] = None; import auth.main"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.config import Settings, build_engine
+from auth.domain.entities import User
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+from auth.infrastructure.database.routing import ReadRouter
+from auth.infrastructure.database.user_model import Base, UserModel
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def user(name: str) -> User:
+    return User(
+        id=None, username=name, email=f"{name}@example.com", hashed_password="h"
+    )
+
+
+@pytest_asyncio.fixture
+async def databases(tmp_path):
+    """A primary and a replica SQLite file, with no replication between."""
+    settings = Settings(DB_ECHO=False)
+    primary = build_engine(settings, f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+    replica = build_engine(settings, f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+    for db in (primary, replica):
+        async with db.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    async with replica.begin() as conn:  # a user only the replica has
+        await conn.execute(
+            insert(UserModel).values(
+                id=100,
+                username="replicated",
+                email="replicated@example.com",
+                hashed_password="h",
+            )
+        )
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+class TestReadReplicas:
+    @pytest.mark.asyncio
+    async def test_lookups_read_the_replica_and_writes_the_primary(self, databases):
+        """
+        Test that lookups go to the replica, writes to the primary, and the
+        written user is read back from the primary until the window passes.
+        """
+        primary, replica = databases
+        clock = FakeClock()
+        reads = ReadRouter([replica], recent_writes_ttl=5, clock=clock)
+
+        async with AsyncSession(bind=primary) as session:
+            repo = SQLAlchemyUserRepository(session, reads=reads)
+            assert await repo.get_by_email("replicated@example.com")
+            created = await repo.create(user("fresh"))
+            assert await repo.get_by_id(created.id)  # same request
+
+        async with AsyncSession(bind=primary) as session:
+            repo = SQLAlchemyUserRepository(session, reads=reads)
+            assert await repo.get_by_email("fresh@example.com")  # next request
+            clock.now += 5
+            # past the window the (never replicated) replica answers
+            assert await repo.get_by_email("fresh@example.com") is None
+
+        assert reads.replicas[0].reads == 2
+        assert reads.stats()["primary_reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_broken_replica_falls_back_to_primary(self, databases, tmp_path):
+        """
+        Test that a failing replica is marked down and the primary answers.
+        """
+        primary, _ = databases
+        broken = build_engine(
+            Settings(DB_ECHO=False),
+            f"sqlite+aiosqlite:///{os.path.join(tmp_path, 'missing', 'r.db')}",
+        )
+        reads = ReadRouter([broken])
+
+        async with AsyncSession(bind=primary) as session:
+            repo = SQLAlchemyUserRepository(session, reads=reads)
+            await repo.create(user("alice"))
+            fresh = SQLAlchemyUserRepository(session, reads=reads)
+            assert await fresh.get_by_id(1)  # recently written: primary
+            assert await fresh.get_by_email("nobody@example.com") is None
+
+        assert reads.replicas[0].failures == 1
+        await reads.check()
+        assert not reads.stats()["replicas"][0]["up"]
+        await reads.stop()
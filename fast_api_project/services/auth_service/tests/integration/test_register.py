@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from auth.config import AsyncSessionLocal, engine
+from auth.domain.entities import User
+from auth.domain.exceptions import UserAlreadyExistsError
+from auth.infrastructure.database.repositories import SQLAlchemyUserRepository
+
+USER = {"username": "alice", "email": "alice@example.com", "password": "Str0ng!Pass"}
+
+
+class TestRegister:
+    @pytest.mark.asyncio
+    async def test_taken_email_or_username_is_rejected(self, client_factory):
+        """
+        Test that a clash on either unique column answers 400 with its name.
+        """
+        async with client_factory(cost=4) as client:
+            first = await client.post("/auth/register", json=USER)
+            same_email = await client.post(
+                "/auth/register", json={**USER, "username": "alice2"}
+            )
+            same_username = await client.post(
+                "/auth/register", json={**USER, "email": "alice2@example.com"}
+            )
+
+        assert first.status_code == 201
+        assert same_email.status_code == 400
+        assert same_email.json()["detail"] == (
+            "User with email alice@example.com already exists."
+        )
+        assert same_username.status_code == 400
+        assert "username alice" in same_username.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_registrations_create_one_user(self, client_factory):
+        """
+        Test that racing registrations of one email create exactly one user.
+        """
+        async with client_factory(cost=4) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.post(
+                        "/auth/register", json={**USER, "username": f"alice{n}"}
+                    )
+                    for n in range(5)
+                )
+            )
+
+        assert sorted(r.status_code for r in responses) == [201, 400, 400, 400, 400]
+
+    @pytest.mark.asyncio
+    async def test_email_is_validated_with_the_request(self, client_factory):
+        """
+        Test that a malformed email is refused as the request is parsed, and
+        that the domain of a valid one is stored lowercased, as login looks
+        it up.
+        """
+        async with client_factory(cost=4) as client:
+            malformed = await client.post(
+                "/auth/register", json={**USER, "email": "alice@example"}
+            )
+            mixed_case = await client.post(
+                "/auth/register", json={**USER, "email": "Alice@Example.COM"}
+            )
+            login = await client.post(
+                "/auth/login",
+                json={"email": "Alice@EXAMPLE.com", "password": USER["password"]},
+            )
+
+        assert malformed.status_code == 422
+        assert mixed_case.status_code == 201
+        assert mixed_case.json()["email"] == "Alice@example.com"
+        assert login.status_code == 200
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "a..b@example.com",
+            ".ab@example.com",
+            "ab.@example.com",
+            "a@example..com",
+            "a@-ex.com",
+            "a@ex-.com",
+            "a@localhost.local",
+        ],
+    )
+    async def test_register_and_login_agree_on_malformed_emails(
+        self, client_factory, email
+    ):
+        """
+        Test that an email login would refuse cannot be registered either.
+        """
+        async with client_factory(cost=4) as client:
+            register = await client.post(
+                "/auth/register", json={**USER, "email": email}
+            )
+            login = await client.post(
+                "/auth/login", json={"email": email, "password": USER["password"]}
+            )
+
+        assert register.status_code == 422
+        assert login.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_registered_email_can_log_in(self, client_factory):
+        """
+        Test that an address using dots, plus and hyphens registers and logs in.
+        """
+        email = "first.last+tag@mail-host.example.co.uk"
+        async with client_factory(cost=4) as client:
+            register = await client.post(
+                "/auth/register", json={**USER, "email": email}
+            )
+            login = await client.post(
+                "/auth/login", json={"email": email, "password": USER["password"]}
+            )
+
+        assert register.status_code == 201
+        assert login.status_code == 200
+
+
+class TestCreate:
+    @pytest.mark.asyncio
+    async def test_create_is_one_statement(self, client_factory, count_round_trips):
+        """
+        Test that create() is a single INSERT ... RETURNING plus the commit.
+        """
+        user = User(
+            id=None, username="bob", email="bob@example.com", hashed_password="h"
+        )
+        async with AsyncSessionLocal() as session:
+            repo = SQLAlchemyUserRepository(session)
+            with count_round_trips(engine) as trips:
+                created = await repo.create(user)
+            with pytest.raises(UserAlreadyExistsError):
+                await repo.create(user)
+
+        assert created.id is not None and created.created_at is not None
+        assert trips.statements == ["INSERT"]
+        assert trips.commits == 1
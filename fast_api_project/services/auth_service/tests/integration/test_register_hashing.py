@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from auth.infrastructure.adapters import HashingPool
+from auth.main import app
+
+
+def register(client, n: int):
+    return client.post(
+        "/auth/register",
+        json={
+            "username": f"user{n}",
+            "email": f"user{n}@example.com",
+            "password": "Str0ng!Pass",
+        },
+    )
+
+
+async def health_latencies_during(flood, interval: float = 0.01) -> list:
+    """
+    Probe /health every `interval` until the flood finishes.
+
+    Each latency counts from when the probe was due, so time the event loop
+    spent blocked before it could even send the request is included.
+    """
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as probe:
+        while not flood.done():
+            due = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            response = await probe.get("/health")
+            latencies.append(time.perf_counter() - due)
+            assert response.status_code == 200
+    return latencies
+
+
+class TestRegisterHashing:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("pooled", [False, True])
+    async def test_health_stays_fast_during_registration_flood(
+        self, client_factory, pooled
+    ):
+        """
+        Test that hashing on the pool keeps the event loop free for /health.
+        """
+        pool = HashingPool(workers=2, max_queue=32) if pooled else None
+        async with client_factory(pool) as client:
+            flood = asyncio.ensure_future(
+                asyncio.gather(*(register(client, n) for n in range(10)))
+            )
+            await asyncio.sleep(0)
+            latencies = await health_latencies_during(flood)
+            responses = await flood
+
+        assert all(r.status_code == 201 for r in responses)
+        worst = max(latencies)
+        print(
+            f"\npooled={pooled}: {len(latencies)} /health probes, "
+            f"worst {1000 * worst:.1f}ms"
+        )
+        # one inline cost-10 hash blocks the loop for ~90ms, the flood for ~1s
+        if pooled:
+            assert worst < 0.1
+        else:
+            assert worst > 0.1
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_sheds_with_503(self, client_factory):
+        """
+        Test that registrations beyond the pool queue get a fast 503.
+        """
+        pool = HashingPool(workers=1, max_queue=1, retry_after=2)
+        async with client_factory(pool) as client:
+            responses = await asyncio.gather(*(register(client, n) for n in range(6)))
+
+        statuses = sorted(r.status_code for r in responses)
+        assert statuses.count(201) >= 2
+        assert 503 in statuses
+        shed = next(r for r in responses if r.status_code == 503)
+        assert shed.headers["retry-after"] == "2"
+        assert pool.rejected == statuses.count(503)
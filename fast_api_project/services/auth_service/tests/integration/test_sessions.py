@@ -0,0 +1,102 @@
+import pytest
+
+from auth.infrastructure.adapters import JWTTokenGenerator
+
+USER = {"username": "alice", "email": "alice@example.com", "password": "Str0ng!Pass"}
+LOGIN = {"email": USER["email"], "password": USER["password"]}
+
+
+def claims(response) -> dict:
+    return JWTTokenGenerator("change-me").verify_token(response.json()["access_token"])
+
+
+class TestSessions:
+    @pytest.mark.asyncio
+    async def test_refresh_rotates_tokens(self, client_factory):
+        """
+        Test that login returns a refresh token, and that each refresh
+        gives new tokens and retires the one used.
+        """
+        async with client_factory(cost=4) as client:
+            await client.post("/auth/register", json=USER)
+            login = await client.post("/auth/login", json=LOGIN)
+            first = login.json()["refresh_token"]
+            refreshed = await client.post(
+                "/auth/refresh", json={"refresh_token": first}
+            )
+            second = refreshed.json()["refresh_token"]
+            again = await client.post("/auth/refresh", json={"refresh_token": second})
+
+        assert login.json()["expires_in"] == 15 * 60
+        assert refreshed.status_code == 200
+        assert second != first
+        assert claims(refreshed)["jti"] != claims(login)["jti"]
+        assert again.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_reused_refresh_token_revokes_the_session(self, client_factory):
+        """
+        Test that replaying a used refresh token fails and also ends the
+        session for whoever holds the newer token, revoking its access token.
+        """
+        async with client_factory(cost=4) as client:
+            await client.post("/auth/register", json=USER)
+            login = await client.post("/auth/login", json=LOGIN)
+            stolen = login.json()["refresh_token"]
+            legit = await client.post("/auth/refresh", json={"refresh_token": stolen})
+            replay = await client.post("/auth/refresh", json={"refresh_token": stolen})
+            after = await client.post(
+                "/auth/refresh", json={"refresh_token": legit.json()["refresh_token"]}
+            )
+            feed = await client.get("/auth/revocations")
+
+        assert replay.status_code == 401
+        assert after.status_code == 401
+        assert [e["jti"] for e in feed.json()["revocations"]] == [claims(legit)["jti"]]
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_tokens_into_the_feed(self, client_factory):
+        """
+        Test that logout ends the refresh token, lists the access token in
+        the revocation feed, and that the feed pages by seq.
+        """
+        async with client_factory(cost=4) as client:
+            await client.post("/auth/register", json=USER)
+            one = await client.post("/auth/login", json=LOGIN)
+            two = await client.post("/auth/login", json=LOGIN)
+            out = await client.post(
+                "/auth/logout",
+                json={"refresh_token": one.json()["refresh_token"]},
+                headers={"Authorization": f"Bearer {one.json()['access_token']}"},
+            )
+            refresh = await client.post(
+                "/auth/refresh", json={"refresh_token": one.json()["refresh_token"]}
+            )
+            feed = (await client.get("/auth/revocations")).json()
+            everywhere = await client.post(
+                "/auth/logout",
+                json={"all_sessions": True},
+                headers={"Authorization": f"Bearer {two.json()['access_token']}"},
+            )
+            newer = (await client.get(f"/auth/revocations?after={feed['next']}")).json()
+
+        assert out.status_code == 204
+        assert refresh.status_code == 401
+        assert [e["jti"] for e in feed["revocations"]] == [claims(one)["jti"]]
+        assert feed["revocations"][0]["exp"] == claims(one)["exp"]
+        assert everywhere.status_code == 204
+        assert [e["jti"] for e in newer["revocations"]] == [claims(two)["jti"]]
+
+    @pytest.mark.asyncio
+    async def test_logout_needs_a_token(self, client_factory):
+        """
+        Test that logout without a known refresh token or bearer is a 401.
+        """
+        async with client_factory() as client:
+            nothing = await client.post("/auth/logout", json={})
+            unknown = await client.post(
+                "/auth/logout", json={"refresh_token": "not-a-token"}
+            )
+
+        assert nothing.status_code == 401
+        assert unknown.status_code == 401
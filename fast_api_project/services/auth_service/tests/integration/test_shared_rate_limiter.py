@@ -0,0 +1,85 @@
+import multiprocessing
+import time
+
+import pytest
+
+from auth.infrastructure.middleware.rate_limiter import RateLimit
+from auth.infrastructure.middleware.shared_rate_limiter import SharedRateLimiter
+
+WORKERS = 4
+LIMIT = RateLimit(requests=500, period=3600)
+
+
+def fixed_clock() -> float:
+    return 7200.0  # start of a window: every worker sees the same instant
+
+
+def hammer_one_key(path: str, attempts: int, allowed) -> None:
+    limiter = SharedRateLimiter(path, slots=1024, clock=fixed_clock)
+    count = sum(limiter.check("10.0.0.1", LIMIT).allowed for _ in range(attempts))
+    limiter.close()
+    with allowed.get_lock():
+        allowed.value += count
+
+
+def spread_keys(path: str, worker: int, checks: int, elapsed) -> None:
+    limiter = SharedRateLimiter(path, slots=1 << 18)
+    start = time.perf_counter()
+    for i in range(checks):
+        limiter.check(f"10.{worker}.{i >> 8 & 255}.{i & 255}", LIMIT)
+    elapsed[worker] = time.perf_counter() - start
+    limiter.close()
+
+
+def run_workers(target, args_for):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=target, args=args_for(n)) for n in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+
+class TestSharedRateLimiter:
+    def test_one_limit_across_processes(self, tmp_path):
+        """
+        Test that workers hammering one key together get exactly the limit.
+        """
+        path = str(tmp_path / "limits")
+        allowed = multiprocessing.get_context("fork").Value("i", 0)
+
+        run_workers(hammer_one_key, lambda n: (path, 400, allowed))
+
+        assert allowed.value == LIMIT.requests  # not WORKERS x the limit
+        limiter = SharedRateLimiter(path, slots=1024, clock=fixed_clock)
+        assert not limiter.check("10.0.0.1", LIMIT).allowed
+        assert limiter.check("10.0.0.2", LIMIT).allowed
+        limiter.close()
+
+    def test_throughput(self, tmp_path):
+        """
+        Test aggregate checks per second with every worker on its own keys.
+        """
+        path = str(tmp_path / "limits")
+        checks = 20_000
+        elapsed = multiprocessing.get_context("fork").Array("d", WORKERS)
+
+        run_workers(spread_keys, lambda n: (path, n, checks, elapsed))
+
+        rate = WORKERS * checks / max(elapsed)
+        print(f"\n{WORKERS} workers: {rate:,.0f} checks/s")
+        limiter = SharedRateLimiter(path, slots=1 << 18)
+        # every key got a slot, bar the odd one displaced from a full bucket
+        assert 0.99 * WORKERS * checks <= len(limiter) <= WORKERS * checks
+        limiter.close()
+
+    def test_rejects_table_of_another_size(self, tmp_path):
+        """
+        Test that reopening the file with a different layout fails loudly.
+        """
+        path = str(tmp_path / "limits")
+        SharedRateLimiter(path, slots=1024).close()
+
+        with pytest.raises(ValueError):
+            SharedRateLimiter(path, slots=2048)
@@ -1,6 +1,10 @@
+import copy
+import dataclasses
+
 import pytest
 
 from auth.domain import Email, Password, User
+from auth.domain.value_objects.password import check_strength
 
 
 class TestUser:
@@ -39,6 +43,22 @@ class TestUser:
         user.deactivate()
         assert user.is_active is False
 
+    def test_user_copy(self):
+        """
+        Test that a copy of a User is equal to it and independent of it.
+        """
+        user = User(
+            id=1,
+            username="testuser",
+            email="testuser@example.com",
+            hashed_password="hash",
+        )
+        clone = copy.copy(user)
+        clone.deactivate()
+
+        assert clone == dataclasses.replace(user, is_active=False)
+        assert user.is_active is True
+
 
 class TestEmail:
     def test_valid_email(self):
@@ -54,6 +74,18 @@ class TestEmail:
         """
         with pytest.raises(ValueError):
             Email("invalid-email")
+        with pytest.raises(ValueError):
+            Email("test@example.com\n")
+        for malformed in ("a..b@example.com", "a@ex-.com", "a@localhost.local"):
+            with pytest.raises(ValueError):
+                Email(malformed)
+
+    def test_domain_is_lowercased(self):
+        """
+        Test that the domain of an Email is lowercased and the local part
+        kept.
+        """
+        assert Email("Test.User@Example.COM").value == "Test.User@example.com"
 
 
 class TestPassword:
@@ -70,3 +102,30 @@ class TestPassword:
         """
         with pytest.raises(ValueError):
             Password("weak")  # Too short and lacks complexity
+
+    def test_strength_lists_every_missing_requirement(self):
+        """
+        Test that the strength check gives the verdict and every rule the
+        password breaks, in the order of the error message.
+        """
+        assert check_strength("Str0ngP@ssw0rd!") == (True, ())
+        assert check_strength("weak") == (
+            False,
+            (
+                "at least 8 characters",
+                "one uppercase letter",
+                "one digit",
+                "one special character",
+            ),
+        )
+        with pytest.raises(ValueError, match="Password must contain: one digit."):
+            Password("NoDigits!here")
+
+    @pytest.mark.parametrize("special", ["_", "!", " ", "\u20ac", "\U0001f600"])
+    def test_special_characters(self, special):
+        """
+        Test that anything but a letter or digit counts as special, "_"
+        included, while letters of other scripts do not.
+        """
+        assert check_strength(f"Abcdefg1{special}").strong
+        assert not check_strength("Abcdefg1\u00e9").strong
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+from auth.config import Settings, build_engine, engine_options
+
+
+def settings(url: str, **overrides) -> Settings:
+    return Settings(DATABASE_URL=url, DB_ECHO=False, **overrides)
+
+
+class TestEngineOptions:
+    def test_postgres_urls_use_asyncpg_with_statement_cache(self):
+        """
+        Test that a plain postgres URL gets asyncpg, pooling and pre-ping.
+        """
+        url, options = engine_options(
+            settings("postgresql://auth@db/auth", DB_STATEMENT_CACHE_SIZE=0)
+        )
+
+        assert url.drivername == "postgresql+asyncpg"
+        assert options["pool_pre_ping"] is True
+        assert options["pool_size"] == 5
+        assert options["connect_args"] == {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+        }
+
+    def test_sqlite_skips_pre_ping(self):
+        """
+        Test that SQLite files are pooled without a ping per checkout, and
+        in-memory databases get no pool sizing at all.
+        """
+        _, options = engine_options(
+            settings("sqlite+aiosqlite:///auth.db", DB_POOL_SIZE=2)
+        )
+        assert options["pool_pre_ping"] is False
+        assert options["pool_size"] == 2
+        assert "connect_args" not in options
+
+        _, options = engine_options(settings("sqlite+aiosqlite://"))
+        assert "pool_size" not in options
+
+    @pytest.mark.asyncio
+    async def test_sqlite_pragmas_are_applied(self, tmp_path):
+        """
+        Test that every new SQLite connection gets the configured pragmas.
+        """
+        path = os.path.join(tmp_path, "pragmas.db")
+        engine = build_engine(
+            settings(f"sqlite+aiosqlite:///{path}", SQLITE_CACHE_SIZE=-1234)
+        )
+        try:
+            async with engine.connect() as conn:
+                journal = await conn.scalar(text("PRAGMA journal_mode"))
+                synchronous = await conn.scalar(text("PRAGMA synchronous"))
+                cache_size = await conn.scalar(text("PRAGMA cache_size"))
+        finally:
+            await engine.dispose()
+
+        assert journal == "wal"
+        assert synchronous == 1  # NORMAL
+        assert cache_size == -1234
@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional, Sequence
+
+import pytest
+
+from auth.application.ports import PasswordHasher
+from auth.application.use_cases import ImportRow, ImportUsers
+from auth.domain.entities import User
+from auth.domain.repositories.user_repository import (
+    BulkCreateResult,
+    IUserRepository,
+)
+
+
+class PrefixHasher(PasswordHasher):
+    """Recognizes "legacy:" hashes; records each batch it hashes."""
+
+    def __init__(self):
+        self.batches: List[List[str]] = []
+
+    def hash(self, plain_password: str) -> str:
+        return "hashed:" + plain_password
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return hashed_password == self.hash(plain_password)
+
+    async def verify_dummy_async(self, plain_password: str) -> None:
+        self.verify(plain_password, "hashed:")
+
+    def recognizes(self, hashed_password: str) -> bool:
+        return hashed_password.startswith("legacy:")
+
+    async def hash_many(self, plain_passwords: Sequence[str]) -> List[str]:
+        self.batches.append(list(plain_passwords))
+        return await super().hash_many(plain_passwords)
+
+
+class BatchRepository(IUserRepository):
+    """Takes users only through create_many; emails must be unique."""
+
+    def __init__(self):
+        self.users: List[User] = []
+        self.batches: List[int] = []
+
+    async def create(self, user: User) -> User:
+        raise AssertionError("imports go through create_many")
+
+    async def create_many(self, users: Sequence[User]) -> BulkCreateResult:
+        self.batches.append(len(users))
+        created, duplicates = [], []
+        for user in users:
+            if any(u.email == user.email for u in self.users):
+                duplicates.append(user)
+            else:
+                user.id = len(self.users) + 1
+                self.users.append(user)
+                created.append(user)
+        return BulkCreateResult(created, duplicates)
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return None
+
+    async def get_many_by_ids(self, user_ids: Sequence[int]) -> Dict[int, User]:
+        return {}
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return None
+
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        pass
+
+    async def set_active(self, user_id: int, is_active: bool) -> None:
+        pass
+
+
+def rows(count: int, start: int = 1) -> List[ImportRow]:
+    return [
+        ImportRow(n, f"user{n}", f"user{n}@example.com", password=f"pw{n}")
+        for n in range(start, start + count)
+    ]
+
+
+class TestImportUsers:
+    @pytest.mark.asyncio
+    async def test_imports_in_batches(self):
+        """
+        Test that rows are hashed and stored one batch at a time.
+        """
+        repo, hasher = BatchRepository(), PrefixHasher()
+        report = await ImportUsers(repo, hasher, batch_size=4).execute(rows(10))
+
+        assert report.read == report.created == 10
+        assert repo.batches == [4, 4, 2]
+        assert [len(batch) for batch in hasher.batches] == [4, 4, 2]
+        assert repo.users[0].hashed_password == "hashed:pw1"
+
+    @pytest.mark.asyncio
+    async def test_legacy_hashes_are_kept(self):
+        """
+        Test that a recognized hash is stored as is and an unknown one rejected.
+        """
+        repo, hasher = BatchRepository(), PrefixHasher()
+        report = await ImportUsers(repo, hasher).execute(
+            [
+                ImportRow(1, "a", "a@example.com", password_hash="legacy:abc"),
+                ImportRow(2, "b", "b@example.com", password_hash="md5:abc"),
+                ImportRow(3, "c", "c@example.com", password="plain"),
+            ]
+        )
+
+        assert [u.hashed_password for u in repo.users] == [
+            "legacy:abc",
+            "hashed:plain",
+        ]
+        assert hasher.batches == [["plain"]]
+        assert report.invalid == [(2, "Unsupported password hash")]
+
+    @pytest.mark.asyncio
+    async def test_bad_rows_and_duplicates_do_not_stop_the_batch(self):
+        """
+        Test that invalid and duplicate rows are reported by line and skipped.
+        """
+        repo = BatchRepository()
+        batch = rows(3) + [
+            ImportRow(4, "x", "not-an-email", password="pw"),
+            ImportRow(5, "", "y@example.com", password="pw"),
+            ImportRow(6, "z", "z@example.com"),
+            ImportRow(7, "again", "user1@example.com", password="pw"),
+        ]
+        progress = []
+        report = await ImportUsers(repo, PrefixHasher(), batch_size=100).execute(
+            batch, on_batch=lambda r: progress.append(r.created)
+        )
+
+        assert report.created == 3
+        assert report.duplicates == [(7, "user1@example.com")]
+        assert [line for line, _ in report.invalid] == [4, 5, 6]
+        assert progress == [3]
+        assert report.rate > 0
@@ -0,0 +1,93 @@
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+from app_shared.jwt_codec import (
+    ExpiredTokenError,
+    InvalidTokenError,
+    PreparedHMAC,
+    encode_claims,
+)
+from jose import jwt
+
+from auth.infrastructure.adapters import HMACJWTCodec, JWTTokenGenerator
+
+SECRET = "change-me"
+CLAIMS = {"sub": "1", "email": "alice@example.com", "exp": 2_000, "iat": 1_000}
+
+
+def codec(now: float = 1_500.0, **kwargs) -> HMACJWTCodec:
+    return HMACJWTCodec(SECRET, clock=lambda: now, **kwargs)
+
+
+class TestHMACJWTCodec:
+    @pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+    def test_wire_compatible_with_python_jose(self, algorithm):
+        """
+        Test that tokens are byte for byte python-jose's, and each side
+        verifies the other's.
+        """
+        ours = codec(algorithm=algorithm).encode(CLAIMS)
+        theirs = jwt.encode(CLAIMS, SECRET, algorithm=algorithm)
+
+        assert ours == theirs
+        assert codec(algorithm=algorithm).decode(theirs) == CLAIMS
+        assert (
+            jwt.decode(
+                ours, SECRET, algorithms=[algorithm], options={"verify_exp": False}
+            )
+            == CLAIMS
+        )
+
+    def test_prepared_hmac_matches_hmac(self):
+        """
+        Test that the prepared HMAC equals hmac.new for short and long keys.
+        """
+        for key in (b"k", b"k" * 64, b"k" * 200):
+            for digestmod in (hashlib.sha256, hashlib.sha512):
+                expected = hmac.new(key, b"message", digestmod).digest()
+                assert PreparedHMAC(key, digestmod).digest(b"message") == expected
+
+    def test_fast_claims_encoding_matches_json(self):
+        """
+        Test that the fast path and the generic encoder agree.
+        """
+        for claims in (
+            CLAIMS,
+            {"sub": "1", "name": 'Zoë "z" \\ \n'},
+            {"admin": True, "roles": ["a"], "exp": 1.5},
+        ):
+            assert encode_claims(claims) == json.dumps(claims, separators=(",", ":"))
+
+    def test_rejects_tampering_and_expiry(self):
+        """
+        Test that a changed payload, another key or an old token is refused.
+        """
+        token = codec().encode(CLAIMS)
+        header, _, signature = token.split(".")
+        forged = codec().encode({**CLAIMS, "sub": "2"}).split(".")[1]
+
+        with pytest.raises(InvalidTokenError):
+            codec().decode(f"{header}.{forged}.{signature}")
+        with pytest.raises(InvalidTokenError):
+            HMACJWTCodec("other-secret").decode(token)
+        with pytest.raises(InvalidTokenError):
+            codec().decode("garbage")
+        with pytest.raises(ExpiredTokenError):
+            codec(now=2_000).decode(token)
+
+    def test_token_generator_round_trip(self):
+        """
+        Test that generated access tokens carry integer timestamps and verify.
+        """
+        tokens = JWTTokenGenerator(SECRET, expire_minutes=5)
+        claims = tokens.verify_token(tokens.create_access_token(7, "bob@example.com"))
+
+        assert claims["sub"] == "7"
+        assert claims["email"] == "bob@example.com"
+        assert claims["exp"] - claims["iat"] == 300
+        assert abs(claims["iat"] - time.time()) < 5
+        with pytest.raises(ValueError, match="Invalid token"):
+            tokens.verify_token("a.b.c")
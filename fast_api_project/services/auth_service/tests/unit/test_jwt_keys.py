@@ -0,0 +1,123 @@
+import json
+
+import pytest
+from app_shared.jwt_codec import (
+    ExpiredTokenError,
+    InvalidTokenError,
+    b64url_decode,
+    b64url_encode,
+    decode_segment,
+)
+from jose import jwk as jose_jwk
+from jose import jwt
+
+from auth.infrastructure.adapters import AsymmetricJWTCodec, JWTTokenGenerator
+from auth.infrastructure.adapters.jwt_keys import (
+    generate_private_key,
+    jwk_thumbprint,
+    private_key_pem,
+)
+
+CLAIMS = {"sub": "1", "email": "alice@example.com", "exp": 2_000, "iat": 1_000}
+
+
+def codec(key, algorithm, now: float = 1_500.0, **kwargs) -> AsymmetricJWTCodec:
+    return AsymmetricJWTCodec(key, algorithm, clock=lambda: now, **kwargs)
+
+
+class TestAsymmetricJWTCodec:
+    @pytest.mark.parametrize("algorithm", ["EdDSA", "ES256"])
+    def test_round_trip_with_kid(self, algorithm):
+        """
+        Test that tokens verify, name their key in the kid header and are
+        refused once expired.
+        """
+        tokens = codec(generate_private_key(algorithm), algorithm)
+        token = tokens.encode(CLAIMS)
+        header = decode_segment(token.split(".")[0].encode())
+
+        assert header == {"alg": algorithm, "kid": tokens.key_id, "typ": "JWT"}
+        assert tokens.decode(token) == CLAIMS
+        with pytest.raises(ExpiredTokenError):
+            codec(tokens._private_key, algorithm, now=2_000).decode(token)
+
+    def test_es256_tokens_verify_with_python_jose(self):
+        """
+        Test that ES256 signatures are JWS raw r || s, readable by jose
+        through the published JWK.
+        """
+        tokens = codec(generate_private_key("ES256"), "ES256")
+        key = jose_jwk.construct(tokens.jwks()["keys"][0], "ES256")
+
+        claims = jwt.decode(
+            tokens.encode(CLAIMS),
+            key,
+            algorithms=["ES256"],
+            options={"verify_exp": False},
+        )
+        assert claims == CLAIMS
+
+    def test_jwks_lists_signing_key_then_published_keys(self):
+        """
+        Test that the JWK Set holds public keys only, with thumbprint kids,
+        and that tokens of a published key still verify.
+        """
+        old_key, new_key = generate_private_key("EdDSA"), generate_private_key("EdDSA")
+        old = codec(old_key, "EdDSA")
+        new = codec(new_key, "EdDSA", published_keys=[old_key.public_key()])
+        keys = new.jwks()["keys"]
+
+        assert [key["kid"] for key in keys] == [new.key_id, old.key_id]
+        assert keys[0]["kid"] == jwk_thumbprint(
+            {name: keys[0][name] for name in ("crv", "kty", "x")}
+        )
+        assert all(set(key) == {"crv", "kty", "x", "kid", "alg", "use"} for key in keys)
+        assert len(b64url_decode(keys[0]["x"].encode())) == 32
+        assert new.decode(old.encode(CLAIMS)) == CLAIMS
+
+    def test_rejects_unknown_keys_and_tampering(self):
+        """
+        Test that another key, a forged payload or a swapped alg is invalid.
+        """
+        tokens = codec(generate_private_key("EdDSA"), "EdDSA")
+        token = tokens.encode(CLAIMS)
+        header, _, signature = token.split(".")
+        forged = tokens.encode({**CLAIMS, "sub": "2"}).split(".")[1]
+        stranger = codec(generate_private_key("EdDSA"), "EdDSA").encode(CLAIMS)
+
+        for bad in (f"{header}.{forged}.{signature}", stranger, "a.b.c", "garbage"):
+            with pytest.raises(InvalidTokenError):
+                tokens.decode(bad)
+        with pytest.raises(ValueError):
+            codec(generate_private_key("ES256"), "EdDSA")
+
+    @pytest.mark.parametrize("kid", [[1], {"k": 1}, 7, None])
+    def test_malformed_kid_is_an_invalid_token(self, kid):
+        """
+        Test that a header kid that is not a string makes the token
+        invalid, instead of failing the lookup with a TypeError.
+        """
+        pem = private_key_pem(generate_private_key("EdDSA"))
+        tokens = JWTTokenGenerator("unused", "EdDSA", private_key=pem)
+        _, payload, signature = tokens.create_access_token(7, "bob@example.com").split(
+            "."
+        )
+        header = b64url_encode(json.dumps({"alg": "EdDSA", "kid": kid}).encode())
+
+        with pytest.raises(ValueError, match="Invalid token"):
+            tokens.verify_token(f"{header.decode()}.{payload}.{signature}")
+
+    def test_token_generator_signs_with_pem_key(self):
+        """
+        Test that the generator loads a PEM key for EdDSA, publishes it and
+        needs one.
+        """
+        pem = private_key_pem(generate_private_key("EdDSA"))
+        tokens = JWTTokenGenerator("unused", "EdDSA", private_key=pem)
+
+        claims = tokens.verify_token(tokens.create_access_token(7, "bob@example.com"))
+        assert claims["sub"] == "7"
+        assert len(tokens.jwks()["keys"]) == 1
+        assert JWTTokenGenerator("secret").jwks() == {"keys": []}
+        with pytest.raises(ValueError):
+            JWTTokenGenerator("unused", "EdDSA")
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import pytest
+
+from auth.application.ports import HasherOverloadedError, PasswordHasher
+from auth.infrastructure.adapters import BcryptHasher, HashingPool, calibrate_cost
+
+
+class TestCalibrateCost:
+    def test_picks_highest_cost_under_target(self):
+        """
+        Test that calibration stops before the first cost over the target.
+        """
+        # 1ms at cost 4, doubling per step: cost 10 = 64ms, cost 11 = 128ms
+        measured = []
+
+        def measure(cost):
+            measured.append(cost)
+            return 0.001 * 2 ** (cost - 4)
+
+        assert calibrate_cost(0.1, min_cost=4, max_cost=16, measure=measure) == 10
+        assert max(measured) <= 11
+
+    def test_respects_bounds(self):
+        """
+        Test that the cost stays within min_cost and max_cost.
+        """
+
+        def measure(cost):
+            return 0.001 * 2 ** (cost - 4)
+
+        assert calibrate_cost(0.0001, min_cost=10, measure=measure) == 10
+        assert calibrate_cost(100, min_cost=10, max_cost=12, measure=measure) == 12
+
+
+class TestBcryptHasher:
+    def test_needs_rehash_when_cost_changed(self):
+        """
+        Test that hashes made with another cost are flagged for rehashing.
+        """
+        old = BcryptHasher(cost=4).hash("Str0ng!Pass")
+
+        assert BcryptHasher(cost=4).needs_rehash(old) is False
+        assert BcryptHasher(cost=5).needs_rehash(old) is True
+        assert BcryptHasher(cost=5).verify("Str0ng!Pass", old)
+
+    def test_stronger_hash_is_not_rehashed(self):
+        """
+        Test that a hash made with a higher cost is kept, so workers
+        calibrated to different costs do not rehash it back and forth.
+        """
+        stronger = BcryptHasher(cost=5).hash("Str0ng!Pass")
+
+        assert BcryptHasher(cost=4).needs_rehash(stronger) is False
+        assert BcryptHasher(cost=4).needs_rehash("not-a-bcrypt-hash") is True
+
+    def test_hashers_must_time_unknown_user_logins(self):
+        """
+        Test that a hasher cannot silently skip the dummy verification that
+        keeps unknown-user logins as slow as real ones.
+        """
+
+        class Incomplete(PasswordHasher):
+            def hash(self, plain_password):
+                return plain_password
+
+            def verify(self, plain_password, hashed_password):
+                return plain_password == hashed_password
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestHashingPool:
+    @pytest.mark.asyncio
+    async def test_cancelled_callers_keep_their_slot_until_the_job_ends(self):
+        """
+        Test that cancelling a waiting request does not free its slot while
+        the job is still queued or running, so the bound still holds.
+        """
+        pool = HashingPool(workers=1, max_queue=1)
+        release = threading.Event()
+        callers = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)  # the first job runs, the second waits
+
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+
+        assert pool.pending == 1  # the queued job was dropped, not the running
+        with pytest.raises(HasherOverloadedError):
+            await asyncio.gather(pool.run(release.wait), pool.run(release.wait))
+        release.set()
+        await asyncio.sleep(0.05)
+        assert pool.pending == 0
+        pool.shutdown()
@@ -0,0 +1,128 @@
+import pytest
+
+from auth.infrastructure.middleware.rate_limiter import (
+    RateLimit,
+    RouteLimits,
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucketLimiter:
+    def test_burst_then_refill(self):
+        """
+        Test that a full bucket allows a burst and refills at the set rate.
+        """
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(clock=clock)
+        limit = RateLimit(requests=3, period=3)  # one token per second
+
+        results = [limiter.check("ip", limit) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[2].remaining == 0
+        assert results[3].retry_after == pytest.approx(1)
+
+        clock.now += 1
+        assert limiter.check("ip", limit).allowed
+        assert not limiter.check("ip", limit).allowed
+
+    def test_keys_are_independent(self):
+        """
+        Test that one key running out does not affect another.
+        """
+        limiter = TokenBucketLimiter(clock=FakeClock())
+        limit = RateLimit(requests=1)
+
+        assert limiter.check("a", limit).allowed
+        assert not limiter.check("a", limit).allowed
+        assert limiter.check("b", limit).allowed
+
+
+class TestSlidingWindowLimiter:
+    def test_limit_within_window(self):
+        """
+        Test that at most `requests` are allowed per window.
+        """
+        clock = FakeClock(600.0)  # start of a 60s window
+        limiter = SlidingWindowLimiter(clock=clock)
+        limit = RateLimit(requests=5, period=60)
+
+        results = [limiter.check("ip", limit) for _ in range(6)]
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+
+    def test_previous_window_is_weighted(self):
+        """
+        Test that the previous window counts in proportion to its overlap.
+        """
+        clock = FakeClock(600.0)
+        limiter = SlidingWindowLimiter(clock=clock)
+        limit = RateLimit(requests=10, period=60)
+        for _ in range(10):
+            limiter.check("ip", limit)
+
+        clock.now = 660.0 + 15  # 75% of the previous window still overlaps
+        results = [limiter.check("ip", limit) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, False, False]
+        # 7.5 + 2 counted: the next slot frees once 0.5 more requests slide out
+        assert results[-1].retry_after == pytest.approx(3)
+
+        clock.now = 720.0 + 30  # two windows later only the last one counts
+        assert limiter.check("ip", limit).remaining == 8
+
+
+class TestEviction:
+    def test_max_keys_evicts_least_recently_used(self):
+        """
+        Test that new keys beyond max_keys push out the least recently used.
+        """
+        limiter = SlidingWindowLimiter(max_keys=2, clock=FakeClock())
+        limit = RateLimit(requests=1)
+        limiter.check("a", limit)
+        limiter.check("b", limit)
+        limiter.check("a", limit)  # "b" is now the least recently used
+        limiter.check("c", limit)
+
+        assert len(limiter) == 2
+        assert limiter.evictions == 1
+        assert not limiter.check("a", limit).allowed  # "a" kept its state
+
+    def test_idle_keys_are_evicted(self):
+        """
+        Test that evict_idle() drops only keys idle for idle_seconds.
+        """
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(idle_seconds=120, clock=clock)
+        limit = RateLimit(requests=10)
+        limiter.check("old", limit)
+        clock.now += 100
+        limiter.check("recent", limit)
+        clock.now += 30
+
+        assert limiter.evict_idle() == 1
+        assert len(limiter) == 1
+
+
+class TestRouteLimits:
+    def test_longest_prefix_wins(self):
+        """
+        Test that the most specific route limit applies, else the default.
+        """
+        default = RateLimit(60)
+        routes = RouteLimits(
+            default,
+            {"/auth": RateLimit(30), "/auth/login": RateLimit(5)},
+        )
+
+        assert routes.for_path("/auth/login") == ("/auth/login", RateLimit(5))
+        assert routes.for_path("/auth/register") == ("/auth", RateLimit(30))
+        assert routes.for_path("/authz") == ("", default)
+        assert routes.for_path("/health") == ("", default)
@@ -0,0 +1,82 @@
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from auth.infrastructure.database.routing import ReadRouter
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def router(replicas: int = 2, **kwargs) -> ReadRouter:
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///replica{n}.db")  # never connected
+        for n in range(replicas)
+    ]
+    return ReadRouter(engines, **kwargs)
+
+
+class TestReadRouter:
+    def test_replicas_take_turns(self):
+        """
+        Test that lookups are spread over the replicas in turn.
+        """
+        reads = router(replicas=3)
+        picked = [reads.replica_for(("id", n)) for n in range(6)]
+        assert picked == reads.replicas * 2
+
+    def test_failed_replica_is_skipped_until_retry(self):
+        """
+        Test that a replica marked down is skipped, then used again.
+        """
+        clock = FakeClock()
+        reads = router(retry_after=5, clock=clock)
+        down, up = reads.replicas
+        reads.mark_down(down, OSError("refused"))
+
+        assert {reads.replica_for(("id", n)) for n in range(4)} == {up}
+        clock.now += 5
+        assert {reads.replica_for(("id", n)) for n in range(4)} == {down, up}
+
+    def test_falls_back_to_the_primary(self):
+        """
+        Test that with every replica down, lookups go to the primary.
+        """
+        reads = router()
+        for replica in reads.replicas:
+            reads.mark_down(replica, OSError("refused"))
+
+        assert reads.replica_for(("id", 1)) is None
+        assert reads.stats()["fallbacks"] == 1
+        assert router(replicas=0).replica_for(("id", 1)) is None
+
+    def test_recent_writes_are_read_from_the_primary(self):
+        """
+        Test that a key written lately is read from the primary until the
+        read-your-writes window has passed.
+        """
+        clock = FakeClock()
+        reads = router(recent_writes_ttl=5, clock=clock)
+        reads.note_write(("id", 1), ("email", "a@example.com"))
+
+        assert reads.replica_for(("email", "a@example.com")) is None
+        assert reads.replica_for(("id", 2)) is not None
+        clock.now += 5
+        assert reads.replica_for(("email", "a@example.com")) is not None
+
+    def test_recent_writes_are_bounded(self):
+        """
+        Test that expired and excess recent writes are forgotten.
+        """
+        clock = FakeClock()
+        reads = router(recent_writes_ttl=5, max_recent_writes=10, clock=clock)
+        for n in range(20):
+            reads.note_write(("id", n))
+        assert len(reads._recent) == 10
+
+        clock.now += 6
+        reads.note_write(("id", 99))
+        assert list(reads._recent) == [("id", 99)]
@@ -0,0 +1,245 @@
+import asyncio
+from typing import Dict, Optional, Sequence
+
+import pytest
+
+from auth.domain.entities import User
+from auth.domain.repositories.user_repository import (
+    BulkCreateResult,
+    IUserRepository,
+)
+from auth.infrastructure.database.cached_repository import (
+    CachedUserRepository,
+    UserCache,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class InMemoryUserRepository(IUserRepository):
+    """Counts the lookups that reach the "database"."""
+
+    def __init__(self, delay: float = 0.0):
+        self.users: Dict[int, User] = {}
+        self.lookups = 0
+        self.delay = delay
+
+    async def create(self, user: User) -> User:
+        user.id = len(self.users) + 1
+        self.users[user.id] = user
+        return user
+
+    async def create_many(self, users: Sequence[User]) -> BulkCreateResult:
+        return BulkCreateResult([await self.create(user) for user in users], [])
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        self.lookups += 1
+        await asyncio.sleep(self.delay)
+        return self.users.get(user_id)
+
+    async def get_many_by_ids(self, user_ids: Sequence[int]) -> Dict[int, User]:
+        self.lookups += 1
+        await asyncio.sleep(self.delay)
+        return {i: self.users[i] for i in user_ids if i in self.users}
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        self.lookups += 1
+        await asyncio.sleep(self.delay)
+        return next((u for u in self.users.values() if u.email == email), None)
+
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        self.users[user_id].hashed_password = hashed_password
+
+    async def set_active(self, user_id: int, is_active: bool) -> None:
+        self.users[user_id].is_active = is_active
+
+
+def make_user(n: int = 1) -> User:
+    return User(
+        id=None,
+        username=f"user{n}",
+        email=f"user{n}@example.com",
+        hashed_password="hash",
+    )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def inner():
+    return InMemoryUserRepository()
+
+
+@pytest.fixture
+def repo(inner, clock):
+    return CachedUserRepository(inner, UserCache(ttl=30, negative_ttl=2, clock=clock))
+
+
+class TestUserCache:
+    @pytest.mark.asyncio
+    async def test_id_and_email_share_an_entry(self, repo, inner):
+        """
+        Test that a user loaded by email is then served by id, and vice versa.
+        """
+        user = await repo.create(make_user())
+
+        assert (await repo.get_by_email(user.email)).id == user.id
+        assert (await repo.get_by_id(user.id)).email == user.email
+        assert (await repo.get_by_email(user.email)).id == user.id
+        assert inner.lookups == 1
+        assert repo.cache.stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, repo, inner, clock):
+        """
+        Test that a cached user is reloaded once its TTL has passed.
+        """
+        user = await repo.create(make_user())
+        await repo.get_by_id(user.id)
+
+        clock.now += 31
+        await repo.get_by_id(user.id)
+        assert inner.lookups == 2
+
+    @pytest.mark.asyncio
+    async def test_negative_entries_are_short_lived(self, repo, inner, clock):
+        """
+        Test that a missing user is cached for the negative TTL only.
+        """
+        assert await repo.get_by_email("nobody@example.com") is None
+        assert await repo.get_by_email("nobody@example.com") is None
+        assert inner.lookups == 1
+        assert repo.cache.stats()["negative_hits"] == 1
+
+        clock.now += 3
+        assert await repo.get_by_email("nobody@example.com") is None
+        assert inner.lookups == 2
+
+    @pytest.mark.asyncio
+    async def test_create_replaces_negative_entry(self, repo):
+        """
+        Test that registering a user is visible at once after a failed lookup.
+        """
+        assert await repo.get_by_email("user1@example.com") is None
+        user = await repo.create(make_user())
+        assert (await repo.get_by_email("user1@example.com")).id == user.id
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate(self, repo):
+        """
+        Test that set_active and update_password_hash drop both keys.
+        """
+        user = await repo.create(make_user())
+        await repo.get_by_email(user.email)
+
+        await repo.set_active(user.id, False)
+        assert not (await repo.get_by_email(user.email)).is_active
+
+        await repo.update_password_hash(user.id, "new-hash")
+        assert (await repo.get_by_id(user.id)).hashed_password == "new-hash"
+        assert (await repo.get_by_email(user.email)).hashed_password == "new-hash"
+
+    @pytest.mark.asyncio
+    async def test_returns_copies(self, repo):
+        """
+        Test that changing a returned user does not change the cached one.
+        """
+        user = await repo.create(make_user())
+        (await repo.get_by_id(user.id)).deactivate()
+        assert (await repo.get_by_id(user.id)).is_active
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, clock):
+        """
+        Test that simultaneous lookups of one uncached user load it once.
+        """
+        inner = InMemoryUserRepository(delay=0.01)
+        repo = CachedUserRepository(inner, UserCache(clock=clock))
+        user = await repo.create(make_user())
+
+        users = await asyncio.gather(*(repo.get_by_id(user.id) for _ in range(50)))
+        assert {u.id for u in users} == {user.id}
+        assert inner.lookups == 1
+        assert repo.cache.stats()["collapsed"] == 49
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loader_does_not_cancel_waiters(self, clock):
+        """
+        Test that when the caller running a shared load is cancelled, the
+        callers waiting on it load the user themselves instead of failing.
+        """
+        inner = InMemoryUserRepository(delay=0.01)
+        repo = CachedUserRepository(inner, UserCache(clock=clock))
+        user = await repo.create(make_user())
+
+        leader = asyncio.ensure_future(repo.get_by_id(user.id))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(repo.get_by_id(user.id)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        users = await asyncio.gather(*waiters)
+        assert leader.cancelled()
+        assert {u.id for u in users} == {user.id}
+        assert inner.lookups == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_cached_over(self, clock):
+        """
+        Test that a load racing with a write does not cache the stale user.
+        """
+        inner = InMemoryUserRepository(delay=0.01)
+        repo = CachedUserRepository(inner, UserCache(clock=clock))
+        user = await repo.create(make_user())
+
+        loading = asyncio.ensure_future(repo.get_by_id(user.id))
+        await asyncio.sleep(0)
+        await repo.set_active(user.id, False)
+        await loading
+
+        assert not (await repo.get_by_id(user.id)).is_active
+        assert inner.lookups == 2
+
+    @pytest.mark.asyncio
+    async def test_size_is_bounded(self, inner, clock):
+        """
+        Test that the least recently used users are evicted past max_size.
+        """
+        repo = CachedUserRepository(inner, UserCache(max_size=10, clock=clock))
+        for n in range(20):
+            user = await repo.create(make_user(n))
+            await repo.get_by_id(user.id)
+
+        assert len(repo.cache) <= 10
+        assert repo.cache.stats()["evictions"] > 0
+        lookups = inner.lookups
+        await repo.get_by_id(20)  # most recent: still cached
+        assert inner.lookups == lookups
+        await repo.get_by_id(1)  # oldest: evicted
+        assert inner.lookups == lookups + 1
+
+    @pytest.mark.asyncio
+    async def test_get_many_loads_only_misses_in_one_call(self, repo, inner):
+        """
+        Test that a batch lookup serves cached users and loads the rest,
+        unknown ids included, with one call that fills the cache.
+        """
+        users = [await repo.create(make_user(n)) for n in range(3)]
+        await repo.get_by_id(users[0].id)
+
+        found = await repo.get_many_by_ids([u.id for u in users] + [99, users[1].id])
+        assert sorted(found) == [u.id for u in users]
+        assert inner.lookups == 2
+
+        assert (await repo.get_by_email(users[2].email)).id == users[2].id
+        assert await repo.get_by_id(99) is None
+        assert inner.lookups == 2
@@ -0,0 +1,176 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from json.encoder import encode_basestring_ascii
+from typing import Callable, Dict, Tuple
+
+HMAC_ALGORITHMS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+# compact, like python-jose, so tokens come out byte for byte the same
+json_encode = json.JSONEncoder(separators=(",", ":")).encode
+_json_decode = json.JSONDecoder().decode
+
+
+class InvalidTokenError(ValueError):
+    pass
+
+
+class ExpiredTokenError(InvalidTokenError):
+    pass
+
+
+def b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def encode_claims(claims: Dict) -> str:
+    """
+    Claims as compact JSON. Flat claims of strings and integers, like access
+    tokens, skip the generic encoder; the output is the same either way.
+    """
+    parts = []
+    for key, value in claims.items():
+        if type(key) is not str:
+            return json_encode(claims)
+        kind = type(value)
+        if kind is str:
+            parts.append(
+                f"{encode_basestring_ascii(key)}:{encode_basestring_ascii(value)}"
+            )
+        elif kind is int:
+            parts.append(f"{encode_basestring_ascii(key)}:{int.__repr__(value)}")
+        else:
+            return json_encode(claims)
+    return "{" + ",".join(parts) + "}"
+
+
+def split_token(token: str) -> Tuple[bytes, bytes, bytes, bytes]:
+    """The signing input, header, payload and signature of a compact JWT."""
+    try:
+        raw = token.encode("ascii")
+    except UnicodeError as e:
+        raise InvalidTokenError("Invalid token") from e
+    signing_input, _, signature = raw.rpartition(b".")
+    header, _, payload = signing_input.partition(b".")
+    if not header or not payload or b"." in payload:
+        raise InvalidTokenError("Invalid token")
+    return signing_input, header, payload, signature
+
+
+def decode_segment(segment: bytes) -> Dict:
+    """The JSON object in a header or payload segment."""
+    try:
+        fields = _json_decode(b64url_decode(segment).decode("utf-8"))
+    except (UnicodeError, binascii.Error, ValueError) as e:
+        raise InvalidTokenError("Invalid token") from e
+    if not isinstance(fields, dict):
+        raise InvalidTokenError("Invalid token")
+    return fields
+
+
+def decode_signature(segment: bytes) -> bytes:
+    try:
+        return b64url_decode(segment)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidTokenError("Invalid token") from e
+
+
+def check_times(claims: Dict, now: float, leeway: float) -> Dict:
+    """claims, if exp and nbf allow the token to be used now."""
+    exp = claims.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise InvalidTokenError("Invalid token")
+        if exp <= now - leeway:
+            raise ExpiredTokenError("Token has expired")
+    nbf = claims.get("nbf")
+    if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now + leeway):
+        raise InvalidTokenError("Invalid token")
+    return claims
+
+
+class PreparedHMAC:
+    """
+    HMAC with the key already absorbed (RFC 2104): the inner and outer
+    hashes are keyed once, and each message only copies them.
+    """
+
+    def __init__(self, key: bytes, digestmod):
+        block_size = digestmod().block_size
+        if len(key) > block_size:
+            key = digestmod(key).digest()
+        key = key.ljust(block_size, b"\0")
+        self._inner = digestmod(bytes(b ^ 0x36 for b in key))
+        self._outer = digestmod(bytes(b ^ 0x5C for b in key))
+
+    def digest(self, message: bytes) -> bytes:
+        inner = self._inner.copy()
+        inner.update(message)
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return outer.digest()
+
+
+class HMACJWTCodec:
+    """
+    Encoder and verifier for HMAC-signed JWTs (HS256/384/512), used by the
+    auth service to issue tokens and by the gateway to check them.
+
+    Everything that does not depend on the claims is prepared once: the
+    keyed inner and outer hashes of the HMAC and the encoded header
+    segment. Claims must already hold integer timestamps. Tokens are
+    interchangeable with python-jose's: the header and claims are
+    serialized the same way, and any header jose produces with the same
+    algorithm is accepted.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        leeway: int = 0,  # seconds of clock skew tolerated on exp/nbf
+        clock: Callable[[], float] = time.time,
+    ):
+        if algorithm not in HMAC_ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm {algorithm}")
+        self.algorithm = algorithm
+        self.leeway = leeway
+        self.clock = clock
+        self._mac = PreparedHMAC(secret_key.encode("utf-8"), HMAC_ALGORITHMS[algorithm])
+        self._header = b64url_encode(
+            json_encode({"alg": algorithm, "typ": "JWT"}).encode("utf-8")
+        )
+
+    def encode(self, claims: Dict) -> str:
+        payload = b64url_encode(encode_claims(claims).encode("ascii"))
+        signing_input = self._header + b"." + payload
+        signature = b64url_encode(self._mac.digest(signing_input))
+        return (signing_input + b"." + signature).decode("ascii")
+
+    def decode(self, token: str) -> Dict:
+        """
+        Claims of a token with a valid signature that is not expired.
+
+        Raises ExpiredTokenError or InvalidTokenError.
+        """
+        signing_input, header, payload, signature = split_token(token)
+        if header != self._header and decode_segment(header).get("alg") != (
+            self.algorithm
+        ):
+            raise InvalidTokenError("Invalid token")
+        if not hmac.compare_digest(
+            self._mac.digest(signing_input), decode_signature(signature)
+        ):
+            raise InvalidTokenError("Invalid token")
+        return check_times(decode_segment(payload), self.clock(), self.leeway)
@@ -0,0 +1,38 @@
+from typing import Union
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    decode_dss_signature,
+    encode_dss_signature,
+)
+
+ASYMMETRIC_ALGORITHMS = ("EdDSA", "ES256")
+
+PrivateKey = Union[ed25519.Ed25519PrivateKey, ec.EllipticCurvePrivateKey]
+PublicKey = Union[ed25519.Ed25519PublicKey, ec.EllipticCurvePublicKey]
+
+_ES256 = ec.ECDSA(hashes.SHA256())
+
+
+def sign(key: PrivateKey, algorithm: str, message: bytes) -> bytes:
+    if algorithm == "EdDSA":
+        return key.sign(message)
+    r, s = decode_dss_signature(key.sign(message, _ES256))
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big")  # JWS wants raw r || s
+
+
+def verify(key: PublicKey, algorithm: str, signature: bytes, message: bytes) -> bool:
+    try:
+        if algorithm == "EdDSA":
+            key.verify(signature, message)
+        else:
+            if len(signature) != 64:
+                return False
+            r = int.from_bytes(signature[:32], "big")
+            s = int.from_bytes(signature[32:], "big")
+            key.verify(encode_dss_signature(r, s), message, _ES256)
+    except InvalidSignature:
+        return False
+    return True